@@ -0,0 +1,75 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fr24[polars]",
+# ]
+# [tool.uv.sources]
+# fr24 = { path = "../", editable = true }
+# ///
+"""Compare the size and CPU cost of gRPC message compression on live feed
+responses.
+
+Usage: `./scripts/bench_grpc_compression.py [num_flights] [repeats]`
+
+The default of 1500 flights is the size of a saturated tile of a world sweep.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Callable
+
+from bench_live_feed_df import make_response
+
+from fr24.proto import (
+    GrpcEncoding,
+    compress_message,
+    decompress_message,
+    supported_encodings,
+)
+
+
+def best_of(func: Callable[[], bytes], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    num_flights = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    raw = make_response(num_flights).SerializeToString()
+    print(f"{num_flights} flights, {len(raw) / 1e3:.1f} kB, best of {repeats}")
+    print(
+        f"{'encoding':>8} {'size kB':>8} {'ratio':>6} "
+        f"{'compress ms':>12} {'decompress ms':>14} {'MB/s in':>8}"
+    )
+    encodings: tuple[GrpcEncoding, ...] = ("identity", *supported_encodings())
+    for encoding in encodings:
+        compressed = compress_message(raw, encoding)
+        assert decompress_message(compressed, encoding) == raw
+        t_compress = best_of(lambda: compress_message(raw, encoding), repeats)
+        t_decompress = best_of(
+            lambda: decompress_message(compressed, encoding), repeats
+        )
+        # the client only pays for decompression
+        throughput = (
+            len(raw) / t_decompress / 1e6
+            if encoding != "identity"
+            else float("nan")
+        )
+        print(
+            f"{encoding:>8} {len(compressed) / 1e3:8.1f} "
+            f"{len(raw) / len(compressed):6.2f} "
+            f"{t_compress * 1e3:12.2f} {t_decompress * 1e3:14.2f} "
+            f"{throughput:8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
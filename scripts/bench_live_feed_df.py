@@ -0,0 +1,140 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fr24[polars]",
+# ]
+# [tool.uv.sources]
+# fr24 = { path = "../", editable = true }
+# ///
+"""Compare the dict-per-flight, columnar and wire format scanning live feed to
+polars conversions.
+
+Usage: `./scripts/bench_live_feed_df.py [num_flights] [repeats]`
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable
+
+import polars as pl
+
+from fr24.grpc import live_feed_df, live_feed_flightdata_dict, live_feed_wire_df
+from fr24.proto.v1_pb2 import (
+    ExtraFlightInfo,
+    Flight,
+    LiveFeedResponse,
+    PositionBuffer,
+    RecentPosition,
+    Route,
+    Schedule,
+)
+from fr24.types.cache import live_feed_schema
+
+
+def make_response(num_flights: int, seed: int = 0) -> LiveFeedResponse:
+    rng = random.Random(seed)
+    flights = [
+        Flight(
+            flightid=i,
+            lat=rng.uniform(-90, 90),
+            lon=rng.uniform(-180, 180),
+            track=rng.randrange(360),
+            alt=rng.randrange(45000),
+            speed=rng.randrange(600),
+            on_ground=rng.random() < 0.1,
+            callsign=f"CPA{i}",
+            source=rng.randrange(10),
+            timestamp_ms=1_700_000_000_000 + i,
+            extra_info=ExtraFlightInfo(
+                reg="B-HUJ",
+                route=Route(**{"from": "HKG", "to": "CDG"}),
+                type="B744",
+                schedule=Schedule(eta=1_700_003_000),
+                squawk=rng.randrange(4096),
+                vspeed=rng.randrange(-2000, 2000),
+            ),
+            position_buffer=PositionBuffer(
+                recent_positions_list=[
+                    RecentPosition(delta_lat=-j, delta_lon=j, delta_ms=j * 500)
+                    for j in range(rng.randrange(8))
+                ]
+            ),
+        )
+        for i in range(num_flights)
+    ]
+    # round trip so that the benchmark operates on parsed (upb) messages
+    return LiveFeedResponse.FromString(
+        LiveFeedResponse(flights_list=flights).SerializeToString()
+    )
+
+
+def live_feed_df_dicts(data: LiveFeedResponse) -> pl.DataFrame:
+    """The conversion prior to the columnar path."""
+    return pl.DataFrame(
+        (live_feed_flightdata_dict(lfr) for lfr in data.flights_list),
+        schema=live_feed_schema,
+    )
+
+
+def bench(
+    name: str,
+    func: Callable[[LiveFeedResponse], pl.DataFrame],
+    data: LiveFeedResponse,
+    repeats: int,
+) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(data)
+        best = min(best, time.perf_counter() - start)
+    rows_per_s = len(data.flights_list) / best
+    print(f"{name:>10}: {best * 1e3:8.1f} ms, {rows_per_s:12,.0f} rows/s")
+    return best
+
+
+def bench_peak(
+    name: str, func: Callable[[], pl.DataFrame], repeats: int
+) -> None:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    # tracing allocations slows everything down, so measure it separately
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{name:>14}: {best * 1e3:8.1f} ms, peak {peak / 1e6:6.1f} MB")
+
+
+def main() -> None:
+    num_flights = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    data = make_response(num_flights)
+    assert live_feed_df_dicts(data).equals(live_feed_df(data))
+
+    print(f"{num_flights} flights, best of {repeats}")
+    t_dicts = bench("dicts", live_feed_df_dicts, data, repeats)
+    t_columnar = bench("columnar", live_feed_df, data, repeats)
+    print(f"speedup: {t_dicts / t_columnar:.2f}x")
+
+    # the wire scanner starts from the serialised bytes, so include the
+    # protobuf parse in the columnar timing for a fair comparison
+    raw = data.SerializeToString()
+    assert live_feed_wire_df(raw).equals(live_feed_df(data))
+    bench_peak(
+        "proto+columnar",
+        lambda: live_feed_df(LiveFeedResponse.FromString(raw)),
+        repeats,
+    )
+    bench_peak("wire", lambda: live_feed_wire_df(raw), repeats)
+
+
+if __name__ == "__main__":
+    main()
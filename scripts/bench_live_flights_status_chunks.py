@@ -0,0 +1,55 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.10"
+# dependencies = [
+#     "fr24[polars]",
+# ]
+# [tool.uv.sources]
+# fr24 = { path = "../", editable = true }
+# ///
+"""Measure the throughput of live flights status requests for different chunk
+sizes, on the flight ids of a live world sweep.
+
+Usage:
+`./scripts/bench_live_flights_status_chunks.py [num_ids] [max_concurrency]`
+
+Note that this sends real requests: keep `num_ids` modest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import time
+
+from fr24 import FR24
+
+CHUNK_SIZES = (100, 250, 500, 1000, 2000, 5000)
+
+
+async def main() -> None:
+    num_ids = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    max_concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    async with FR24() as fr24:
+        world = await fr24.live_feed.fetch_world()
+        ids = world.to_polars()["flightid"].to_list()[:num_ids]
+        print(f"{len(ids)} flight ids, {max_concurrency=}")
+        print(f"{'chunk':>6} {'requests':>8} {'s':>6} {'live':>6} {'ids/s':>8}")
+        for chunk_size in CHUNK_SIZES:
+            start = time.perf_counter()
+            try:
+                result = await fr24.live_flights_status.fetch_chunked(
+                    ids, chunk_size=chunk_size, max_concurrency=max_concurrency
+                )
+            except Exception as e:
+                print(f"{chunk_size:>6} failed: {e!r}")
+                continue
+            elapsed = time.perf_counter() - start
+            print(
+                f"{chunk_size:>6} {result.num_chunks:>8} {elapsed:6.2f} "
+                f"{result.data.height:>6} {len(ids) / elapsed:8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
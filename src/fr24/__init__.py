@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import replace
+from dataclasses import field, replace
 from typing import TYPE_CHECKING
 
 import httpx
@@ -10,10 +10,19 @@ from .authentication import login
 from .cache import PATH_CACHE, FR24Cache
 from .configuration import FP_CONFIG_FILE, PATH_CONFIG
 from .grpc import BoundingBox
+from .instrumentation import Instrumentation
 from .json import get_json_headers
+from .proto import supported_encodings
 from .proto.headers import get_grpc_headers
+from .ratelimit import RateController
 from .service import ServiceFactory
 from .static.bbox import LNGS_WORLD_STATIC
+from .transport import (
+    RateControlTransport,
+    ShardedTransport,
+    ShardStats,
+    TransportProfile,
+)
 from .types.json import Authentication
 from .utils import dataclass_frozen
 
@@ -22,6 +31,8 @@ if TYPE_CHECKING:
 
     from typing_extensions import Self
 
+    from .instrumentation import RequestHook
+    from .proto import GrpcEncoding
     from .types.json import (
         TokenSubscriptionKey,
         UsernamePassword,
@@ -34,6 +45,9 @@ class FR24:
     def __init__(
         self,
         client: httpx.AsyncClient | None = None,
+        *,
+        profile: TransportProfile | None = None,
+        rate_control: RateController | None = None,
     ) -> None:
         """See docs [quickstart](../usage/quickstart.md#initialisation).
 
@@ -42,13 +56,49 @@ class FR24:
             highly recommended to use `http2=True` to avoid
             [464 errors](https://github.com/abc8747/fr24/issues/23#issuecomment-2125624974)
             and to be consistent with the browser.
+        :param profile: Connection settings of the client to create, e.g. to
+            spread requests over several HTTP/2 connections. Cannot be used
+            together with `client`.
+        :param rate_control: Per-endpoint rate and adaptive concurrency
+            limits shared by all services, see
+            [fr24.transport.RateControlTransport][]. Cannot be used together
+            with `client`: wrap its transport instead.
         """
+        if client is not None and (
+            profile is not None or rate_control is not None
+        ):
+            raise ValueError(
+                "`client` is mutually exclusive with `profile` and "
+                "`rate_control`"
+            )
+        transport = None
+        accept_encoding: tuple[GrpcEncoding, ...] = ()
+        if profile is not None and profile.grpc_compression:
+            accept_encoding = supported_encodings()
+        if profile is not None or rate_control is not None:
+            profile = profile or TransportProfile()
+            transport = profile.build_transport()
+            client = httpx.AsyncClient(
+                transport=(
+                    transport
+                    if rate_control is None
+                    else RateControlTransport(transport, rate_control)
+                ),
+                timeout=profile.timeout,
+            )
+        elif client is None:
+            client = httpx.AsyncClient(http2=True)
         auth = None
         self.http = HTTPClient(
-            httpx.AsyncClient(http2=True) if client is None else client,
+            client,
             auth=auth,
-            grpc_headers=httpx.Headers(get_grpc_headers(auth=auth)),
+            grpc_headers=httpx.Headers(
+                get_grpc_headers(auth=auth, accept_encoding=accept_encoding)
+            ),
             json_headers=httpx.Headers(get_json_headers()),
+            transport=transport,
+            rate_control=rate_control,
+            grpc_accept_encoding=accept_encoding,
         )
         """The HTTP client for use in requests"""
         self._build_factory(self.http)
@@ -115,6 +165,34 @@ class HTTPClient:
     auth: Authentication | None
     grpc_headers: httpx.Headers
     json_headers: httpx.Headers
+    transport: ShardedTransport | None = None
+    """The transport built from a
+    [TransportProfile][fr24.transport.TransportProfile], if any."""
+
+    rate_control: RateController | None = None
+    """Rate and concurrency limits applied to all requests, if any."""
+
+    grpc_accept_encoding: tuple[GrpcEncoding, ...] = ()
+    """Message compressions advertised to the gRPC server, see
+    [fr24.transport.TransportProfile.grpc_compression][]."""
+
+    instrumentation: Instrumentation = field(default_factory=Instrumentation)
+    """Hooks receiving the timings of every request, see
+    [add_hook][fr24.HTTPClient.add_hook]."""
+
+    def add_hook(self, hook: RequestHook) -> None:
+        """Report the timings, size and parse time of every request to
+        `hook`, e.g. a [fr24.instrumentation.HistogramSink][]."""
+        self.instrumentation.install(self.client)
+        self.instrumentation.hooks.append(hook)
+
+    def remove_hook(self, hook: RequestHook) -> None:
+        self.instrumentation.hooks.remove(hook)
+
+    def connection_stats(self) -> list[ShardStats]:
+        """Stream usage of each connection pool, empty if the client was not
+        built from a [TransportProfile][fr24.transport.TransportProfile]."""
+        return [] if self.transport is None else self.transport.stats
 
     async def with_login(
         self,
@@ -126,7 +204,11 @@ class HTTPClient:
         return replace(
             self,
             auth=auth,
-            grpc_headers=httpx.Headers(get_grpc_headers(auth=auth)),
+            grpc_headers=httpx.Headers(
+                get_grpc_headers(
+                    auth=auth, accept_encoding=self.grpc_accept_encoding
+                )
+            ),
             json_headers=httpx.Headers(get_json_headers()),
         )
 
@@ -157,4 +239,6 @@ __all__ = [
     "BoundingBox",
     "FR24Cache",
     "HTTPClient",
+    "RateController",
+    "TransportProfile",
 ]
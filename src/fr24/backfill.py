@@ -0,0 +1,240 @@
+"""
+Rebuild live feed snapshots of the past from the playback endpoint.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import shutil
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from .grpc import BoundingBox, live_feed_merge_df
+from .ratelimit import TokenBucket
+from .service import LiveFeedTile, LiveFeedWorldResult, world_bounding_boxes
+from .utils import raise_missing_polars, to_unix_timestamp
+
+try:
+    import polars as pl
+except ImportError as exc:
+    raise_missing_polars(exc)
+
+if TYPE_CHECKING:
+    from typing import Iterator
+
+    from . import FR24
+    from .cache import FR24Cache
+    from .service import IntoWorldLngs
+    from .types import IntoTimestamp
+    from .types.cache import TabularFileFmt
+    from .types.grpc import LiveFeedField
+    from .types.isqx import TimestampS
+
+logger = logging.getLogger(__name__)
+
+
+def tile_key(bounding_box: BoundingBox) -> str:
+    """A filename-safe identifier of a bounding box."""
+    return "_".join(str(float(v)) for v in bounding_box)
+
+
+class BackfillCheckpoint:
+    """Progress of a backfill, persisted under `<cache>/live_feed_backfill`.
+
+    Every completed `(timestamp, tile)` pair and every completed timestamp is
+    appended to `checkpoint.jsonl`. The data of a completed tile is kept in
+    `<timestamp>/<tile>.parquet` until all tiles of the timestamp are done
+    and merged into [fr24.cache.FR24Cache.live_feed][].
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.fp = path / "checkpoint.jsonl"
+        self.tiles: set[tuple[int, str]] = set()
+        self.timestamps: set[int] = set()
+        if not self.fp.exists():
+            return
+        with self.fp.open() as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:  # torn write on crash
+                    logger.warning(f"skipping corrupt checkpoint {line=}")
+                    continue
+                if (tile := entry.get("tile")) is None:
+                    self.timestamps.add(entry["timestamp"])
+                else:
+                    self.tiles.add((entry["timestamp"], tile))
+
+    @classmethod
+    def from_cache(cls, cache: FR24Cache) -> BackfillCheckpoint:
+        return cls(cache.path / "live_feed_backfill")
+
+    def tile_path(self, timestamp: int, tile: str) -> Path:
+        return self.path / str(timestamp) / f"{tile}.parquet"
+
+    def has_tile(self, timestamp: int, tile: str) -> bool:
+        return (timestamp, tile) in self.tiles and self.tile_path(
+            timestamp, tile
+        ).exists()
+
+    def _append(self, entry: dict[str, int | str]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        with self.fp.open("a") as f:
+            f.write(json.dumps(entry) + "\n")
+
+    def save_tile(self, timestamp: int, tile: str, data: pl.DataFrame) -> None:
+        fp = self.tile_path(timestamp, tile)
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        tmp = fp.with_suffix(".tmp")
+        data.write_parquet(tmp)
+        tmp.replace(fp)
+        self._append({"timestamp": timestamp, "tile": tile})
+        self.tiles.add((timestamp, tile))
+
+    def complete(self, timestamp: int) -> None:
+        self._append({"timestamp": timestamp})
+        self.timestamps.add(timestamp)
+        shutil.rmtree(self.path / str(timestamp), ignore_errors=True)
+
+
+class BackfillSummary(NamedTuple):
+    written: int
+    """Number of snapshots written to the cache in this run."""
+    skipped: int
+    """Number of snapshots already completed by a previous run."""
+    failed: int
+    """Number of snapshots left incomplete, rerun to retry them."""
+
+
+async def backfill_live_feed(
+    fr24: FR24,
+    cache: FR24Cache,
+    start: IntoTimestamp,
+    end: IntoTimestamp,
+    *,
+    step: int = 60,
+    area: BoundingBox | IntoWorldLngs = "half_hourly",
+    rate: float = 4.0,
+    max_concurrency: int = 8,
+    duration: int = 7,
+    limit: int = 1500,
+    fields: set[LiveFeedField] | None = None,
+    format: TabularFileFmt = "parquet",
+) -> BackfillSummary:
+    """Rebuild live feed snapshots for every `step` in `[start, end)` with
+    [fr24.service.LiveFeedPlaybackService][], writing them to
+    [fr24.cache.FR24Cache.live_feed][].
+
+    Each snapshot is split into tiles (all requested concurrently, within the
+    rate budget) which are checkpointed as they complete, see
+    [fr24.backfill.BackfillCheckpoint][]. An interrupted run resumes where it
+    left off when called again with the same cache. Failed tiles are logged
+    and skipped.
+
+    :param step: Seconds between snapshots.
+    :param area: A bounding box, or longitude knots to slice the world with,
+        see [fr24.service.world_lngs][]. Knots are resolved for each
+        timestamp.
+    :param rate: Maximum number of requests per second.
+    :param max_concurrency: Maximum number of requests in flight.
+    See [fr24.service.LiveFeedPlaybackService.fetch][] for other parameters.
+    """
+    start_ts, end_ts = to_unix_timestamp(start), to_unix_timestamp(end)
+    if not isinstance(start_ts, int) or not isinstance(end_ts, int):
+        raise ValueError("start and end must be timestamps, not `now`")
+    fields_: set[LiveFeedField] = (
+        {"flight", "reg", "route", "type"} if fields is None else fields
+    )
+    checkpoint = BackfillCheckpoint.from_cache(cache)
+    bucket = TokenBucket(rate)
+    plans: dict[int, list[BoundingBox]] = {}
+    remaining: dict[int, int] = {}
+    written = skipped = 0
+
+    def bounding_boxes(timestamp: TimestampS[int]) -> list[BoundingBox]:
+        if isinstance(area, BoundingBox):
+            return [area]
+        return world_bounding_boxes(area, timestamp=timestamp)
+
+    def finish(timestamp: int) -> None:
+        nonlocal written
+        bboxes = plans.pop(timestamp)
+        frames = [
+            pl.read_parquet(checkpoint.tile_path(timestamp, tile_key(bbox)))
+            for bbox in bboxes
+        ]
+        tiles = [
+            LiveFeedTile(
+                bounding_box=bbox,
+                num_flights=df.height,
+                timestamp=timestamp,
+                saturated=df.height >= limit,
+            )
+            for bbox, df in zip(bboxes, frames)
+        ]
+        result = LiveFeedWorldResult(
+            timestamp=timestamp,
+            limit=limit,
+            tiles=tiles,
+            data=live_feed_merge_df(frames),
+        )
+        if saturated := result.saturated_tiles:
+            logger.warning(f"{timestamp}: {len(saturated)} tile(s) saturated")
+        result.write_table(cache, format=format, when_file_exists="overwrite")
+        checkpoint.complete(timestamp)
+        written += 1
+
+    def pending() -> Iterator[tuple[int, BoundingBox]]:
+        nonlocal skipped
+        for timestamp in range(start_ts, end_ts, step):
+            if timestamp in checkpoint.timestamps:
+                skipped += 1
+                continue
+            plans[timestamp] = bboxes = bounding_boxes(timestamp)
+            todo = [
+                bbox
+                for bbox in bboxes
+                if not checkpoint.has_tile(timestamp, tile_key(bbox))
+            ]
+            remaining[timestamp] = len(todo)
+            if not todo:
+                finish(timestamp)
+            for bbox in todo:
+                yield timestamp, bbox
+
+    async def worker(jobs: Iterator[tuple[int, BoundingBox]]) -> None:
+        for timestamp, bbox in jobs:
+            await bucket.acquire()
+            try:
+                result = await fr24.live_feed_playback.fetch(
+                    bbox,
+                    limit=limit,
+                    fields=fields_,
+                    timestamp=timestamp,
+                    duration=duration,
+                )
+                data = result.to_polars()
+            except Exception as e:
+                logger.error(f"{timestamp}: failed to fetch {bbox}: {e!r}")
+                continue
+            checkpoint.save_tile(timestamp, tile_key(bbox), data)
+            remaining[timestamp] -= 1
+            if remaining[timestamp] == 0:
+                finish(timestamp)
+
+    jobs = pending()
+    workers = [
+        asyncio.ensure_future(worker(jobs)) for _ in range(max_concurrency)
+    ]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+    failed = len(plans)
+    if failed:
+        logger.warning(f"{failed} snapshot(s) incomplete, rerun to retry")
+    return BackfillSummary(written=written, skipped=skipped, failed=failed)
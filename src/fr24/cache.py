@@ -8,6 +8,7 @@ from platformdirs import user_cache_dir
 from .types.cache import (
     flight_details_schema,
     flight_list_schema,
+    live_feed_delta_schema,
     live_feed_schema,
     live_flights_status_schema,
     nearest_flights_schema,
@@ -58,6 +59,16 @@ class FR24Cache:
         self.live_feed = TimestampedCache(
             Collection(self.path / "feed"), schema=live_feed_schema
         )
+        self.live_feed_delta = LiveFeedDeltaCache(
+            keyframes=TimestampedCache(
+                Collection(self.path / "feed_delta" / "keyframes"),
+                schema=live_feed_schema,
+            ),
+            deltas=TimestampedCache(
+                Collection(self.path / "feed_delta" / "deltas"),
+                schema=live_feed_delta_schema,
+            ),
+        )
         self.nearest_flights = NearestFlightsCache(
             Collection(self.path / "nearest_flights")
         )
@@ -198,6 +209,15 @@ class TimestampedCache(GlobMixin):
         )
 
 
+@dataclass_frozen
+class LiveFeedDeltaCache:
+    """Live feed snapshots stored as periodic keyframes (full snapshots) and
+    the deltas between them, see [fr24.delta][]."""
+
+    keyframes: TimestampedCache
+    deltas: TimestampedCache
+
+
 @dataclass_frozen
 class NearestFlightsCache(GlobMixin):
     collection: Collection
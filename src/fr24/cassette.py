@@ -0,0 +1,257 @@
+"""
+Record the raw responses of a run to disk and replay them later, for
+deterministic offline runs, profiles and benchmarks:
+
+```py
+import httpx
+from fr24 import FR24
+from fr24.cassette import Cassette, RecordingTransport, ReplayTransport
+
+cassette = Cassette("sweep")
+transport = RecordingTransport(httpx.AsyncHTTPTransport(http2=True), cassette)
+async with FR24(httpx.AsyncClient(transport=transport)) as fr24:
+    await fr24.live_feed.fetch_world()
+
+# later, offline, at twice the recorded speed
+transport = ReplayTransport(Cassette("sweep"), speed=2.0)
+async with FR24(httpx.AsyncClient(transport=transport)) as fr24:
+    await fr24.live_feed.fetch_world()
+```
+
+Requests are matched by method, URL and body. Repeated requests (e.g. a
+poll of the same bounding box) are served in the order they were recorded.
+Note that requests whose body embeds the current time (e.g. a playback of
+`now`) will not match on replay.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .transport import _TrackedStream
+
+if TYPE_CHECKING:
+    from typing import AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+class CassetteMissError(LookupError):
+    """Raised on replay when no recorded response matches a request."""
+
+
+def request_key(request: httpx.Request) -> str:
+    """Identifies a request by its method, URL and body."""
+    h = hashlib.sha256()
+    h.update(request.method.encode())
+    h.update(b"\n")
+    h.update(str(request.url).encode())
+    h.update(b"\n")
+    h.update(request.content)
+    return h.hexdigest()
+
+
+@dataclass
+class CassetteEntry:
+    """A recorded response."""
+
+    key: str
+    """See [fr24.cassette.request_key][]."""
+    method: str
+    url: str
+    status_code: int
+    headers: list[tuple[str, str]]
+    body: str
+    """SHA-256 of the raw body, i.e. its filename under `bodies/`."""
+    ttfb: float
+    """Seconds from sending the request to receiving the headers."""
+    chunks: list[tuple[float, int]] = field(default_factory=list)
+    """Seconds since the headers and size of every chunk of the body."""
+
+
+class Cassette:
+    """A directory of recorded responses.
+
+    Entries are appended to `index.jsonl` as responses complete, bodies are
+    stored once per content under `bodies/`.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.index = self.path / "index.jsonl"
+        self.entries: dict[str, list[CassetteEntry]] = {}
+        if not self.index.exists():
+            return
+        with self.index.open() as f:
+            for line in f:
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError:  # torn write on crash
+                    logger.warning(f"skipping corrupt cassette {line=}")
+                    continue
+                data["headers"] = [tuple(h) for h in data["headers"]]
+                data["chunks"] = [tuple(c) for c in data["chunks"]]
+                entry = CassetteEntry(**data)
+                self.entries.setdefault(entry.key, []).append(entry)
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self.entries.values())
+
+    def body_path(self, entry: CassetteEntry) -> Path:
+        return self.path / "bodies" / entry.body
+
+    def read_body(self, entry: CassetteEntry) -> bytes:
+        return self.body_path(entry).read_bytes()
+
+    def append(self, entry: CassetteEntry, body: bytes) -> None:
+        fp = self.body_path(entry)
+        if not fp.exists():
+            fp.parent.mkdir(parents=True, exist_ok=True)
+            tmp = fp.with_suffix(".tmp")
+            tmp.write_bytes(body)
+            tmp.replace(fp)
+        with self.index.open("a") as f:
+            f.write(json.dumps(asdict(entry)) + "\n")
+        self.entries.setdefault(entry.key, []).append(entry)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests through to `transport`, recording every response
+    into `cassette` once it is closed.
+
+    Bodies are recorded as received (i.e. before HTTP content decoding), so
+    replaying them goes through the same decoding path. Streams are recorded
+    up to the point they are closed.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, cassette: Cassette
+    ) -> None:
+        self.transport = transport
+        self.cassette = cassette
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        await request.aread()
+        start = time.perf_counter()
+        response = await self.transport.handle_async_request(request)
+        headers_at = time.perf_counter()
+        chunks: list[tuple[float, int]] = []
+        body = bytearray()
+
+        def on_chunk(chunk: bytes) -> None:
+            chunks.append((time.perf_counter() - headers_at, len(chunk)))
+            body.extend(chunk)
+
+        def on_close() -> None:
+            raw = bytes(body)
+            self.cassette.append(
+                CassetteEntry(
+                    key=request_key(request),
+                    method=request.method,
+                    url=str(request.url),
+                    status_code=response.status_code,
+                    headers=list(response.headers.multi_items()),
+                    body=hashlib.sha256(raw).hexdigest(),
+                    ttfb=headers_at - start,
+                    chunks=chunks,
+                ),
+                raw,
+            )
+
+        if response.is_closed:  # body already read, e.g. by a mock
+            on_chunk(response.content)
+            on_close()
+            return response
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _TrackedStream(response.stream, on_close, on_chunk)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class _ReplayStream(httpx.AsyncByteStream):
+    def __init__(
+        self, body: bytes, chunks: list[tuple[float, int]], speed: float | None
+    ) -> None:
+        self.body = body
+        self.chunks = chunks
+        self.speed = speed
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        if self.speed is None:
+            yield self.body
+            return
+        start = time.perf_counter()
+        offset = 0
+        for at, size in self.chunks:
+            delay = at / self.speed - (time.perf_counter() - start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield self.body[offset : offset + size]
+            offset += size
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Serves the responses recorded in a [fr24.cassette.Cassette][],
+    without touching the network.
+
+    :param speed: Replay the recorded latencies and chunk timings, divided
+        by `speed` (e.g. `2.0` for twice as fast). If `None`, responses are
+        served immediately.
+    :param repeat: When all responses recorded for a request were served,
+        keep serving the last one instead of raising
+        [fr24.cassette.CassetteMissError][].
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        speed: float | None = None,
+        repeat: bool = False,
+    ) -> None:
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive")
+        self.cassette = cassette
+        self.speed = speed
+        self.repeat = repeat
+        self._served: dict[str, int] = {}
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        await request.aread()
+        key = request_key(request)
+        entries = self.cassette.entries.get(key, [])
+        index = self._served.get(key, 0)
+        if index >= len(entries):
+            if not (self.repeat and entries):
+                raise CassetteMissError(
+                    f"no recorded response for {request.method} {request.url}"
+                    f" (request {index + 1}, {len(entries)} recorded)"
+                )
+            index = len(entries) - 1
+        self._served[key] = index + 1
+        entry = entries[index]
+        if self.speed is not None:
+            await asyncio.sleep(entry.ttfb / self.speed)
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            stream=_ReplayStream(
+                self.cassette.read_body(entry), entry.chunks, self.speed
+            ),
+            request=request,
+        )
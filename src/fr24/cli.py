@@ -135,6 +135,268 @@ def create(
     )
 
 
+@app.command()
+def knots(
+    flights_per_tile: Annotated[
+        int, typer.Option(help="Target number of flights per slice")
+    ] = 1000,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(help="Cache directory to read the live feed from"),
+    ] = None,
+    output: Annotated[
+        Path | None,
+        typer.Option(
+            "-o",
+            "--output",
+            help="Path to the knots file, defaults to the cache directory",
+        ),
+    ] = None,
+) -> None:
+    """Regenerates the half hourly longitude knots of the world sweep from
+    cached live feed snapshots"""
+    from .tiling import (
+        compute_lngs_per_half_hr,
+        knots_path,
+        save_lngs_per_half_hr,
+    )
+
+    cache = FR24Cache.default() if cache_dir is None else FR24Cache(cache_dir)
+    lngs = compute_lngs_per_half_hr(
+        cache.live_feed.collection.path.glob("*.parquet"),
+        flights_per_tile=flights_per_tile,
+    )
+    if not lngs:
+        logger.error(f"no live feed snapshots found in {cache.path}")
+        raise typer.Exit(1)
+    fp = knots_path(cache.path) if output is None else output
+    save_lngs_per_half_hr(fp, lngs, flights_per_tile=flights_per_tile)
+    stderr.print(
+        "[bold green]success[/bold green]: "
+        f"wrote knots for {len(lngs)} half hour slots to {fp}"
+    )
+
+
+app_record = typer.Typer()
+app.add_typer(
+    app_record,
+    name="record",
+    no_args_is_help=True,
+    help="Long-running recorders writing to the cache",
+)
+
+
+@app_record.command(name="live-feed")
+def record_live_feed(
+    bounding_box: Annotated[
+        BoundingBox | None,
+        typer.Option(
+            click_type=BoundingBoxParser(),
+            help="Area to record. If not given, sweeps the entire world.",
+            show_default=False,
+        ),
+    ] = None,
+    lngs: Annotated[
+        str,
+        typer.Option(
+            help=(
+                "Longitude knots of the world sweep: `static`, `half_hourly` "
+                "or a path to a knots file (see `fr24 knots`)"
+            )
+        ),
+    ] = "half_hourly",
+    interval: Annotated[
+        float, typer.Option(help="Seconds between snapshots")
+    ] = 10,
+    count: Annotated[
+        int | None,
+        typer.Option(help="Stop after this many snapshots", show_default=False),
+    ] = None,
+    max_concurrency: Annotated[
+        int, typer.Option(help="Maximum number of requests in flight")
+    ] = 8,
+    limit: Annotated[
+        int, typer.Option(help="Maximum number of flights per request")
+    ] = 1500,
+    fields: Annotated[
+        list[str] | None,
+        typer.Option(
+            click_type=click.Choice(get_args(LiveFeedField)),
+            help="Fields to include  [default: flight, reg, route, type]",
+            show_default=False,
+        ),
+    ] = None,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(help="Cache directory, defaults to the default cache"),
+    ] = None,
+    format: Annotated[
+        TabularFileFmt, typer.Option("-f", "--format", help="Output format")
+    ] = "parquet",
+    keyframe_interval: Annotated[
+        int | None,
+        typer.Option(
+            help=(
+                "Store keyframes every this many snapshots and only the "
+                "changes in between"
+            ),
+            show_default=False,
+        ),
+    ] = None,
+    trace: Annotated[
+        Path | None,
+        typer.Option(
+            help=(
+                "Write a Chrome trace of the fetch, parse and write spans "
+                "to this file on exit"
+            ),
+            show_default=False,
+        ),
+    ] = None,
+) -> None:
+    """Records the live feed at a fixed cadence until interrupted"""
+    from .record import record_live_feed as record
+    from .record import stop_on_signals
+    from .tracing import tracing
+
+    cache = FR24Cache.default() if cache_dir is None else FR24Cache(cache_dir)
+    area: BoundingBox | Path | str = bounding_box or (
+        lngs if lngs in ("static", "half_hourly") else Path(lngs)
+    )
+
+    async def record_() -> None:
+        async with FR24() as fr24:
+            await fr24.login()
+            with stop_on_signals() as stop:
+                written = await record(
+                    fr24,
+                    cache,
+                    area,  # type: ignore[arg-type]
+                    interval=interval,
+                    count=count,
+                    stop=stop,
+                    max_concurrency=max_concurrency,
+                    limit=limit,
+                    fields=set(fields) if fields else None,  # type: ignore[arg-type]
+                    format=format,
+                    keyframe_interval=keyframe_interval,
+                )
+        path = (
+            cache.live_feed.collection.path
+            if keyframe_interval is None
+            else cache.live_feed_delta.keyframes.collection.path.parent
+        )
+        stderr.print(
+            "[bold green]success[/bold green]: "
+            f"recorded {written} snapshots to {path}"
+        )
+
+    if trace is None:
+        asyncio.run(record_())
+        return
+    with tracing(trace):
+        asyncio.run(record_())
+    stderr.print(f"[bold green]success[/bold green]: wrote trace to {trace}")
+
+
+@app.command()
+def backfill(
+    start: Annotated[
+        int,
+        typer.Option(
+            click_type=TimestampSParser(allow_now=False),
+            help="Start timestamp (inclusive)",
+            show_default=False,
+        ),
+    ],
+    end: Annotated[
+        int,
+        typer.Option(
+            click_type=TimestampSParser(allow_now=False),
+            help="End timestamp (exclusive)",
+            show_default=False,
+        ),
+    ],
+    step: Annotated[int, typer.Option(help="Seconds between snapshots")] = 60,
+    bounding_box: Annotated[
+        BoundingBox | None,
+        typer.Option(
+            click_type=BoundingBoxParser(),
+            help="Area to backfill. If not given, sweeps the entire world.",
+            show_default=False,
+        ),
+    ] = None,
+    lngs: Annotated[
+        str,
+        typer.Option(
+            help=(
+                "Longitude knots of the world sweep: `static`, `half_hourly` "
+                "or a path to a knots file (see `fr24 knots`)"
+            )
+        ),
+    ] = "half_hourly",
+    rate: Annotated[
+        float, typer.Option(help="Maximum number of requests per second")
+    ] = 4.0,
+    max_concurrency: Annotated[
+        int, typer.Option(help="Maximum number of requests in flight")
+    ] = 8,
+    limit: Annotated[
+        int, typer.Option(help="Maximum number of flights per request")
+    ] = 1500,
+    fields: Annotated[
+        list[str] | None,
+        typer.Option(
+            click_type=click.Choice(get_args(LiveFeedField)),
+            help="Fields to include  [default: flight, reg, route, type]",
+            show_default=False,
+        ),
+    ] = None,
+    cache_dir: Annotated[
+        Path | None,
+        typer.Option(help="Cache directory, defaults to the default cache"),
+    ] = None,
+    format: Annotated[
+        TabularFileFmt, typer.Option("-f", "--format", help="Output format")
+    ] = "parquet",
+) -> None:
+    """Rebuilds past live feed snapshots from the playback endpoint,
+    resuming any interrupted run"""
+    from .backfill import backfill_live_feed
+
+    cache = FR24Cache.default() if cache_dir is None else FR24Cache(cache_dir)
+    area: BoundingBox | Path | str = bounding_box or (
+        lngs if lngs in ("static", "half_hourly") else Path(lngs)
+    )
+
+    async def backfill_() -> None:
+        async with FR24() as fr24:
+            await fr24.login()
+            summary = await backfill_live_feed(
+                fr24,
+                cache,
+                start,
+                end,
+                step=step,
+                area=area,  # type: ignore[arg-type]
+                rate=rate,
+                max_concurrency=max_concurrency,
+                limit=limit,
+                fields=set(fields) if fields else None,  # type: ignore[arg-type]
+                format=format,
+            )
+        stderr.print(
+            "[bold green]success[/bold green]: "
+            f"wrote {summary.written} snapshots to "
+            f"{cache.live_feed.collection.path} "
+            f"({summary.skipped} already done, {summary.failed} incomplete)"
+        )
+        if summary.failed:
+            raise typer.Exit(1)
+
+    asyncio.run(backfill_())
+
+
 def get_console(path: Path | IO[bytes] | None) -> Console:
     return Console(stderr=path is not None and not isinstance(path, Path))
 
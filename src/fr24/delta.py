@@ -0,0 +1,244 @@
+"""
+Delta encoding of successive live feed snapshots.
+
+Consecutive snapshots of the live feed are mostly identical: the same flights
+are present and a large fraction of them have not moved. Instead of storing
+every snapshot in full, a [fr24.delta.DeltaEncoder][] stores a *keyframe*
+(the full snapshot) every few snapshots and, in between, only the flights
+that were `added`, `removed` or `changed` since the previous snapshot.
+[fr24.delta.state_at][] reconstructs the full snapshot at any timestamp.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import TYPE_CHECKING
+
+from .types.cache import live_feed_delta_schema
+from .utils import (
+    dataclass_frozen,
+    raise_missing_polars,
+    to_unix_timestamp,
+    write_table,
+)
+
+try:
+    import polars as pl
+except ImportError as exc:
+    raise_missing_polars(exc)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from typing import Mapping
+
+    from .cache import FR24Cache, LiveFeedDeltaCache
+    from .types import IntoTimestamp
+    from .types.cache import TabularFileFmt
+    from .utils import FileExistsBehaviour
+
+logger = logging.getLogger(__name__)
+
+
+def diff_snapshots(
+    prev: pl.DataFrame,
+    curr: pl.DataFrame,
+    *,
+    thresholds: Mapping[str, float] | None = None,
+) -> pl.DataFrame:
+    """Compute the delta between two live feed snapshots, keyed by `flightid`.
+
+    A flight is `changed` if any of its columns differ. For columns present
+    in `thresholds`, small changes are ignored: the absolute difference must
+    exceed the threshold. Temporal columns are compared in their integer
+    representation (milliseconds for `timestamp`). Changed rows always carry
+    all columns of `curr`, so applying the delta never mixes values from two
+    snapshots within one row.
+
+    :param prev: The previous (or reconstructed) snapshot.
+    :param curr: The current snapshot.
+    :param thresholds: Per-column minimum absolute change, e.g.
+        `{"latitude": 1e-4, "altitude": 25}`.
+    :returns: A dataframe with the live feed columns plus `op`, sorted by
+        `flightid`. `removed` rows only have `flightid` set.
+    """
+    thresholds = thresholds or {}
+    ops = live_feed_delta_schema["op"]  # type: ignore[index]
+    columns = [c for c in curr.columns if c != "flightid"]
+
+    added = curr.join(prev, on="flightid", how="anti").with_columns(
+        op=pl.lit("added", dtype=ops)
+    )
+    removed = (
+        prev.join(curr, on="flightid", how="anti")
+        .select("flightid")
+        .with_columns(op=pl.lit("removed", dtype=ops))
+    )
+
+    def is_changed(column: str) -> pl.Expr:
+        new, old = pl.col(column), pl.col(f"{column}_prev")
+        if (threshold := thresholds.get(column)) is None:
+            return new.ne_missing(old)
+        if curr.schema[column].is_temporal():
+            new, old = new.to_physical(), old.to_physical()
+        return (
+            (new.cast(pl.Float64) - old.cast(pl.Float64))
+            .abs()
+            .gt(threshold)
+            .fill_null(new.is_null() != old.is_null())
+        )
+
+    both = curr.join(prev, on="flightid", how="inner", suffix="_prev")
+    changed = (
+        both.filter(pl.any_horizontal(is_changed(c) for c in columns))
+        .select(curr.columns)
+        .with_columns(op=pl.lit("changed", dtype=ops))
+    )
+    return pl.concat([added, changed, removed], how="diagonal_relaxed").sort(
+        "flightid"
+    )
+
+
+def apply_delta(state: pl.DataFrame, delta: pl.DataFrame) -> pl.DataFrame:
+    """Apply a delta produced by [fr24.delta.diff_snapshots][] to a snapshot.
+
+    :returns: The next snapshot, sorted by `flightid`.
+    """
+    upserts = delta.filter(pl.col("op") != "removed").select(state.columns)
+    return pl.concat(
+        [state.join(delta, on="flightid", how="anti"), upserts],
+        how="vertical_relaxed",
+    ).sort("flightid")
+
+
+@dataclass_frozen
+class LiveFeedDelta:
+    """A keyframe or delta produced by [fr24.delta.DeltaEncoder][]."""
+
+    timestamp: int
+    keyframe: bool
+    data: pl.DataFrame
+
+    def to_polars(self) -> pl.DataFrame:
+        return self.data
+
+    def write_table(
+        self,
+        cache: FR24Cache | LiveFeedDeltaCache,
+        *,
+        format: TabularFileFmt = "parquet",
+        when_file_exists: FileExistsBehaviour = "backup",
+    ) -> None:
+        """Write to the keyframe or delta collection of the cache."""
+        from .cache import FR24Cache
+
+        if isinstance(cache, FR24Cache):
+            cache = cache.live_feed_delta
+        collection = cache.keyframes if self.keyframe else cache.deltas
+        write_table(
+            self,
+            collection.get_path(self.timestamp),
+            format=format,
+            when_file_exists=when_file_exists,
+        )
+
+
+class DeltaEncoder:
+    """Turns a sequence of live feed snapshots into keyframes and deltas.
+
+    Deltas are computed against the *reconstructed* state rather than the
+    previous raw snapshot, so thresholded changes cannot accumulate: the
+    reconstructed value of a column never strays further than its threshold
+    from the true value.
+    """
+
+    def __init__(
+        self,
+        *,
+        keyframe_interval: int = 60,
+        thresholds: Mapping[str, float] | None = None,
+    ) -> None:
+        """
+        :param keyframe_interval: Emit a keyframe every this many snapshots.
+        :param thresholds: Per-column minimum absolute change, see
+            [fr24.delta.diff_snapshots][].
+        """
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self.thresholds = thresholds
+        self.state: pl.DataFrame | None = None
+        self._since_keyframe = 0
+
+    def encode(self, data: pl.DataFrame, timestamp: int) -> LiveFeedDelta:
+        """Encode the next snapshot.
+
+        :param timestamp: Unix timestamp of the snapshot, in seconds. Must be
+            increasing.
+        """
+        data = data.sort("flightid")
+        if self.state is None or self._since_keyframe >= self.keyframe_interval:
+            self.state = data
+            self._since_keyframe = 1
+            return LiveFeedDelta(timestamp=timestamp, keyframe=True, data=data)
+        delta = diff_snapshots(self.state, data, thresholds=self.thresholds)
+        self.state = apply_delta(self.state, delta)
+        self._since_keyframe += 1
+        return LiveFeedDelta(timestamp=timestamp, keyframe=False, data=delta)
+
+
+def _timestamps(directory: Path, format: TabularFileFmt) -> list[int]:
+    return sorted(
+        int(fp.stem)
+        for fp in directory.glob(f"*.{format}")
+        if fp.stem.isdigit()
+    )
+
+
+def state_at(
+    cache: FR24Cache | LiveFeedDeltaCache,
+    timestamp: IntoTimestamp | str,
+    *,
+    format: TabularFileFmt = "parquet",
+) -> pl.DataFrame:
+    """Reconstruct the live feed snapshot as of `timestamp`.
+
+    Reads the latest keyframe at or before `timestamp` and applies all deltas
+    up to and including `timestamp`.
+
+    :raises FileNotFoundError: If there is no keyframe at or before
+        `timestamp`.
+    """
+    from .cache import FR24Cache
+
+    if isinstance(cache, FR24Cache):
+        cache = cache.live_feed_delta
+    ts = to_unix_timestamp(timestamp)
+    if ts is None or ts == "now":
+        raise ValueError(f"invalid timestamp for cache: {timestamp}")
+
+    keyframes = [
+        t
+        for t in _timestamps(cache.keyframes.collection.path, format)
+        if t <= ts
+    ]
+    if not keyframes:
+        raise FileNotFoundError(f"no keyframe at or before {ts}")
+    start = keyframes[-1]
+    state = cache.keyframes.scan_table(start, format=format).collect()
+    deltas = [
+        t
+        for t in _timestamps(cache.deltas.collection.path, format)
+        if start < t <= ts
+    ]
+    if not deltas:
+        return state
+    # only the last operation on each flight matters
+    delta = (
+        pl.concat(
+            [cache.deltas.scan_table(t, format=format) for t in deltas],
+            how="vertical_relaxed",
+        )
+        .unique("flightid", keep="last", maintain_order=True)
+        .collect()
+    )
+    return apply_delta(state, delta)
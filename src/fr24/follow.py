@@ -0,0 +1,506 @@
+"""
+Helpers for long-running follows of a flight, see
+[fr24.service.FollowFlightService][].
+
+The first update of a stream carries the whole trail of the flight, and
+every update carries its latest position. A
+[fr24.follow.FollowFlightSession][] merges them into a single track,
+converting each point only once:
+
+```py
+from fr24.follow import FollowFlightSession
+
+session = FollowFlightSession()
+async for result in fr24.follow_flight.stream(flight_id):
+    new_points = session.update(result)
+track = session.to_polars()
+```
+
+A [fr24.follow.FollowFlightHub][] shares one upstream stream per flight
+between any number of consumers:
+
+```py
+from fr24.follow import FollowFlightHub
+
+hub = FollowFlightHub(fr24.follow_flight)
+async with hub.subscribe(flight_id) as updates:
+    async for result in updates:
+        ...
+```
+
+A [fr24.follow.FollowFlightWriter][] appends the position of every update
+to disk as it arrives, so that many flights can be followed for hours
+without holding their updates in memory:
+
+```py
+from fr24.follow import FollowFlightWriter, scan_follow_flight
+
+with FollowFlightWriter("follows") as writer:
+    async for flight_id, result in fr24.follow_flight.stream_many(ids):
+        writer.append(result)
+scan_follow_flight("follows", flight_id).collect()
+```
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal, Union
+
+from .grpc import follow_flight_dict, trail_point_dict
+from .proto import to_proto
+from .proto.v1_pb2 import RestrictionVisibility
+from .utils import raise_missing_polars, to_flight_id
+
+if TYPE_CHECKING:
+    from types import TracebackType
+
+    import polars as pl
+    from typing_extensions import Self, TypeAlias
+
+    from .proto import SupportsToProto
+    from .proto.v1_pb2 import FollowFlightResponse
+    from .service import FollowFlightResult, FollowFlightService
+    from .types import IntFlightId, IntoFlightId
+    from .types.cache import FollowFlightRecord, TrailPointRecord
+
+logger = logging.getLogger(__name__)
+
+
+class FollowFlightSession:
+    """Accumulates the track of a followed flight, deduplicated by
+    timestamp (the `snapshot_id` of trail points).
+
+    The cost of an update is proportional to the number of points that are
+    new since the previous update, not to the length of the trail, so a
+    follow does not slow down as the flight goes on.
+    """
+
+    def __init__(self, *, include_live: bool = True) -> None:
+        """
+        :param include_live: Also append the position of `flight_info` of
+            each update (with a `source` of `None`), which is more recent
+            than the trail.
+        """
+        self.include_live = include_live
+        self.latest: FollowFlightResponse | None = None
+        """The most recent update."""
+        self._seen: set[int] = set()
+        self._last_trail = -1
+        self._last = -1
+        self._sorted = True
+        self._pending: list[TrailPointRecord] = []
+        self._df: pl.DataFrame | None = None
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    def update(
+        self,
+        result: SupportsToProto[FollowFlightResponse] | FollowFlightResponse,
+    ) -> list[TrailPointRecord]:
+        """Merge an update into the track, returning its new points."""
+        response = to_proto(result)
+        self.latest = response
+        new: list[TrailPointRecord] = []
+        trail = response.flight_trail_list
+        # the trail is sorted by snapshot id, so walking it backwards stops
+        # at the first point already merged by a previous update
+        start = len(trail)
+        while start and trail[start - 1].snapshot_id > self._last_trail:
+            start -= 1
+        if start < len(trail):
+            self._last_trail = trail[-1].snapshot_id
+        for i in range(start, len(trail)):
+            tp = trail[i]
+            if tp.snapshot_id not in self._seen:
+                new.append(trail_point_dict(tp))
+        if self.include_live and response.HasField("flight_info"):
+            info = response.flight_info
+            if info.timestamp_ms:
+                new.append(
+                    {
+                        "timestamp": info.timestamp_ms // 1000,
+                        "latitude": info.lat,
+                        "longitude": info.lon,
+                        "altitude": info.alt,
+                        "ground_speed": info.speed,
+                        "track": info.track,
+                        "vertical_speed": info.vspeed,
+                        "source": None,
+                    }
+                )
+        points: list[TrailPointRecord] = []
+        for point in new:
+            timestamp = point["timestamp"]
+            if timestamp in self._seen:
+                continue
+            self._seen.add(timestamp)
+            if timestamp < self._last:
+                self._sorted = False
+            self._last = max(self._last, timestamp)
+            points.append(point)
+        self._pending.extend(points)
+        return points
+
+    def to_polars(self) -> pl.DataFrame:
+        """The track so far, sorted by timestamp, with the schema of
+        [fr24.types.cache.TrailPointRecord][].
+
+        Only the points merged since the previous call are converted."""
+        try:
+            import polars as pl
+        except ImportError as exc:
+            raise_missing_polars(exc)
+
+        from .types.cache import trail_point_schema
+
+        new = pl.DataFrame(self._pending, schema=trail_point_schema)
+        self._pending = []
+        if self._df is None:
+            self._df = new
+        elif new.height:
+            # frames returned previously are left untouched: the new rows
+            # are added as a chunk, compacted once in a while
+            self._df = pl.concat([self._df, new], rechunk=False)
+            if self._df.n_chunks() > 64:
+                self._df = self._df.rechunk()
+        if not self._sorted:
+            self._df = self._df.sort("timestamp")
+            self._sorted = True
+        return self._df
+
+
+SlowConsumerPolicy: TypeAlias = Literal["drop", "block"]
+"""What to do with an update for a subscriber whose queue is full:
+
+- `drop`: discard its oldest queued update, counted in `dropped`
+- `block`: wait for it to catch up, which holds back *all* subscribers of
+  the flight
+"""
+
+
+class _End:
+    def __init__(self, error: BaseException | None = None) -> None:
+        self.error = error
+
+
+_Item: TypeAlias = Union["FollowFlightResult", _End]
+
+
+class FollowFlightSubscription:
+    """The updates of a flight for one subscriber of a
+    [fr24.follow.FollowFlightHub][].
+
+    Iterate over it to receive the updates, it ends when the upstream
+    stream ends. If the upstream stream failed, a `RuntimeError` is raised
+    from its error (a new one for each subscriber). Leave with `aclose()` or by
+    exiting its `async with` block.
+    """
+
+    def __init__(
+        self,
+        hub: FollowFlightHub,
+        flight_id: IntFlightId,
+        maxsize: int,
+        policy: SlowConsumerPolicy,
+    ) -> None:
+        self.hub = hub
+        self.flight_id = flight_id
+        self.policy = policy
+        self.dropped = 0
+        """Number of updates discarded because the queue was full."""
+        self._queue: asyncio.Queue[_Item] = asyncio.Queue(maxsize)
+        self._closed = False
+
+    async def _put(self, item: _Item) -> None:
+        if self._closed:
+            return
+        if self.policy == "block" and not isinstance(item, _End):
+            await self._queue.put(item)
+            return
+        if self._queue.full():  # the end is always delivered
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> FollowFlightResult:
+        if self._closed:
+            raise StopAsyncIteration
+        item = await self._queue.get()
+        if isinstance(item, _End):
+            self._closed = True
+            if item.error is not None:
+                raise RuntimeError(
+                    f"upstream stream of {self.flight_id} failed"
+                ) from item.error
+            raise StopAsyncIteration
+        return item
+
+    async def aclose(self) -> None:
+        """Unsubscribe, closing the upstream stream if this was its last
+        subscriber."""
+        self._closed = True
+        await self.hub._unsubscribe(self)
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+
+class _Upstream:
+    def __init__(self) -> None:
+        self.subscribers: list[FollowFlightSubscription] = []
+        self.first: FollowFlightResult | None = None
+        self.task: asyncio.Task[None] | None = None
+
+
+class FollowFlightHub:
+    """Fans out the updates of one upstream
+    [stream][fr24.service.FollowFlightService.stream] per flight to any
+    number of subscribers.
+
+    The upstream stream is opened by the first subscriber of a flight and
+    closed when its last subscriber leaves. Each update is parsed once and
+    the same [fr24.service.FollowFlightResult][] is delivered to all
+    subscribers. As only the first update of a stream carries the aircraft
+    information and the trail, subscribers joining an open stream receive
+    that first update before the live ones.
+    """
+
+    def __init__(
+        self,
+        service: FollowFlightService,
+        *,
+        restriction_mode: (
+            RestrictionVisibility.ValueType | str | bytes
+        ) = RestrictionVisibility.NOT_VISIBLE,
+    ) -> None:
+        self.service = service
+        self.restriction_mode = restriction_mode
+        self._upstreams: dict[IntFlightId, _Upstream] = {}
+
+    @property
+    def flight_ids(self) -> list[IntFlightId]:
+        """Flights with an open upstream stream."""
+        return list(self._upstreams)
+
+    def subscribe(
+        self,
+        flight_id: IntoFlightId,
+        *,
+        maxsize: int = 64,
+        policy: SlowConsumerPolicy = "drop",
+    ) -> FollowFlightSubscription:
+        """Subscribe to the updates of a flight.
+
+        :param maxsize: Maximum number of updates queued for the subscriber.
+        :param policy: See [fr24.follow.SlowConsumerPolicy][].
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        fid = to_flight_id(flight_id)
+        subscription = FollowFlightSubscription(self, fid, maxsize, policy)
+        upstream = self._upstreams.get(fid)
+        if upstream is None:
+            upstream = self._upstreams[fid] = _Upstream()
+            upstream.task = asyncio.ensure_future(self._run(fid, upstream))
+        elif upstream.first is not None:
+            subscription._queue.put_nowait(upstream.first)
+        upstream.subscribers.append(subscription)
+        return subscription
+
+    async def _run(self, flight_id: IntFlightId, upstream: _Upstream) -> None:
+        end = _End()
+        try:
+            async for result in self.service.stream(
+                flight_id, restriction_mode=self.restriction_mode
+            ):
+                result.to_proto()
+                if upstream.first is None:
+                    upstream.first = result
+                for subscription in list(upstream.subscribers):
+                    await subscription._put(result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"{flight_id}: upstream stream failed: {e!r}")
+            end = _End(e)
+        if self._upstreams.get(flight_id) is upstream:
+            del self._upstreams[flight_id]
+        for subscription in upstream.subscribers:
+            await subscription._put(end)
+
+    async def _unsubscribe(
+        self, subscription: FollowFlightSubscription
+    ) -> None:
+        upstream = self._upstreams.get(subscription.flight_id)
+        if upstream is None or subscription not in upstream.subscribers:
+            return
+        upstream.subscribers.remove(subscription)
+        if upstream.subscribers:
+            # release the upstream if it is blocked on this subscriber
+            while not subscription._queue.empty():
+                subscription._queue.get_nowait()
+            return
+        del self._upstreams[subscription.flight_id]
+        assert upstream.task is not None
+        upstream.task.cancel()
+        # unlike awaiting the task, waiting for it neither forwards our own
+        # cancellation to it nor mistakes its cancellation for ours
+        await asyncio.wait([upstream.task])
+
+    async def aclose(self) -> None:
+        """Close all upstream streams, ending every subscription."""
+        upstreams = list(self._upstreams.values())
+        self._upstreams.clear()
+        for upstream in upstreams:
+            assert upstream.task is not None
+            upstream.task.cancel()
+        for upstream in upstreams:
+            assert upstream.task is not None
+            await asyncio.wait([upstream.task])
+            for subscription in upstream.subscribers:
+                await subscription._put(_End())
+
+
+class FollowFlightWriter:
+    """Appends the position and Enhanced Mode-S data of each update (see
+    [fr24.types.cache.FollowFlightRecord][]) to rolling parquet files, one
+    directory per flight:
+
+    ```
+    {path}/{flight_id:x}/000000.parquet
+    {path}/{flight_id:x}/000001.parquet
+    ...
+    ```
+
+    The updates of a flight are buffered until `max_rows` of them are
+    pending or the oldest has waited `max_interval` seconds, then written to
+    a new part. Stale buffers of *all* flights are flushed on each append, so
+    a flight that stopped updating is still written out as long as others
+    are; call [fr24.follow.FollowFlightWriter.flush_stale][] periodically
+    if appends may stop altogether. A part is written to a
+    temporary file and renamed into place, so a crash never leaves a
+    partially written part behind: at most the buffered updates are lost.
+    Writing to an existing directory continues its numbering.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        max_rows: int = 4096,
+        max_interval: float = 60.0,
+    ) -> None:
+        self.path = Path(path)
+        self.max_rows = max_rows
+        self.max_interval = max_interval
+        self._pending: dict[IntFlightId, list[FollowFlightRecord]] = {}
+        self._since: dict[IntFlightId, float] = {}
+        self._parts: dict[IntFlightId, int] = {}
+
+    def flight_path(self, flight_id: IntoFlightId) -> Path:
+        return self.path / f"{to_flight_id(flight_id):x}"
+
+    def append(
+        self,
+        result: SupportsToProto[FollowFlightResponse] | FollowFlightResponse,
+    ) -> None:
+        response = to_proto(result)
+        if not response.HasField("flight_info"):
+            return
+        flight_id = response.flight_info.flightid
+        pending = self._pending.setdefault(flight_id, [])
+        if not pending:
+            self._since[flight_id] = time.monotonic()
+        pending.append(follow_flight_dict(response))
+        if len(pending) >= self.max_rows:
+            self.flush(flight_id)
+        self.flush_stale()
+
+    def flush_stale(self) -> None:
+        """Write the pending updates of every flight whose oldest pending
+        update has waited at least `max_interval` seconds."""
+        now = time.monotonic()
+        for fid, since in list(self._since.items()):
+            if now - since >= self.max_interval:
+                self.flush(fid)
+
+    def flush(self, flight_id: IntoFlightId | None = None) -> None:
+        """Write the pending updates of a flight (or of all flights)."""
+        if flight_id is None:
+            for fid in list(self._pending):
+                self.flush(fid)
+            return
+        try:
+            import polars as pl
+        except ImportError as exc:
+            raise_missing_polars(exc)
+
+        from .types.cache import follow_flight_schema
+
+        fid = to_flight_id(flight_id)
+        pending = self._pending.pop(fid, None)
+        self._since.pop(fid, None)
+        if not pending:
+            return
+        directory = self.flight_path(fid)
+        if (part := self._parts.get(fid)) is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            part = 1 + max(
+                (int(f.stem) for f in directory.glob("*.parquet")), default=-1
+            )
+        fp = directory / f"{part:06d}.parquet"
+        tmp = fp.with_suffix(".tmp")
+        pl.DataFrame(pending, schema=follow_flight_schema).write_parquet(tmp)
+        tmp.replace(fp)
+        self._parts[fid] = part + 1
+
+    def close(self) -> None:
+        """Write all pending updates."""
+        self.flush()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def scan_follow_flight(
+    path: Path | str, flight_id: IntoFlightId
+) -> pl.LazyFrame:
+    """Lazily read all parts written by a [fr24.follow.FollowFlightWriter][]
+    for a flight, in order."""
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    from .types.cache import follow_flight_schema
+
+    files = sorted(
+        (Path(path) / f"{to_flight_id(flight_id):x}").glob("*.parquet")
+    )
+    if not files:
+        return pl.LazyFrame(schema=follow_flight_schema)
+    return pl.scan_parquet(files)
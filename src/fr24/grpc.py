@@ -17,19 +17,32 @@ Methods:
 - `FlightDetails`
 - `PlaybackFlight`
 
+Functions of unary methods accept an optional `hedge` to race a duplicate
+of slow requests, see [fr24.hedging.Hedger][].
 """
 
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass, field
-from typing import TYPE_CHECKING, NamedTuple, Sequence, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Generic,
+    Hashable,
+    NamedTuple,
+    Sequence,
+    TypeVar,
+    Union,
+)
 
 import httpx
 from google.protobuf.field_mask_pb2 import FieldMask
 from google.protobuf.message import Message
 
 from .proto import (
-    ProtoError,
+    GrpcFrameDecoder,
     SupportsToProto,
     encode_message,
     to_proto,
@@ -43,6 +56,7 @@ from .proto.v1_pb2 import (
     FlightDetailsResponse,
     FollowedFlight,
     FollowFlightRequest,
+    FollowFlightResponse,
     Geolocation,
     HistoricTrailRequest,
     HistoricTrailResponse,
@@ -69,6 +83,7 @@ from .proto.v1_pb2 import (
     TrailPoint,
     VisibilitySettings,
 )
+from .proto.wire import WireFormatError, scan_live_feed_response
 from .types.isqx import DistanceM, DurationS, LatitudeDeg, LongitudeDeg
 from .utils import (
     dataclass_opts,
@@ -85,11 +100,14 @@ if TYPE_CHECKING:
     from google.protobuf.internal.enum_type_wrapper import _V, _EnumTypeWrapper
     from typing_extensions import TypeAlias
 
+    from .hedging import Hedger
+    from .proto import GrpcEncoding
     from .types import IntoFlightId, IntoTimestamp
     from .types.cache import (
         EMSRecord,
         FlightDetailsRecord,
         FlightRecord,
+        FollowFlightRecord,
         LiveFlightStatusRecord,
         NearbyFlightRecord,
         PlaybackFlightRecord,
@@ -99,25 +117,112 @@ if TYPE_CHECKING:
     )
     from .types.grpc import LiveFeedField
 
+_M = TypeVar("_M", bound=Message)
+
 #
 # helpers
 #
 
 
+GRPC_ENDPOINT = "https://data-feed.flightradar24.com/fr24.feed.api.v1.Feed"
+
+
 def construct_request(
     method_name: str,
     message: Message,
     headers: httpx.Headers,
+    *,
+    compression: GrpcEncoding | None = None,
 ) -> httpx.Request:
-    """Construct the gRPC request with encoded gRPC body."""
+    """Construct the gRPC request with encoded gRPC body.
+
+    :param compression: Compress the request message. Requests are small, so
+        this is rarely worthwhile.
+    """
+    if compression not in (None, "identity"):
+        headers = httpx.Headers(headers)
+        headers["grpc-encoding"] = compression
     return httpx.Request(
         "POST",
-        f"https://data-feed.flightradar24.com/fr24.feed.api.v1.Feed/{method_name}",
+        f"{GRPC_ENDPOINT}/{method_name}",
         headers=headers,
-        content=encode_message(message),
+        content=encode_message(message, compression),
     )
 
 
+class PreparedCall(Generic[_M]):
+    """A gRPC call which keeps its URL, headers and encoded body around, for
+    polling the same endpoint repeatedly.
+
+    The body is only re-encoded when the message (or the parameters it is
+    built from) is no longer equal to the previous one, e.g. when the
+    `timestamp` of a playback changes. Parameters with a `timestamp` of
+    `now` are always re-encoded because they resolve to the current time.
+    """
+
+    __slots__ = ("_content", "_message", "encodes", "headers", "url")
+
+    def __init__(self, method_name: str, headers: httpx.Headers) -> None:
+        self.url = httpx.URL(f"{GRPC_ENDPOINT}/{method_name}")
+        self.headers = headers
+        self.encodes = 0
+        """Number of times the body was encoded."""
+        self._message: SupportsToProto[_M] | _M | None = None
+        self._content = b""
+
+    def build_request(self, message: SupportsToProto[_M] | _M) -> httpx.Request:
+        if (
+            message != self._message
+            or getattr(message, "timestamp", None) == "now"
+        ):
+            self._content = encode_message(to_proto(message))
+            # a copy, so that mutating the caller's params (e.g. the `fields`
+            # set) in place is not mistaken for an unchanged message
+            self._message = copy.deepcopy(message)
+            self.encodes += 1
+        return httpx.Request(
+            "POST", self.url, headers=self.headers, content=self._content
+        )
+
+    async def send(
+        self,
+        client: httpx.AsyncClient,
+        message: SupportsToProto[_M] | _M,
+        *,
+        hedge: Hedger | None = None,
+    ) -> httpx.Response:
+        return await _send(client, self.build_request(message), hedge)
+
+
+class PreparedCallCache(Generic[_M]):
+    """Least recently used [fr24.grpc.PreparedCall][]s of one method, keyed
+    by e.g. the bounding box of each tile of a world sweep."""
+
+    def __init__(self, method_name: str, maxsize: int = 1024) -> None:
+        self.method_name = method_name
+        self.maxsize = maxsize
+        self._calls: dict[Hashable, PreparedCall[_M]] = {}
+
+    def get(self, key: Hashable, headers: httpx.Headers) -> PreparedCall[_M]:
+        """Get the call for `key`, preparing a new one if there is none or
+        if `headers` changed (e.g. after logging in)."""
+        call = self._calls.pop(key, None)
+        if call is None or call.headers is not headers:
+            call = PreparedCall(self.method_name, headers)
+            if len(self._calls) >= self.maxsize:
+                del self._calls[next(iter(self._calls))]
+        self._calls[key] = call
+        return call
+
+
+async def _send(
+    client: httpx.AsyncClient, request: httpx.Request, hedge: Hedger | None
+) -> httpx.Response:
+    if hedge is None:
+        return await client.send(request)
+    return await hedge.send(client, request)
+
+
 def to_protobuf_enum(
     enum: _V | str | bytes,
     type_wrapper: _EnumTypeWrapper[_V],
@@ -195,9 +300,11 @@ async def live_feed(
     client: httpx.AsyncClient,
     message: IntoLiveFeedRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, LiveFeedResponse]:
     request = construct_request("LiveFeed", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def live_feed_position_buffer_dict(
@@ -237,9 +344,168 @@ def live_feed_flightdata_dict(lfr: Flight) -> FlightRecord:
     }
 
 
+class PositionBufferColumns(NamedTuple):
+    """Flattened recent positions of many flights."""
+
+    lengths: Sequence[int]
+    """Number of recent positions for each flight"""
+    delta_lat: Sequence[int]
+    delta_lon: Sequence[int]
+    delta_ms: Sequence[int]
+
+
+def live_feed_flightdata_columns(
+    flights: Sequence[Flight],
+) -> tuple[dict[str, Sequence[Any]], PositionBufferColumns]:
+    """Convert the protobuf messages to per-field columns.
+
+    Unlike [fr24.grpc.live_feed_flightdata_dict][], this does not allocate a
+    dictionary for each flight and recent position.
+    """
+    extra_infos = [lfr.extra_info for lfr in flights]
+    routes = [ei.route for ei in extra_infos]
+    columns: dict[str, Sequence[Any]] = {
+        "timestamp": [lfr.timestamp_ms for lfr in flights],
+        "flightid": [lfr.flightid for lfr in flights],
+        "latitude": [lfr.lat for lfr in flights],
+        "longitude": [lfr.lon for lfr in flights],
+        "track": [lfr.track for lfr in flights],
+        "altitude": [lfr.alt for lfr in flights],
+        "ground_speed": [lfr.speed for lfr in flights],
+        "on_ground": [lfr.on_ground for lfr in flights],
+        "callsign": [lfr.callsign for lfr in flights],
+        "source": [lfr.source for lfr in flights],
+        "registration": [ei.reg for ei in extra_infos],
+        "origin": [getattr(route, "from") for route in routes],
+        "destination": [route.to for route in routes],
+        "typecode": [ei.type for ei in extra_infos],
+        "eta": [ei.schedule.eta for ei in extra_infos],
+        "squawk": [ei.squawk for ei in extra_infos],
+        "vertical_speed": [ei.vspeed for ei in extra_infos],
+    }
+    recent_positions = [
+        lfr.position_buffer.recent_positions_list for lfr in flights
+    ]
+    flat = [rp for rps in recent_positions for rp in rps]
+    position_buffer = PositionBufferColumns(
+        lengths=[len(rps) for rps in recent_positions],
+        delta_lat=[rp.delta_lat for rp in flat],
+        delta_lon=[rp.delta_lon for rp in flat],
+        delta_ms=[rp.delta_ms for rp in flat],
+    )
+    return columns, position_buffer
+
+
+def position_buffer_series(columns: PositionBufferColumns) -> pl.Series:
+    """Build the `position_buffer` column from flattened recent positions.
+
+    All recent positions are stored in one struct series, which is then sliced
+    into a list for each flight.
+    """
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    from .types.cache import position_buffer_struct_schema
+
+    assert position_buffer_struct_schema is not None
+    if not columns.lengths:
+        return pl.Series(
+            "position_buffer",
+            [],
+            dtype=pl.List(pl.Struct(position_buffer_struct_schema)),
+        )
+    flat = pl.DataFrame(
+        {
+            "delta_lat": columns.delta_lat,
+            "delta_lon": columns.delta_lon,
+            "delta_ms": columns.delta_ms,
+        },
+        schema=position_buffer_struct_schema,
+    ).to_struct("position_buffer")
+    lengths = pl.Series(columns.lengths, dtype=pl.Int64)
+    return (
+        pl.DataFrame({"offset": lengths.cum_sum() - lengths, "len": lengths})
+        .select(
+            pl.lit(flat.implode())
+            .first()
+            .list.slice(pl.col("offset"), pl.col("len"))
+            .alias("position_buffer")
+        )
+        .to_series()
+    )
+
+
+def live_feed_columns_df(
+    columns: dict[str, Sequence[Any]],
+    position_buffer: PositionBufferColumns,
+    schema: dict[str, pl.DataType] | None = None,
+) -> pl.DataFrame:
+    """Build a dataframe conforming to the `live_feed_schema` from columns.
+
+    :param schema: The output schema. Defaults to
+        [fr24.types.cache.live_feed_schema][]. Columns missing from `columns`
+        must come after `position_buffer` (e.g. `distance` in nearest
+        flights) and are appended by the caller.
+    """
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    from .types.cache import live_feed_schema
+
+    schema = live_feed_schema if schema is None else schema
+    assert schema is not None
+    return pl.DataFrame(
+        columns,
+        schema={name: schema[name] for name in columns},
+    ).with_columns(position_buffer_series(position_buffer))
+
+
+def live_feed_flights_df(flights: Sequence[Flight]) -> pl.DataFrame:
+    """Convert a sequence of protobuf flights to a dataframe."""
+    return live_feed_columns_df(*live_feed_flightdata_columns(flights))
+
+
 def live_feed_df(
     data: LiveFeedResponse,
 ) -> pl.DataFrame:
+    return live_feed_flights_df(data.flights_list)
+
+
+def live_feed_wire_df(
+    message: bytes,
+    fields: Collection[LiveFeedField] | None = None,
+) -> pl.DataFrame:
+    """Convert a serialised `LiveFeedResponse` to a dataframe, without
+    materialising any protobuf messages.
+
+    Falls back to [fr24.grpc.live_feed_df][] if the scanner encounters an
+    unsupported wire type.
+
+    :param message: The serialised protobuf message, e.g. from
+        [fr24.proto.parse_payload][].
+    :param fields: The `field_mask` paths of the request, see
+        [fr24.proto.wire.scan_live_feed_response][].
+    """
+    try:
+        columns, position_buffer = scan_live_feed_response(message, fields)
+    except WireFormatError:
+        return live_feed_df(LiveFeedResponse.FromString(message))
+    return live_feed_columns_df(
+        columns, PositionBufferColumns(*position_buffer)
+    )
+
+
+def live_feed_merge_df(frames: Sequence[pl.DataFrame]) -> pl.DataFrame:
+    """Concatenate live feed dataframes, e.g. of adjacent bounding boxes.
+
+    Flights appearing more than once (typically those on a tile boundary) are
+    deduplicated by their `flightid`, keeping the row with the latest
+    `timestamp`. The output is sorted by `flightid`.
+    """
     try:
         import polars as pl
     except ImportError as exc:
@@ -247,9 +513,13 @@ def live_feed_df(
 
     from .types.cache import live_feed_schema
 
-    return pl.DataFrame(
-        (live_feed_flightdata_dict(lfr) for lfr in data.flights_list),
-        schema=live_feed_schema,
+    if not frames:
+        return pl.DataFrame(schema=live_feed_schema)
+    return (
+        pl.concat(frames)
+        .sort("timestamp")
+        .unique("flightid", keep="last")
+        .sort("flightid")
     )
 
 
@@ -314,28 +584,17 @@ async def live_feed_playback(
     client: httpx.AsyncClient,
     message: IntoPlaybackRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, LiveFeedResponse]:
     request = construct_request("Playback", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def live_feed_playback_df(
     data: PlaybackResponse,
 ) -> pl.DataFrame:
-    try:
-        import polars as pl
-    except ImportError as exc:
-        raise_missing_polars(exc)
-
-    from .types.cache import live_feed_schema
-
-    return pl.DataFrame(
-        (
-            live_feed_flightdata_dict(lfr)
-            for lfr in data.live_feed_response.flights_list
-        ),
-        schema=live_feed_schema,
-    )
+    return live_feed_flights_df(data.live_feed_response.flights_list)
 
 
 IntoNearestFlightsRequest: TypeAlias = Union[
@@ -366,9 +625,11 @@ async def nearest_flights(
     client: httpx.AsyncClient,
     message: IntoNearestFlightsRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, NearestFlightsResponse]:
     request = construct_request("NearestFlights", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 IntoLiveFlightsStatusRequest: TypeAlias = Union[
@@ -393,9 +654,19 @@ def nearest_flights_df(
 
     from .types.cache import nearest_flights_schema
 
-    return pl.DataFrame(
-        (nearest_flights_nearbyflight_dict(nf) for nf in data.flights_list),
-        schema=nearest_flights_schema,
+    assert nearest_flights_schema is not None
+    nearby_flights = data.flights_list
+    columns, position_buffer = live_feed_flightdata_columns(
+        [nf.flight for nf in nearby_flights]
+    )
+    return live_feed_columns_df(
+        columns, position_buffer, schema=nearest_flights_schema
+    ).with_columns(
+        pl.Series(
+            "distance",
+            [nf.distance for nf in nearby_flights],
+            dtype=nearest_flights_schema["distance"],
+        )
     )
 
 
@@ -414,9 +685,11 @@ async def live_flights_status(
     client: httpx.AsyncClient,
     message: IntoLiveFlightsStatusRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, LiveFlightsStatusResponse]:
     request = construct_request("LiveFlightsStatus", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def live_flights_status_flightstatusdata_dict(
@@ -452,6 +725,23 @@ def live_flights_status_df(
     )
 
 
+def live_flights_status_merge_df(
+    frames: Sequence[pl.DataFrame],
+) -> pl.DataFrame:
+    """Concatenate live flights status dataframes, e.g. of the chunks of a
+    watchlist, deduplicated and sorted by `flight_id`."""
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    from .types.cache import live_flights_status_schema
+
+    if not frames:
+        return pl.DataFrame(schema=live_flights_status_schema)
+    return pl.concat(frames).unique("flight_id").sort("flight_id")
+
+
 IntoFetchSearchIndexRequest: TypeAlias = Union[
     SupportsToProto[FetchSearchIndexRequest], FetchSearchIndexRequest
 ]
@@ -495,16 +785,63 @@ async def follow_flight_stream(
     client: httpx.AsyncClient,
     message: IntoFollowFlightRequest,
     headers: httpx.Headers,
-) -> AsyncGenerator[Annotated[bytes, ProtoError]]:
+    *,
+    decoder: GrpcFrameDecoder | None = None,
+) -> AsyncGenerator[Annotated[bytes, FollowFlightResponse]]:
+    """Stream the updates of a flight, one complete DATA frame at a time,
+    regardless of how the network chunks the body.
+
+    :param decoder: Reassembles the frames. Pass one to read the trailers
+        and final `status` once the stream ends.
+    :raises ProtoParseError: If the stream ends within a frame.
+    """
     request = construct_request("FollowFlight", to_proto(message), headers)
+    if decoder is None:
+        decoder = GrpcFrameDecoder()
     response = await client.send(request, stream=True)
     try:
         async for chunk in response.aiter_bytes():
-            yield chunk
+            for frame in decoder.feed(chunk):
+                yield frame
+        decoder.close(response.headers)
     finally:
         await response.aclose()
 
 
+def follow_flight_dict(response: FollowFlightResponse) -> FollowFlightRecord:
+    """The position and Enhanced Mode-S data of an update."""
+    flight_info = response.flight_info
+    return {
+        "timestamp_ms": flight_info.timestamp_ms,
+        "flightid": flight_info.flightid,
+        "latitude": flight_info.lat,
+        "longitude": flight_info.lon,
+        "track": flight_info.track,
+        "altitude": flight_info.alt,
+        "ground_speed": flight_info.speed,
+        "vertical_speed": flight_info.vspeed,
+        "on_ground": flight_info.on_ground,
+        "callsign": flight_info.callsign,
+        "squawk": flight_info.squawk,
+        "ems": ems_dict(flight_info.ems_info),
+        "server_time_ms": flight_info.server_time_ms,
+    }
+
+
+def follow_flight_df(responses: Sequence[FollowFlightResponse]) -> pl.DataFrame:
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    from .types.cache import follow_flight_schema
+
+    return pl.DataFrame(
+        [follow_flight_dict(r) for r in responses],
+        schema=follow_flight_schema,
+    )
+
+
 @dataclass(**dataclass_opts)
 class TopFlightsParams(SupportsToProto[TopFlightsRequest]):
     limit: int = 10
@@ -523,9 +860,11 @@ async def top_flights(
     client: httpx.AsyncClient,
     message: IntoTopFlightsRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, TopFlightsResponse]:
     request = construct_request("TopFlights", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def top_flights_dict(ff: FollowedFlight) -> TopFlightRecord:
@@ -568,12 +907,14 @@ async def live_trail(
     client: httpx.AsyncClient,
     message: IntoLiveTrailRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, LiveTrailResponse]:
     """!!! warning "Unstable API: returns empty `DATA` frame as of Sep 2024"
 
     Contains empty `DATA` frame error if flight_id is not live"""
     request = construct_request("LiveTrail", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 IntoHistoricTrailRequest: TypeAlias = Union[
@@ -624,10 +965,12 @@ async def flight_details(
     client: httpx.AsyncClient,
     message: IntoFlightDetailsRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, FlightDetailsResponse]:
     """contains empty `DATA` frame error if flight_id is not live"""
     request = construct_request("FlightDetails", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def flight_details_dict(
@@ -773,10 +1116,12 @@ async def playback_flight(
     client: httpx.AsyncClient,
     message: IntoPlaybackFlightRequest,
     headers: httpx.Headers,
+    *,
+    hedge: Hedger | None = None,
 ) -> Annotated[httpx.Response, PlaybackFlightResponse]:
     """contains empty `DATA` frame error if flight_id is live"""
     request = construct_request("PlaybackFlight", to_proto(message), headers)
-    return await client.send(request)
+    return await _send(client, request, hedge)
 
 
 def playback_flight_dict(
@@ -0,0 +1,127 @@
+"""
+Hedged requests: cut tail latency by racing a duplicate of slow requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+
+import httpx
+
+
+class Hedger:
+    """Sends a duplicate of a request which has not completed within the
+    `percentile` of recently observed latencies, and returns whichever
+    completes first. The other one is cancelled.
+
+    Only idempotent requests should be hedged, e.g. the unary gRPC calls in
+    [fr24.grpc][]. Share one instance between requests of similar latency
+    (e.g. all tiles of a world sweep) so that it learns their distribution.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        *,
+        budget: float = 0.05,
+        window: int = 256,
+        min_samples: int = 16,
+    ) -> None:
+        """
+        :param percentile: Latency quantile after which a hedge is sent.
+        :param budget: Maximum number of hedges as a fraction of all
+            requests, e.g. `0.05` for at most 5% extra load.
+        :param window: Number of recent latencies to track.
+        :param min_samples: Do not hedge until this many latencies were
+            observed.
+        """
+        if not 0 < percentile < 1:
+            raise ValueError("percentile must be in (0, 1)")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.requests = 0
+        """Number of requests sent, excluding hedges."""
+        self.hedges = 0
+        """Number of hedges sent."""
+        self.hedge_wins = 0
+        """Number of hedges which completed before the original request."""
+
+    def delay(self) -> float | None:
+        """Seconds after which a request is hedged, `None` if there are not
+        enough samples yet."""
+        if len(self.latencies) < self.min_samples:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[
+            min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        ]
+
+    def _within_budget(self) -> bool:
+        return self.hedges + 1 <= self.budget * self.requests
+
+    async def send(
+        self, client: httpx.AsyncClient, request: httpx.Request
+    ) -> httpx.Response:
+        """Send `request`, hedging it if it is slow and the budget allows."""
+        self.requests += 1
+        start = time.monotonic()
+        primary = asyncio.ensure_future(client.send(request))
+        try:
+            delay = self.delay()
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+            if primary.done() or delay is None or not self._within_budget():
+                response = await primary
+            else:
+                response = await self._race(client, request, primary)
+        except BaseException:
+            primary.cancel()
+            raise
+        self.latencies.append(time.monotonic() - start)
+        return response
+
+    async def _race(
+        self,
+        client: httpx.AsyncClient,
+        request: httpx.Request,
+        primary: asyncio.Future[httpx.Response],
+    ) -> httpx.Response:
+        self.hedges += 1
+        # a copy, so that event hooks can tell both requests apart
+        duplicate = httpx.Request(
+            request.method,
+            request.url,
+            headers=request.headers,
+            content=request.content,
+            extensions=dict(request.extensions),
+        )
+        hedge = asyncio.ensure_future(client.send(duplicate))
+        pending: set[asyncio.Future[httpx.Response]] = {primary, hedge}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                # prefer the original if both completed at once
+                for winner in sorted(done, key=lambda f: f is not primary):
+                    if winner.exception() is None:
+                        if winner is hedge:
+                            self.hedge_wins += 1
+                        for loser in pending | done - {winner}:
+                            await _discard(loser)
+                        return winner.result()
+            return primary.result()  # both failed: raise the original error
+        finally:
+            for task in (primary, hedge):
+                task.cancel()
+
+
+async def _discard(task: asyncio.Future[httpx.Response]) -> None:
+    if not task.done():
+        task.cancel()
+    elif not task.cancelled() and task.exception() is None:
+        await task.result().aclose()
@@ -0,0 +1,409 @@
+"""
+Per-request timings and sizes, reported to hooks registered on the
+[fr24.HTTPClient][]:
+
+```py
+from fr24 import FR24
+from fr24.instrumentation import HistogramSink
+
+sink = HistogramSink()
+async with FR24() as fr24:
+    fr24.http.add_hook(sink)
+    result = await fr24.live_feed.fetch_world()
+    result.to_polars()
+print(sink.histograms["LiveFeed", "ttfb"].quantile(0.95))
+```
+
+Connection timings are taken from the `trace` extension of `httpcore`, so
+they are only available with the default transports. Requests which fail
+before a response is received are not reported.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import httpx
+
+from .transport import _grpc_status, _TrackedStream
+
+if TYPE_CHECKING:
+    from typing import Awaitable, Callable, Iterable
+
+EVENT_EXTENSION = "fr24.request_event"
+"""Key of the [fr24.instrumentation.RequestEvent][] in the `extensions` of
+an instrumented request and its response."""
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+"""Default upper bounds of the duration histograms, seconds."""
+
+
+@dataclass
+class RequestEvent:
+    """Timings of a single request. Durations are in seconds, `None` if
+    the phase did not happen (yet)."""
+
+    endpoint: str
+    """Last segment of the URL path, e.g. `LiveFeed` or `list.json`."""
+    method: str
+    status_code: int | None = None
+    grpc_status: int | None = None
+    """From the headers, or the trailers at the end of a gRPC-web body if it
+    was read."""
+    queue: float | None = None
+    """From sending the request to the connection pool picking it up,
+    including waits for rate limits."""
+    connect: float | None = None
+    """TCP and TLS handshakes, `0` if an existing connection was reused."""
+    ttfb: float | None = None
+    """From sending the request headers to receiving the response headers."""
+    download: float | None = None
+    """From receiving the response headers to closing the response."""
+    total: float | None = None
+    response_bytes: int = 0
+    """Size of the body as received, i.e. before decompression."""
+    parse: dict[str, float] = field(default_factory=dict)
+    """Time spent decoding the response, by accessor (`proto`, `dict`,
+    `polars`). Nested accessors are included, e.g. `polars` includes the
+    time of `proto` if it was not memoized yet."""
+    rows: int | None = None
+    """Height of the dataframe built from the response, if any."""
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _marks: dict[str, float] = field(default_factory=dict, repr=False)
+    _headers: float = field(default=0.0, repr=False)
+    _hooks: list[RequestHook] = field(default_factory=list, repr=False)
+
+    async def _trace(self, name: str, info: dict[str, Any]) -> None:
+        self._marks.setdefault(name, time.perf_counter())
+
+    def _mark(self, suffix: str) -> float | None:
+        times = [t for name, t in self._marks.items() if name.endswith(suffix)]
+        return min(times) if times else None
+
+    def _on_headers(self, response: httpx.Response) -> None:
+        now = time.perf_counter()
+        started = min(self._marks.values(), default=now)
+        self.queue = started - self._start
+        self.connect = 0.0
+        if (connected := self._mark(".connect_tcp.started")) is not None:
+            done = self._mark(".start_tls.complete") or self._mark(
+                ".connect_tcp.complete"
+            )
+            self.connect = (done or now) - connected
+        sent = self._mark(".send_request_headers.started") or started
+        self._headers = self._mark(".receive_response_headers.complete") or now
+        self.ttfb = self._headers - sent
+        self.status_code = response.status_code
+        if (status := response.headers.get("grpc-status")) is not None:
+            self.grpc_status = int(status) if status.isdigit() else None
+
+    def _on_close(
+        self, response: httpx.Response, tail: bytes, size: int
+    ) -> None:
+        now = time.perf_counter()
+        self.download = now - self._headers
+        self.total = now - self._start
+        self.response_bytes = size
+        if self.grpc_status is None:
+            self.grpc_status = _grpc_status(tail)
+        for hook in self._hooks:
+            hook.on_response(self)
+
+    def _on_parse(self, accessor: str, seconds: float, value: Any) -> None:
+        self.parse[accessor] = self.parse.get(accessor, 0.0) + seconds
+        if accessor == "polars":
+            self.rows = value.height
+        for hook in self._hooks:
+            hook.on_parse(self, accessor, seconds)
+
+
+class RequestHook:
+    """Receives the [fr24.instrumentation.RequestEvent][] of every request
+    made through a [fr24.HTTPClient][]. Subclass and override either
+    method. Hooks are called synchronously and should not block."""
+
+    def on_response(self, event: RequestEvent) -> None:
+        """Called once the response is closed, i.e. its body was read or
+        the stream ended."""
+
+    def on_parse(
+        self, event: RequestEvent, accessor: str, seconds: float
+    ) -> None:
+        """Called after the response was decoded by an accessor of its
+        result, e.g. `to_polars()`."""
+
+
+@dataclass
+class Instrumentation:
+    """Installs event hooks on an `httpx` client when the first
+    [fr24.instrumentation.RequestHook][] is added, so that an
+    uninstrumented client pays no overhead."""
+
+    hooks: list[RequestHook] = field(default_factory=list)
+    _installed: set[int] = field(default_factory=set, repr=False)
+
+    def install(self, client: httpx.AsyncClient) -> None:
+        if id(client) in self._installed:
+            return
+        self._installed.add(id(client))
+        client.event_hooks = {
+            "request": [*client.event_hooks["request"], self._on_request],
+            "response": [*client.event_hooks["response"], self._on_response],
+        }
+
+    async def _on_request(self, request: httpx.Request) -> None:
+        if not self.hooks:
+            return
+        event = RequestEvent(
+            endpoint=request.url.path.rsplit("/", 1)[-1],
+            method=request.method,
+            _hooks=self.hooks,
+        )
+        inner = request.extensions.get("trace")
+        if isinstance(getattr(inner, "__self__", None), RequestEvent):
+            inner = None  # resent, e.g. by a retry
+        request.extensions[EVENT_EXTENSION] = event
+        request.extensions["trace"] = (
+            event._trace if inner is None else _chain(event._trace, inner)
+        )
+
+    async def _on_response(self, response: httpx.Response) -> None:
+        event = response.request.extensions.get(EVENT_EXTENSION)
+        if not isinstance(event, RequestEvent):
+            return
+        response.extensions[EVENT_EXTENSION] = event
+        event._on_headers(response)
+        if response.is_closed:  # body already read, e.g. by a mock
+            content = response.content
+            event._on_close(response, content[-256:], len(content))
+            return
+        tail = bytearray()
+
+        def on_chunk(chunk: bytes) -> None:
+            tail.extend(chunk)
+            del tail[:-256]
+
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _TrackedStream(
+            response.stream,
+            lambda: event._on_close(
+                response, bytes(tail), response.num_bytes_downloaded
+            ),
+            on_chunk,
+        )
+
+
+def _chain(
+    *traces: Callable[[str, dict[str, Any]], Awaitable[None]],
+) -> Callable[[str, dict[str, Any]], Awaitable[None]]:
+    async def trace(name: str, info: dict[str, Any]) -> None:
+        for t in traces:
+            await t(name, info)
+
+    return trace
+
+
+def request_event(response: httpx.Response) -> RequestEvent | None:
+    """The event of an instrumented response, if any."""
+    event = response.extensions.get(EVENT_EXTENSION)
+    return event if isinstance(event, RequestEvent) else None
+
+
+class Histogram:
+    """A cumulative histogram with fixed bucket bounds."""
+
+    def __init__(self, buckets: Iterable[float] = DURATION_BUCKETS) -> None:
+        self.bounds = sorted(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        """Number of observations per bucket, the last one being `+Inf`.
+        Not cumulative."""
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        lo, hi = 0, len(self.bounds)
+        while lo < hi:  # first bound >= value
+            mid = (lo + hi) // 2
+            if self.bounds[mid] < value:
+                lo = mid + 1
+            else:
+                hi = mid
+        self.counts[lo] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket,
+        `nan` if empty. Quantiles in the `+Inf` bucket return the largest
+        bound."""
+        if self.count == 0:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                if i == len(self.bounds):
+                    return self.bounds[-1]
+                lower = self.bounds[i - 1] if i > 0 else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1]
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else math.nan
+
+
+PHASES = ("queue", "connect", "ttfb", "download", "total")
+
+
+class HistogramSink(RequestHook):
+    """Aggregates events in memory, by endpoint.
+
+    Durations go to `histograms[endpoint, phase]`, where `phase` is one of
+    `queue`, `connect`, `ttfb`, `download`, `total` or `parse_<accessor>`.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DURATION_BUCKETS) -> None:
+        self.buckets = tuple(buckets)
+        self.histograms: dict[tuple[str, str], Histogram] = {}
+        self.requests: dict[tuple[str, int | None, int | None], int] = {}
+        """Number of responses by endpoint, HTTP status and gRPC status."""
+        self.response_bytes: dict[str, int] = {}
+        self.rows: dict[str, int] = {}
+
+    def _observe(self, endpoint: str, phase: str, value: float) -> None:
+        key = (endpoint, phase)
+        if (histogram := self.histograms.get(key)) is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        histogram.observe(value)
+
+    def on_response(self, event: RequestEvent) -> None:
+        for phase in PHASES:
+            if (value := getattr(event, phase)) is not None:
+                self._observe(event.endpoint, phase, value)
+        key = (event.endpoint, event.status_code, event.grpc_status)
+        self.requests[key] = self.requests.get(key, 0) + 1
+        self.response_bytes[event.endpoint] = (
+            self.response_bytes.get(event.endpoint, 0) + event.response_bytes
+        )
+
+    def on_parse(
+        self, event: RequestEvent, accessor: str, seconds: float
+    ) -> None:
+        self._observe(event.endpoint, f"parse_{accessor}", seconds)
+        if accessor == "polars" and event.rows is not None:
+            self.rows[event.endpoint] = (
+                self.rows.get(event.endpoint, 0) + event.rows
+            )
+
+    def to_prometheus(self, prefix: str = "fr24") -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# HELP {prefix}_request_duration_seconds "
+            "Duration of each phase of a request.",
+            f"# TYPE {prefix}_request_duration_seconds histogram",
+        ]
+        name = f"{prefix}_request_duration_seconds"
+        for (endpoint, phase), h in sorted(self.histograms.items()):
+            labels = f'endpoint="{endpoint}",phase="{phase}"'
+            cumulative = 0
+            for bound, n in zip([*h.bounds, math.inf], h.counts):
+                cumulative += n
+                le = "+Inf" if bound == math.inf else repr(float(bound))
+                lines.append(
+                    f'{name}_bucket{{{labels},le="{le}"}} {cumulative}'
+                )
+            lines.append(f"{name}_sum{{{labels}}} {h.sum!r}")
+            lines.append(f"{name}_count{{{labels}}} {h.count}")
+
+        lines += [
+            f"# HELP {prefix}_requests_total Number of responses.",
+            f"# TYPE {prefix}_requests_total counter",
+        ]
+        for (endpoint, status, grpc), n in sorted(
+            self.requests.items(), key=lambda kv: str(kv[0])
+        ):
+            labels = (
+                f'endpoint="{endpoint}",status="{status or ""}",'
+                f'grpc_status="{"" if grpc is None else grpc}"'
+            )
+            lines.append(f"{prefix}_requests_total{{{labels}}} {n}")
+        for metric, values, help_ in (
+            ("response_bytes", self.response_bytes, "Bytes received."),
+            ("rows", self.rows, "Rows decoded into dataframes."),
+        ):
+            lines += [
+                f"# HELP {prefix}_{metric}_total {help_}",
+                f"# TYPE {prefix}_{metric}_total counter",
+            ]
+            lines += [
+                f'{prefix}_{metric}_total{{endpoint="{endpoint}"}} {n}'
+                for endpoint, n in sorted(values.items())
+            ]
+        return "\n".join(lines) + "\n"
+
+
+class PrometheusFileSink(HistogramSink):
+    """A [fr24.instrumentation.HistogramSink][] which periodically writes
+    its metrics to a file in the Prometheus text format, e.g. for the
+    textfile collector of the node exporter.
+
+    The file is replaced atomically, at most once every `interval` seconds
+    as events arrive. Call
+    [flush][fr24.instrumentation.PrometheusFileSink.flush] before exiting to
+    write the final values.
+    """
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        interval: float = 10.0,
+        prefix: str = "fr24",
+        buckets: Iterable[float] = DURATION_BUCKETS,
+    ) -> None:
+        super().__init__(buckets)
+        self.path = Path(path)
+        self.interval = interval
+        self.prefix = prefix
+        self._last_write = -math.inf
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_write >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_write = time.monotonic()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(self.to_prometheus(self.prefix))
+        tmp.replace(self.path)
+
+    def on_response(self, event: RequestEvent) -> None:
+        super().on_response(event)
+        self._maybe_flush()
+
+    def on_parse(
+        self, event: RequestEvent, accessor: str, seconds: float
+    ) -> None:
+        super().on_parse(event, accessor, seconds)
+        self._maybe_flush()
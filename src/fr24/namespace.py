@@ -0,0 +1,207 @@
+"""
+Polars namespaces for decoding fixed-point and packed columns.
+
+Importing this module registers the `fr24` namespace on
+[polars.Expr][], [polars.DataFrame][] and [polars.LazyFrame][]:
+
+```py
+import polars as pl
+import fr24.namespace  # noqa: F401
+
+df = result.to_polars()
+df.with_columns(pl.col("squawk").fr24.squawk())
+df.fr24.expand_position_buffer()
+```
+
+Type checkers do not know about registered namespaces, use
+[fr24.namespace.ns][] for a typed equivalent:
+
+```py
+from fr24.namespace import ns
+
+df.with_columns(ns(pl.col("squawk")).squawk())
+ns(df).expand_position_buffer()
+```
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, overload
+
+from .utils import raise_missing_polars
+
+try:
+    import polars as pl
+except ImportError as exc:
+    raise_missing_polars(exc)
+
+if TYPE_CHECKING:
+    from polars._typing import IntoExpr
+
+POSITION_BUFFER_SCALE = 1e5
+"""`delta_lat` and `delta_lon` of the position buffer are in 1e-5 degrees."""
+
+
+@pl.api.register_expr_namespace("fr24")
+class ExprNamespace:
+    def __init__(self, expr: pl.Expr) -> None:
+        self._expr = expr
+
+    def squawk(self) -> pl.Expr:
+        """Decode a squawk stored as the base-10 value of its octal code
+        (e.g. `3041`) into its four digit string (e.g. `"5741"`).
+
+        Values outside `0` to `4095` (`0o7777`) are not valid codes and decode
+        to null."""
+        # out of range values are nulled by the cast instead of raising
+        x = self._expr.cast(pl.UInt16, strict=False)
+        return (
+            pl.when(x <= 0o7777)
+            .then(
+                pl.concat_str(
+                    [((x // 8**i) % 8).cast(pl.String) for i in (3, 2, 1, 0)]
+                )
+            )
+            .otherwise(None)
+        )
+
+    def _offset(self, field: str) -> pl.Expr:
+        return self._expr.list.eval(pl.element().struct.field(field))
+
+    def buffer_latitude(self, latitude: IntoExpr = "latitude") -> pl.Expr:
+        """Absolute latitudes of a `position_buffer` column, as a list.
+
+        :param latitude: Latitude of the flight the buffer is relative to.
+        """
+        return self._offset("delta_lat").cast(
+            pl.List(pl.Float64)
+        ) / POSITION_BUFFER_SCALE + _into_expr(latitude)
+
+    def buffer_longitude(self, longitude: IntoExpr = "longitude") -> pl.Expr:
+        """Absolute longitudes of a `position_buffer` column, as a list.
+
+        :param longitude: Longitude of the flight the buffer is relative to.
+        """
+        return self._offset("delta_lon").cast(
+            pl.List(pl.Float64)
+        ) / POSITION_BUFFER_SCALE + _into_expr(longitude)
+
+    def buffer_timestamp(self, timestamp: IntoExpr = "timestamp") -> pl.Expr:
+        """Absolute timestamps of a `position_buffer` column, as a list of
+        millisecond UTC datetimes.
+
+        :param timestamp: Timestamp (datetime) of the flight the buffer is
+            relative to.
+        """
+        epoch_ms = _into_expr(timestamp).dt.epoch("ms")
+        return (
+            self._offset("delta_ms").cast(pl.List(pl.Int64)) + epoch_ms
+        ).cast(pl.List(pl.Datetime("ms", time_zone="UTC")))
+
+
+def _into_expr(value: IntoExpr) -> pl.Expr:
+    return pl.col(value) if isinstance(value, str) else pl.lit(value)
+
+
+@pl.api.register_dataframe_namespace("fr24")
+class DataFrameNamespace:
+    def __init__(self, df: pl.DataFrame) -> None:
+        self._df = df
+
+    def expand_position_buffer(
+        self,
+        *,
+        include_current: bool = True,
+        position_buffer: str = "position_buffer",
+        latitude: str = "latitude",
+        longitude: str = "longitude",
+        timestamp: str = "timestamp",
+    ) -> pl.DataFrame:
+        """See [fr24.namespace.LazyFrameNamespace.expand_position_buffer][]."""
+        return (
+            LazyFrameNamespace(self._df.lazy())
+            .expand_position_buffer(
+                include_current=include_current,
+                position_buffer=position_buffer,
+                latitude=latitude,
+                longitude=longitude,
+                timestamp=timestamp,
+            )
+            .collect()
+        )
+
+
+@pl.api.register_lazyframe_namespace("fr24")
+class LazyFrameNamespace:
+    def __init__(self, lf: pl.LazyFrame) -> None:
+        self._lf = lf
+
+    def expand_position_buffer(
+        self,
+        *,
+        include_current: bool = True,
+        position_buffer: str = "position_buffer",
+        latitude: str = "latitude",
+        longitude: str = "longitude",
+        timestamp: str = "timestamp",
+    ) -> pl.LazyFrame:
+        """Explode the position buffer into one row per point, with absolute
+        latitude, longitude and timestamp.
+
+        All other columns are repeated from the parent flight. A `buffered`
+        column is added, `False` for the reported position of the flight and
+        `True` for the points of its buffer. Rows remain grouped by flight,
+        ordered by time.
+
+        For the live feed, use the defaults. For flight details, pass
+        `timestamp="timestamp_ms"`.
+
+        :param include_current: Whether to include the reported position.
+        """
+        lf = self._lf
+        schema = lf.collect_schema()
+        offset = pl.col(position_buffer).struct.field
+        lf = lf.with_row_index("__row")
+        points = (
+            lf.explode(position_buffer)
+            .filter(pl.col(position_buffer).is_not_null())
+            .with_columns(
+                (
+                    pl.col(latitude)
+                    + offset("delta_lat") / POSITION_BUFFER_SCALE
+                ).cast(schema[latitude]),
+                (
+                    pl.col(longitude)
+                    + offset("delta_lon") / POSITION_BUFFER_SCALE
+                ).cast(schema[longitude]),
+                pl.col(timestamp)
+                + pl.duration(milliseconds=offset("delta_ms")),
+                buffered=pl.lit(True),
+            )
+            .drop(position_buffer)
+        )
+        if include_current:
+            current = lf.drop(position_buffer).with_columns(
+                buffered=pl.lit(False)
+            )
+            points = pl.concat([current, points]).sort(
+                "__row", timestamp, maintain_order=True
+            )
+        return points.drop("__row")
+
+
+@overload
+def ns(obj: pl.Expr) -> ExprNamespace: ...
+@overload
+def ns(obj: pl.DataFrame) -> DataFrameNamespace: ...
+@overload
+def ns(obj: pl.LazyFrame) -> LazyFrameNamespace: ...
+def ns(
+    obj: pl.Expr | pl.DataFrame | pl.LazyFrame,
+) -> ExprNamespace | DataFrameNamespace | LazyFrameNamespace:
+    """The `fr24` namespace of `obj`, i.e. `obj.fr24`, but typed."""
+    if isinstance(obj, pl.Expr):
+        return ExprNamespace(obj)
+    if isinstance(obj, pl.DataFrame):
+        return DataFrameNamespace(obj)
+    return LazyFrameNamespace(obj)
@@ -4,14 +4,35 @@ For more information, see: https://github.com/grpc/grpc/blob/master/doc/PROTOCOL
 """
 
 from __future__ import annotations
-from typing import Type, TypeVar
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Generator,
+    Generic,
+    Iterator,
+    Literal,
+    Mapping,
+    NamedTuple,
+    Type,
+    TypeVar,
+)
 import struct
+import zlib
 
 from google.protobuf.message import Message
+from ..tracing import span
 from ..utils import Result, Ok, Err
 from typing import Union, Protocol
 from typing_extensions import runtime_checkable
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+if TYPE_CHECKING:
+    from typing_extensions import TypeAlias
+
 
 T_co = TypeVar("T_co", bound=Message, covariant=True)
 
@@ -34,11 +55,80 @@ def to_proto(message_like: SupportsToProto[T] | T) -> T:
     )
 
 
-def encode_message(msg: Message) -> bytes:
-    """Encode to a length-prefixed message."""
+GrpcEncoding: TypeAlias = Literal["identity", "gzip", "deflate", "zstd"]
+"""Message-level compression, as in the `grpc-encoding` header."""
+
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+GZIP_MAGIC = b"\x1f\x8b"
+
+
+def supported_encodings() -> tuple[GrpcEncoding, ...]:
+    """Encodings that can be decompressed, in order of preference. `zstd` is
+    only available if `zstandard` is installed."""
+    if zstandard is None:  # pragma: no cover
+        return ("gzip", "deflate")
+    return ("zstd", "gzip", "deflate")
+
+
+def compress_message(data: bytes, encoding: GrpcEncoding) -> bytes:
+    """Compress a serialised message with `encoding`."""
+    if encoding == "gzip":
+        return zlib.compress(data, wbits=31)
+    if encoding == "deflate":
+        return zlib.compress(data)
+    if encoding == "zstd":
+        if zstandard is None:  # pragma: no cover
+            raise ValueError("zstd compression requires `zstandard`")
+        return zstandard.ZstdCompressor().compress(data)
+    if encoding == "identity":
+        return data
+    raise ValueError(f"unsupported grpc encoding: `{encoding}`")
+
+
+def decompress_message(
+    data: bytes | memoryview, encoding: str | None = None
+) -> bytes:
+    """Decompress a message with `encoding`, or guess it from its magic
+    bytes (gzip, zstd, otherwise deflate) if `None`."""
+    if encoding is None:
+        if data[:2] == GZIP_MAGIC:
+            encoding = "gzip"
+        elif data[:4] == ZSTD_MAGIC:
+            encoding = "zstd"
+        else:
+            encoding = "deflate"
+    if encoding == "gzip":
+        return zlib.decompress(data, wbits=31)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(data)
+        except zlib.error:  # raw deflate, without the zlib header
+            return zlib.decompress(data, wbits=-15)
+    if encoding == "zstd":
+        if zstandard is None:  # pragma: no cover
+            raise ValueError("zstd decompression requires `zstandard`")
+        # the frame may not declare its content size
+        decompressor = zstandard.ZstdDecompressor().decompressobj()
+        return decompressor.decompress(data)
+    if encoding == "identity":
+        return bytes(data)
+    raise ValueError(f"unsupported grpc encoding: `{encoding}`")
+
+
+def encode_message(
+    msg: Message, compression: GrpcEncoding | None = None
+) -> bytes:
+    """Encode to a length-prefixed message.
+
+    :param compression: Compress the message, the request must then declare
+        it in the `grpc-encoding` header.
+    """
     msg_bytes = msg.SerializeToString()
+    compressed = compression is not None and compression != "identity"
+    if compressed:
+        msg_bytes = compress_message(msg_bytes, compression)
     return (
-        b"\x00"  # u8, no compression
+        (b"\x01" if compressed else b"\x00")  # u8, compressed flag
         + struct.pack(
             ">I", len(msg_bytes)
         )  # u64, length of message, big endian
@@ -46,13 +136,23 @@ def encode_message(msg: Message) -> bytes:
     )
 
 
-def parse_data(data: bytes, msg_type: Type[T]) -> Result[T, ProtoError]:
-    """Decode a DATA frame (optionally, with Trailers) into a protobuf message."""
+def _payload_view(
+    data: bytes, encoding: str | None
+) -> Result[bytes | memoryview, ProtoError]:
     if not data:
         return Err(GrpcError("empty DATA frame", data))
     compressed_flag = data[0]  # 1 byte unsigned int
     if compressed_flag == 1:
-        return Err(GrpcError("message is compressed, not implemented", data))
+        data_len = int.from_bytes(data[1:5], byteorder="big")
+        try:
+            payload = decompress_message(
+                memoryview(data)[5 : 5 + data_len], encoding
+            )
+        except Exception as e:
+            return Err(GrpcError(f"failed to decompress message: {e}", data))
+        if not payload:
+            return Err(GrpcError("empty message payload", data))
+        return Ok(payload)
     if compressed_flag != 0:
         try:  # parse trailers
             return Err(GrpcError.from_trailers(data))
@@ -65,11 +165,255 @@ def parse_data(data: bytes, msg_type: Type[T]) -> Result[T, ProtoError]:
     data_len = int.from_bytes(data[1:5], byteorder="big")  # message length
     if not data_len:
         return Err(GrpcError("empty message payload", data))
-    message = data[5 : 5 + data_len]  # message (in protobuf, binary octet)
-    try:
-        return Ok(msg_type.FromString(message))
-    except Exception as e:
-        return Err(ProtoParseError(f"failed to parse message: {e}", data))
+    # message (in protobuf, binary octet), as a view to avoid copying it
+    return Ok(memoryview(data)[5 : 5 + data_len])
+
+
+def parse_payload(
+    data: bytes, *, encoding: str | None = None
+) -> Result[bytes, ProtoError]:
+    """Extract the serialised protobuf message from a DATA frame (optionally,
+    with Trailers), without parsing it.
+
+    :param encoding: The `grpc-encoding` of the response, used if the message
+        is compressed. If `None`, it is guessed from the message.
+    """
+    payload = _payload_view(data, encoding)
+    if payload.is_err():
+        return payload  # type: ignore[return-value]
+    return Ok(bytes(payload.unwrap()))
+
+
+def parse_data(
+    data: bytes, msg_type: Type[T], *, encoding: str | None = None
+) -> Result[T, ProtoError]:
+    """Decode the first DATA frame (optionally, with Trailers) into a protobuf
+    message. See [fr24.proto.parse_messages][] to decode all frames.
+
+    :param encoding: See [fr24.proto.parse_payload][].
+    """
+    with span("parse_data", message=msg_type.__name__):
+        payload = _payload_view(data, encoding)
+        if payload.is_err():
+            return payload  # type: ignore[return-value]
+        try:
+            return Ok(msg_type.FromString(payload.unwrap()))
+        except Exception as e:
+            return Err(ProtoParseError(f"failed to parse message: {e}", data))
+
+
+class GrpcFrame(NamedTuple):
+    """A length-prefixed gRPC-web frame."""
+
+    flags: int
+    data: memoryview
+    """The frame, without its 5 byte prefix, as a view into the body."""
+
+    @property
+    def compressed(self) -> bool:
+        return bool(self.flags & 0x01)
+
+    @property
+    def is_trailers(self) -> bool:
+        return bool(self.flags & 0x80)
+
+
+def iter_frames(data: bytes | bytearray | memoryview) -> Iterator[GrpcFrame]:
+    """Split a gRPC-web body into all of its frames, without copying them.
+
+    :raises ProtoParseError: If the body ends within a frame.
+    """
+    view = memoryview(data)
+    pos, end = 0, len(view)
+    while pos < end:
+        if end - pos < 5:
+            raise ProtoParseError("truncated frame prefix", bytes(view[pos:]))
+        flags = view[pos]
+        start = pos + 5
+        pos = start + int.from_bytes(view[pos + 1 : start], byteorder="big")
+        if pos > end:
+            raise ProtoParseError(
+                f"truncated frame: expected {pos - start} bytes, "
+                f"got {end - start}",
+                bytes(view[start - 5 :]),
+            )
+        yield GrpcFrame(flags, view[start:pos])
+
+
+class GrpcStatus(NamedTuple):
+    """The status of a call, from its trailers."""
+
+    status: int | None
+    """1*DIGIT ; 0-9"""
+    message: bytes | None
+    """Percent-Encoded"""
+    details: bytes | None
+    """`google.rpc.Status` proto message"""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == 0
+
+    @classmethod
+    def from_trailers(cls, trailers: bytes | memoryview) -> GrpcStatus:
+        """:param trailers: The trailers frame, without its prefix."""
+        status = None
+        message = None
+        details = None
+        for line in bytes(trailers).strip().splitlines():
+            if line.startswith(b"grpc-status:"):
+                try:
+                    status = int(line[12:])
+                except ValueError:
+                    pass
+            elif line.startswith(b"grpc-message:"):
+                message = line[13:]
+            elif line.startswith(b"grpc-status-details-bin:"):
+                details = line[24:]
+        return cls(status, message, details)
+
+
+def iter_messages(
+    data: bytes | bytearray | memoryview,
+    msg_type: Type[T],
+    *,
+    encoding: str | None = None,
+) -> Generator[T, None, GrpcStatus | None]:
+    """Decode every message of a gRPC-web body, straight from views into
+    `data`. The generator returns the status from the trailers frame, if
+    any.
+
+    :raises ProtoParseError: If a frame is truncated.
+    :raises Exception: If a message cannot be decompressed or decoded.
+    """
+    status = None
+    for frame in iter_frames(data):
+        if frame.is_trailers:
+            status = GrpcStatus.from_trailers(frame.data)
+            continue
+        payload = (
+            decompress_message(frame.data, encoding)
+            if frame.compressed
+            else frame.data
+        )
+        yield msg_type.FromString(payload)
+    return status
+
+
+class GrpcFrameDecoder:
+    """Reassembles the length-prefixed frames of a streamed gRPC-web body,
+    which the network splits and coalesces into arbitrary chunks.
+
+    ```py
+    decoder = GrpcFrameDecoder()
+    async for chunk in response.aiter_bytes():
+        for frame in decoder.feed(chunk):
+            parse_data(frame, FollowFlightResponse)
+    decoder.close()
+    ```
+
+    Each chunk is appended to the buffer once and each complete frame is
+    copied out of it once, so the cost per frame does not grow with the
+    number of chunks it arrived in.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self.trailers: bytes | None = None
+        """The trailers frame, without its prefix, once received."""
+        self.status: GrpcStatus | None = None
+        """The final status, from the trailers (or the HTTP headers, see
+        [fr24.proto.GrpcFrameDecoder.close][])."""
+
+    @property
+    def pending(self) -> int:
+        """Number of buffered bytes of the incomplete frame."""
+        return len(self._buf)
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Buffer `chunk` and return every DATA frame it completes, with its
+        5 byte prefix (i.e. as accepted by [fr24.proto.parse_data][]).
+        The trailers frame is not returned, see `trailers` and `status`."""
+        frames: list[bytes] = []
+        buf = self._buf
+        buf += chunk
+        pos, end = 0, len(buf)
+        # slicing a bytearray copies, slicing a view of it does not. The view
+        # must be released before the bytearray can be resized.
+        with memoryview(buf) as view:
+            while end - pos >= 5:
+                length = int.from_bytes(view[pos + 1 : pos + 5], "big")
+                frame_end = pos + 5 + length
+                if frame_end > end:
+                    break
+                if view[pos] & 0x80:
+                    self.trailers = bytes(view[pos + 5 : frame_end])
+                    self.status = GrpcStatus.from_trailers(self.trailers)
+                else:
+                    frames.append(bytes(view[pos:frame_end]))
+                pos = frame_end
+        # dropping a prefix of a bytearray only moves its start: the
+        # incomplete frame left over is not copied
+        del buf[:pos]
+        return frames
+
+    def close(self, headers: Mapping[str, str] | None = None) -> None:
+        """Check that the body ended on a frame boundary.
+
+        :param headers: The HTTP headers of the response, to read the status
+            from if the body had no trailers (i.e. a "trailers-only"
+            response).
+        :raises ProtoParseError: If the body ended within a frame.
+        """
+        if self._buf:
+            raise ProtoParseError(
+                f"stream ended within a frame ({len(self._buf)} bytes)",
+                bytes(self._buf),
+            )
+        if (
+            self.status is None
+            and headers is not None
+            and (status := headers.get("grpc-status")) is not None
+        ):
+            message = headers.get("grpc-message")
+            self.status = GrpcStatus(
+                int(status) if status.isdigit() else None,
+                None if message is None else message.encode(),
+                None,
+            )
+
+
+@dataclass
+class GrpcMessages(Generic[T]):
+    messages: list[T]
+    status: GrpcStatus | None
+    """From the trailers frame. `None` if the body has none, e.g. because the
+    status was sent in the HTTP headers."""
+
+
+def parse_messages(
+    data: bytes | bytearray | memoryview,
+    msg_type: Type[T],
+    *,
+    encoding: str | None = None,
+) -> Result[GrpcMessages[T], ProtoError]:
+    """Decode all frames of a gRPC-web body, see
+    [fr24.proto.iter_messages][]. Unlike [fr24.proto.parse_data][], a
+    non-zero status in the trailers is not an error: check `status`."""
+    with span("parse_messages", message=msg_type.__name__):
+        messages: list[T] = []
+        it = iter_messages(data, msg_type, encoding=encoding)
+        try:
+            while True:
+                messages.append(next(it))
+        except StopIteration as stop:
+            return Ok(GrpcMessages(messages, stop.value))
+        except ProtoParseError as e:
+            return Err(e)
+        except Exception as e:
+            return Err(
+                ProtoParseError(f"failed to parse message: {e}", bytes(data))
+            )
 
 
 class GrpcError(Exception):
@@ -100,30 +444,13 @@ class GrpcError(Exception):
     @classmethod
     def from_trailers(cls, data: bytes) -> GrpcError:
         trailers = data[5:]  # skip prefix
-
-        lines = trailers.strip().splitlines()
-
-        status = None
-        status_message = None
-        status_details = None
-
-        for line in lines:
-            if line.startswith(b"grpc-status:"):
-                try:
-                    status = int(line[12:])
-                except ValueError:
-                    pass
-            elif line.startswith(b"grpc-message:"):
-                status_message = line[13:]
-            elif line.startswith(b"grpc-status-details-bin:"):
-                status_details = line[24:]
-
+        status = GrpcStatus.from_trailers(trailers)
         return cls(
             "gRPC errored",
             trailers,
-            status=status,
-            status_message=status_message,
-            status_details=status_details,
+            status=status.status,
+            status_message=status.message,
+            status_details=status.details,
         )
 
 
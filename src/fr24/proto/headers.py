@@ -3,9 +3,11 @@ from __future__ import annotations
 import secrets
 import time
 from functools import lru_cache
+from typing import Sequence
 from ..utils import DEFAULT_HEADERS
 
 from ..types.json import Authentication
+from . import GrpcEncoding
 
 PLATFORM_VERSION = "25.061.0929"
 # see ./README.md.
@@ -58,11 +60,26 @@ def get_device_id() -> str:
     # we cache across requests to mimic that behaviour
     return generate_device_id(now_ms=int(time.time() * 1000))
 
-def get_grpc_headers(*, auth: Authentication | None, device_id: None | str = None) -> dict[str, str]:
+def get_grpc_headers(
+    *,
+    auth: Authentication | None,
+    device_id: None | str = None,
+    accept_encoding: Sequence[GrpcEncoding] | None = None,
+) -> dict[str, str]:
+    """
+    :param accept_encoding: Message compressions to advertise in
+        `grpc-accept-encoding`, e.g. [fr24.proto.supported_encodings][]. By
+        default none is advertised and the server sends uncompressed
+        messages.
+    """
     headers = DEFAULT_HEADERS_GRPC.copy()
     if device_id is None:
         device_id = get_device_id()
     headers["fr24-device-id"] = device_id
+    if accept_encoding:
+        headers["grpc-accept-encoding"] = ",".join(
+            [*accept_encoding, "identity"]
+        )
     if auth is not None and (token := auth["userData"].get("accessToken")) is not None:
         headers["authorization"] = f"Bearer {token}"
     return headers
@@ -0,0 +1,423 @@
+"""
+A minimal scanner for the protobuf wire format of `LiveFeedResponse`.
+
+It walks the serialised bytes and extracts the fields of the
+[live feed schema][fr24.types.cache.live_feed_schema] into typed arrays,
+skipping everything else without materialising any `Flight` messages.
+See: https://protobuf.dev/programming-guides/encoding/
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import Any, Collection, Sequence
+
+from . import ProtoParseError
+
+_WIRE_VARINT = 0
+_WIRE_I64 = 1
+_WIRE_LEN = 2
+_WIRE_I32 = 5
+
+_UNPACK_F32 = struct.Struct("<f").unpack_from
+
+EXTRA_INFO_FIELD_NUMBERS = {
+    "reg": 2,
+    "route": 3,
+    "type": 4,
+    "squawk": 5,
+    "vspeed": 6,
+}
+"""Field numbers in `ExtraFlightInfo` by their `LiveFeedRequest.field_mask`
+path. Only those included in the live feed schema are listed."""
+
+
+class WireFormatError(ProtoParseError):
+    """The bytes contain a wire type the scanner does not handle."""
+
+
+def _read_varint(buf: bytes, pos: int) -> tuple[int, int]:
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    result = b & 0x7F
+    shift = 7
+    pos += 1
+    while True:
+        b = buf[pos]
+        result |= (b & 0x7F) << shift
+        pos += 1
+        if b < 0x80:
+            return result, pos
+        shift += 7
+        if shift >= 70:
+            raise WireFormatError("varint too long")
+
+
+def _to_int32(value: int) -> int:
+    # negative int32 values are sign extended to 64 bits on the wire
+    if value >= 1 << 63:
+        return value - (1 << 64)
+    return value
+
+
+def _skip(buf: bytes, pos: int, wire_type: int) -> int:
+    if wire_type == _WIRE_VARINT:
+        return _read_varint(buf, pos)[1]
+    if wire_type == _WIRE_LEN:
+        length, pos = _read_varint(buf, pos)
+        return pos + length
+    if wire_type == _WIRE_I32:
+        return pos + 4
+    if wire_type == _WIRE_I64:
+        return pos + 8
+    raise WireFormatError(f"unsupported wire type {wire_type}")
+
+
+class _FlightColumns:
+    __slots__ = (
+        "altitude",
+        "callsign",
+        "destination",
+        "eta",
+        "flightid",
+        "ground_speed",
+        "latitude",
+        "longitude",
+        "on_ground",
+        "origin",
+        "pb_delta_lat",
+        "pb_delta_lon",
+        "pb_delta_ms",
+        "pb_lengths",
+        "registration",
+        "source",
+        "squawk",
+        "timestamp",
+        "track",
+        "typecode",
+        "vertical_speed",
+    )
+
+    def __init__(self) -> None:
+        self.timestamp = array("q")
+        self.flightid = array("q")
+        self.latitude = array("f")
+        self.longitude = array("f")
+        self.track = array("q")
+        self.altitude = array("q")
+        self.ground_speed = array("q")
+        self.on_ground: list[bool] = []
+        self.callsign: list[str] = []
+        self.source = array("q")
+        self.registration: list[str] = []
+        self.origin: list[str] = []
+        self.destination: list[str] = []
+        self.typecode: list[str] = []
+        self.eta = array("q")
+        self.squawk = array("q")
+        self.vertical_speed = array("q")
+        self.pb_lengths = array("q")
+        self.pb_delta_lat = array("q")
+        self.pb_delta_lon = array("q")
+        self.pb_delta_ms = array("q")
+
+
+# NOTE: the scanners below inline the single byte case of a varint (all keys
+# in these messages and most values) as function calls dominate the runtime.
+
+
+def _scan_route(buf: bytes, pos: int, end: int) -> tuple[str, str]:
+    origin = destination = ""
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == _WIRE_LEN and (number == 1 or number == 2):
+            length, pos = _read_varint(buf, pos)
+            value = buf[pos : pos + length].decode()
+            pos += length
+            if number == 1:
+                origin = value
+            else:
+                destination = value
+        else:
+            pos = _skip(buf, pos, wire_type)
+    return origin, destination
+
+
+def _scan_schedule_eta(buf: bytes, pos: int, end: int) -> int:
+    eta = 0
+    while pos < end:
+        key, pos = _read_varint(buf, pos)
+        number, wire_type = key >> 3, key & 7
+        if number == 5 and wire_type == _WIRE_VARINT:
+            value, pos = _read_varint(buf, pos)
+            eta = _to_int32(value)
+        else:
+            pos = _skip(buf, pos, wire_type)
+    return eta
+
+
+def _scan_extra_info(
+    buf: bytes,
+    pos: int,
+    end: int,
+    out: _FlightColumns,
+    wanted: frozenset[int],
+) -> None:
+    reg = origin = destination = typecode = ""
+    eta = squawk = vspeed = 0
+    while pos < end:
+        key = buf[pos]
+        pos += 1
+        if key >= 0x80:
+            key, pos = _read_varint(buf, pos - 1)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == _WIRE_LEN and (
+            number == 9 or (number in wanted and number <= 4)
+        ):
+            length, pos = _read_varint(buf, pos)
+            stop = pos + length
+            if number == 2:
+                reg = buf[pos:stop].decode()
+            elif number == 3:
+                origin, destination = _scan_route(buf, pos, stop)
+            elif number == 4:
+                typecode = buf[pos:stop].decode()
+            else:  # 9: schedule
+                eta = _scan_schedule_eta(buf, pos, stop)
+            pos = stop
+        elif wire_type == _WIRE_VARINT and number in wanted:
+            value, pos = _read_varint(buf, pos)
+            if number == 5:
+                squawk = _to_int32(value)
+            elif number == 6:
+                vspeed = _to_int32(value)
+        else:
+            pos = _skip(buf, pos, wire_type)
+    out.registration[-1] = reg
+    out.origin[-1] = origin
+    out.destination[-1] = destination
+    out.typecode[-1] = typecode
+    out.eta[-1] = eta
+    out.squawk[-1] = squawk
+    out.vertical_speed[-1] = vspeed
+
+
+def _scan_position_buffer(
+    buf: bytes, pos: int, end: int, out: _FlightColumns
+) -> None:
+    count = 0
+    delta_lats = out.pb_delta_lat
+    delta_lons = out.pb_delta_lon
+    delta_mss = out.pb_delta_ms
+    while pos < end:
+        key = buf[pos]
+        pos += 1
+        if key >= 0x80:
+            key, pos = _read_varint(buf, pos - 1)
+        wire_type = key & 7
+        if key >> 3 != 1 or wire_type != _WIRE_LEN:
+            pos = _skip(buf, pos, wire_type)
+            continue
+        stop = buf[pos]
+        pos += 1
+        if stop >= 0x80:
+            stop, pos = _read_varint(buf, pos - 1)
+        stop += pos
+        delta_lat = delta_lon = delta_ms = 0
+        while pos < stop:
+            key = buf[pos]
+            pos += 1
+            if key >= 0x80:
+                key, pos = _read_varint(buf, pos - 1)
+            if key & 7 != _WIRE_VARINT:
+                pos = _skip(buf, pos, key & 7)
+                continue
+            value = buf[pos]
+            pos += 1
+            if value >= 0x80:
+                value, pos = _read_varint(buf, pos - 1)
+            if key == 0x08:  # 1: delta_lat
+                delta_lat = _to_int32(value)
+            elif key == 0x10:  # 2: delta_lon
+                delta_lon = _to_int32(value)
+            elif key == 0x18:  # 3: delta_ms
+                delta_ms = value
+        delta_lats.append(delta_lat)
+        delta_lons.append(delta_lon)
+        delta_mss.append(delta_ms)
+        count += 1
+    out.pb_lengths[-1] = count
+
+
+def _scan_flight(
+    buf: bytes,
+    pos: int,
+    end: int,
+    out: _FlightColumns,
+    wanted: frozenset[int],
+) -> None:
+    timestamp_ms = flightid = track = alt = speed = source = 0
+    lat = lon = 0.0
+    on_ground = False
+    callsign = ""
+    # placeholders, overwritten by the nested scanners when present
+    for column in (out.registration, out.origin, out.destination):
+        column.append("")
+    out.typecode.append("")
+    out.eta.append(0)
+    out.squawk.append(0)
+    out.vertical_speed.append(0)
+    out.pb_lengths.append(0)
+    while pos < end:
+        key = buf[pos]
+        pos += 1
+        if key >= 0x80:
+            key, pos = _read_varint(buf, pos - 1)
+        number, wire_type = key >> 3, key & 7
+        if wire_type == _WIRE_VARINT:
+            value = buf[pos]
+            pos += 1
+            if value >= 0x80:
+                value, pos = _read_varint(buf, pos - 1)
+            if number == 1:
+                flightid = _to_int32(value)
+            elif number == 4:
+                track = _to_int32(value)
+            elif number == 5:
+                alt = _to_int32(value)
+            elif number == 6:
+                speed = _to_int32(value)
+            elif number == 10:
+                on_ground = value != 0
+            elif number == 12:
+                source = _to_int32(value)
+            elif number == 15:
+                timestamp_ms = value
+        elif wire_type == _WIRE_I32:
+            if number == 2:
+                lat = _UNPACK_F32(buf, pos)[0]
+            elif number == 3:
+                lon = _UNPACK_F32(buf, pos)[0]
+            pos += 4
+        elif wire_type == _WIRE_LEN:
+            length, pos = _read_varint(buf, pos)
+            stop = pos + length
+            if number == 11:
+                callsign = buf[pos:stop].decode()
+            elif number == 13:
+                _scan_extra_info(buf, pos, stop, out, wanted)
+            elif number == 14:
+                _scan_position_buffer(buf, pos, stop, out)
+            pos = stop
+        else:
+            pos = _skip(buf, pos, wire_type)
+    if pos != end:
+        raise WireFormatError("truncated `Flight` message")
+    out.timestamp.append(timestamp_ms)
+    out.flightid.append(flightid)
+    out.latitude.append(lat)
+    out.longitude.append(lon)
+    out.track.append(track)
+    out.altitude.append(alt)
+    out.ground_speed.append(speed)
+    out.on_ground.append(on_ground)
+    out.callsign.append(callsign)
+    out.source.append(source)
+
+
+def scan_live_feed_response(
+    message: bytes,
+    fields: Collection[str] | None = None,
+) -> tuple[dict[str, Sequence[Any]], tuple[Sequence[int], ...]]:
+    """Scan a serialised `LiveFeedResponse` into columns.
+
+    :param message: The serialised protobuf message, without the gRPC
+        length prefix.
+    :param fields: The `field_mask` paths of the request. `ExtraFlightInfo`
+        fields not listed are skipped and take their default values.
+        If `None`, all fields of the live feed schema are extracted.
+    :returns: The scalar columns, and the flattened position buffer as
+        `(lengths, delta_lat, delta_lon, delta_ms)`.
+    :raises WireFormatError: If an unsupported wire type is encountered or
+        the message is truncated.
+    """
+    wanted = frozenset(
+        EXTRA_INFO_FIELD_NUMBERS.values()
+        if fields is None
+        else (
+            EXTRA_INFO_FIELD_NUMBERS[f]
+            for f in fields
+            if f in EXTRA_INFO_FIELD_NUMBERS
+        )
+    )
+    out = _FlightColumns()
+    buf = bytes(message)
+    pos, end = 0, len(buf)
+    try:
+        while pos < end:
+            key, pos = _read_varint(buf, pos)
+            wire_type = key & 7
+            if key >> 3 == 1 and wire_type == _WIRE_LEN:  # flights_list
+                length, pos = _read_varint(buf, pos)
+                stop = pos + length
+                _scan_flight(buf, pos, stop, out, wanted)
+                pos = stop
+            else:
+                pos = _skip(buf, pos, wire_type)
+    except (IndexError, UnicodeDecodeError, struct.error) as e:
+        raise WireFormatError(f"malformed message: {e}") from e
+    if pos != end:
+        raise WireFormatError("truncated `LiveFeedResponse` message")
+    columns: dict[str, Sequence[Any]] = {
+        "timestamp": out.timestamp,
+        "flightid": out.flightid,
+        "latitude": out.latitude,
+        "longitude": out.longitude,
+        "track": out.track,
+        "altitude": out.altitude,
+        "ground_speed": out.ground_speed,
+        "on_ground": out.on_ground,
+        "callsign": out.callsign,
+        "source": out.source,
+        "registration": out.registration,
+        "origin": out.origin,
+        "destination": out.destination,
+        "typecode": out.typecode,
+        "eta": out.eta,
+        "squawk": out.squawk,
+        "vertical_speed": out.vertical_speed,
+    }
+    position_buffer = (
+        out.pb_lengths,
+        out.pb_delta_lat,
+        out.pb_delta_lon,
+        out.pb_delta_ms,
+    )
+    return columns, position_buffer
+
+
+def unwrap_length_delimited(message: bytes, field_number: int) -> bytes:
+    """Return the payload of a length-delimited field in a message.
+
+    Used to reach the nested `LiveFeedResponse` of a `PlaybackResponse`
+    without parsing it. Returns empty bytes if the field is absent.
+    """
+    buf = bytes(message)
+    pos, end = 0, len(buf)
+    payload = b""
+    try:
+        while pos < end:
+            key, pos = _read_varint(buf, pos)
+            wire_type = key & 7
+            if key >> 3 == field_number and wire_type == _WIRE_LEN:
+                length, pos = _read_varint(buf, pos)
+                payload = buf[pos : pos + length]
+                pos += length
+            else:
+                pos = _skip(buf, pos, wire_type)
+    except IndexError as e:
+        raise WireFormatError(f"malformed message: {e}") from e
+    return payload
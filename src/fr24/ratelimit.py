@@ -0,0 +1,210 @@
+"""
+Client-side rate limiting and adaptive concurrency control.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from typing import Collection, Mapping
+
+    from typing_extensions import TypeAlias
+
+
+class TokenBucket:
+    """An asynchronous token bucket.
+
+    Tokens are replenished continuously at `rate` per second, up to
+    `capacity`. Waiters are served in arrival order.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None) -> None:
+        """
+        :param rate: Tokens added per second.
+        :param capacity: Maximum burst size, defaults to `max(rate, 1)`.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(rate, 1.0) if capacity is None else capacity
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._last) * self.rate
+        )
+        self._last = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        """Wait until `tokens` are available and consume them."""
+        async with self._lock:
+            self._refill()
+            while self._tokens < tokens:
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def penalise(self, seconds: float) -> None:
+        """Drain the bucket so that no token is available for `seconds`."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+Outcome: TypeAlias = Literal["ok", "throttled", "error"]
+"""How a request ended, as seen by a [fr24.ratelimit.AIMDLimiter][]."""
+
+
+class AIMDLimiter:
+    """An additive increase, multiplicative decrease concurrency limit.
+
+    Every healthy response raises the limit by `increase / limit` (i.e. by
+    about `increase` per round of requests), every throttled response
+    multiplies it by `decrease`. Consecutive throttled responses within
+    `cooldown` seconds only count once, as they likely stem from the same
+    burst.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        *,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+    ) -> None:
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.throttled = 0
+        """Number of decreases so far."""
+        self._last_decrease = -float("inf")
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    async def acquire(self) -> None:
+        """Wait until fewer than `limit` requests are in flight."""
+        while self.in_flight >= int(self.limit):
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # woken by `release` but cancelled before resuming: hand
+                    # the slot on, or it would be lost
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self.in_flight += 1
+
+    def release(self, outcome: Outcome) -> None:
+        """Mark a request as completed and adjust the limit."""
+        self.in_flight -= 1
+        if outcome == "ok":
+            self.limit = min(
+                self.maximum, self.limit + self.increase / self.limit
+            )
+        elif outcome == "throttled":
+            now = time.monotonic()
+            if now - self._last_decrease >= self.cooldown:
+                self._last_decrease = now
+                self.limit = max(self.minimum, self.limit * self.decrease)
+                self.throttled += 1
+        self._wake()
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if waiter.done():  # cancelled, does not take a slot
+                continue
+            waiter.set_result(None)
+            free -= 1
+
+
+@dataclass
+class EndpointControl:
+    """Rate and concurrency control of a single endpoint."""
+
+    bucket: TokenBucket | None
+    limiter: AIMDLimiter | None
+
+    async def acquire(self) -> None:
+        if self.bucket is not None:
+            await self.bucket.acquire()
+        if self.limiter is not None:
+            await self.limiter.acquire()
+
+    def release(self, outcome: Outcome, retry_after: float | None) -> None:
+        if outcome == "throttled" and self.bucket is not None:
+            self.bucket.penalise(1.0 if retry_after is None else retry_after)
+        if self.limiter is not None:
+            self.limiter.release(outcome)
+
+
+class RateController:
+    """Per-endpoint token buckets and AIMD concurrency limits, shared by all
+    services of a client, see [fr24.transport.RateControlTransport][].
+
+    Endpoints are identified by the last segment of the URL path, e.g.
+    `LiveFeed` for gRPC or `list.json` for JSON.
+    """
+
+    def __init__(
+        self,
+        *,
+        rate: float | None = 10.0,
+        rates: Mapping[str, float | None] | None = None,
+        concurrency: int = 8,
+        max_concurrency: int = 64,
+        unlimited_concurrency: Collection[str] = ("FollowFlight",),
+    ) -> None:
+        """
+        :param rate: Default maximum requests per second of each endpoint,
+            `None` for no limit.
+        :param rates: Overrides of `rate` for specific endpoints.
+        :param concurrency: Initial concurrency limit of each endpoint.
+        :param max_concurrency: Concurrency limit will not increase beyond
+            this.
+        :param unlimited_concurrency: Endpoints exempt from the concurrency
+            limit, e.g. long-lived streams which would hold on to a slot.
+        """
+        self.rate = rate
+        self.rates = dict(rates or {})
+        self.concurrency = concurrency
+        self.max_concurrency = max_concurrency
+        self.unlimited_concurrency = set(unlimited_concurrency)
+        self.endpoints: dict[str, EndpointControl] = {}
+
+    def endpoint(self, name: str) -> EndpointControl:
+        if (control := self.endpoints.get(name)) is None:
+            rate = self.rates.get(name, self.rate)
+            control = self.endpoints[name] = EndpointControl(
+                bucket=None if rate is None else TokenBucket(rate),
+                limiter=(
+                    None
+                    if name in self.unlimited_concurrency
+                    else AIMDLimiter(
+                        min(self.concurrency, self.max_concurrency),
+                        maximum=self.max_concurrency,
+                    )
+                ),
+            )
+        return control
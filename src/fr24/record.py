@@ -0,0 +1,161 @@
+"""
+Long-running recorders, polling an endpoint at a fixed cadence.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+from .delta import DeltaEncoder
+from .grpc import BoundingBox
+
+if TYPE_CHECKING:
+    from typing import AsyncIterator, Iterator
+
+    from . import FR24
+    from .cache import FR24Cache
+    from .service import IntoWorldLngs, LiveFeedResult, LiveFeedWorldResult
+    from .types.cache import TabularFileFmt
+    from .types.grpc import LiveFeedField
+
+logger = logging.getLogger(__name__)
+
+
+async def ticks(
+    interval: float, stop: asyncio.Event | None = None
+) -> AsyncIterator[int]:
+    """Yield the index of each tick of a fixed cadence, until `stop` is set.
+
+    Ticks are scheduled at `start + n * interval` on the monotonic clock, so
+    the schedule does not drift with the time spent by the consumer. If the
+    consumer overruns one or more ticks, they are skipped instead of firing
+    back to back.
+    """
+    start = time.monotonic()
+    n = 0
+    while stop is None or not stop.is_set():
+        yield n
+        elapsed = time.monotonic() - start
+        next_n = max(n + 1, int(elapsed // interval) + 1)
+        if next_n > n + 1:
+            logger.warning(f"overran by {next_n - n - 1} tick(s), skipping")
+        n = next_n
+        delay = start + n * interval - time.monotonic()
+        if stop is None:
+            await asyncio.sleep(delay)
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+@contextmanager
+def stop_on_signals() -> Iterator[asyncio.Event]:
+    """Return an event which is set on `SIGINT` or `SIGTERM`, restoring the
+    previous handlers on exit. Must be called within a running event loop."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    signums = (signal.SIGINT, signal.SIGTERM)
+
+    def on_signal(signum: int) -> None:
+        logger.info(f"received {signal.Signals(signum).name}, stopping")
+        stop.set()
+
+    try:
+        for signum in signums:
+            loop.add_signal_handler(signum, on_signal, signum)
+    except NotImplementedError:  # windows
+        previous = {
+            signum: signal.signal(
+                signum,
+                lambda signum, _: loop.call_soon_threadsafe(on_signal, signum),
+            )
+            for signum in signums
+        }
+        try:
+            yield stop
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+        return
+    try:
+        yield stop
+    finally:
+        for signum in signums:
+            loop.remove_signal_handler(signum)
+
+
+async def record_live_feed(
+    fr24: FR24,
+    cache: FR24Cache,
+    area: BoundingBox | IntoWorldLngs,
+    *,
+    interval: float = 10,
+    count: int | None = None,
+    stop: asyncio.Event | None = None,
+    max_concurrency: int = 8,
+    limit: int = 1500,
+    fields: set[LiveFeedField] | None = None,
+    format: TabularFileFmt = "parquet",
+    keyframe_interval: int | None = None,
+) -> int:
+    """Poll the live feed at a fixed cadence, writing every snapshot to
+    [fr24.cache.FR24Cache.live_feed][].
+
+    All requests share the HTTP client (and login) of `fr24`. A failed
+    snapshot is logged and skipped.
+
+    :param area: A bounding box, or longitude knots to sweep the entire
+        world with, see [fr24.service.LiveFeedService.fetch_world][].
+    :param interval: Cadence, seconds.
+    :param count: Stop after this many ticks. If `None`, runs until `stop`
+        is set.
+    :param stop: Event to stop at the next tick.
+    :param keyframe_interval: If set, store snapshots as keyframes and deltas
+        in [fr24.cache.FR24Cache.live_feed_delta][] instead, with a keyframe
+        every this many snapshots, see [fr24.delta][].
+    :returns: Number of snapshots written.
+    """
+    fields_: set[LiveFeedField] = (
+        {"flight", "reg", "route", "type"} if fields is None else fields
+    )
+    encoder = (
+        DeltaEncoder(keyframe_interval=keyframe_interval)
+        if keyframe_interval is not None
+        else None
+    )
+    written = attempts = 0
+    async for _ in ticks(interval, stop):
+        attempts += 1
+        result: LiveFeedResult | LiveFeedWorldResult
+        try:
+            if isinstance(area, BoundingBox):
+                result = await fr24.live_feed.fetch(
+                    area, limit=limit, fields=fields_
+                )
+            else:
+                result = await fr24.live_feed.fetch_world(
+                    area,
+                    max_concurrency=max_concurrency,
+                    limit=limit,
+                    fields=fields_,
+                )
+            if encoder is None:
+                result.write_table(cache, format=format)
+            else:
+                encoder.encode(
+                    result.to_polars(), result.timestamp
+                ).write_table(cache, format=format)
+        except Exception as e:
+            logger.error(f"failed to record snapshot: {e!r}")
+        else:
+            written += 1
+        if count is not None and attempts >= count:
+            break
+    return written
@@ -2,15 +2,22 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
 import sys
+import time
 from dataclasses import dataclass, field
+from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
     AsyncGenerator,
     AsyncIterator,
+    Callable,
     Generic,
+    Iterable,
     Literal,
+    Mapping,
+    NamedTuple,
     Protocol,
     Sequence,
     TypeVar,
@@ -18,6 +25,7 @@ from typing import (
     runtime_checkable,
 )
 
+import httpx
 from google.protobuf.json_format import MessageToDict
 
 if sys.version_info >= (3, 13):
@@ -36,16 +44,18 @@ from .grpc import (
     LiveFlightsStatusParams,
     NearestFlightsParams,
     PlaybackFlightParams,
+    PreparedCallCache,
     TopFlightsParams,
     flight_details,
     flight_details_df,
     follow_flight_stream,
-    live_feed,
     live_feed_df,
-    live_feed_playback,
+    live_feed_merge_df,
     live_feed_playback_df,
+    live_feed_wire_df,
     live_flights_status,
     live_flights_status_df,
+    live_flights_status_merge_df,
     nearest_flights,
     nearest_flights_df,
     playback_flight,
@@ -53,6 +63,7 @@ from .grpc import (
     top_flights,
     top_flights_df,
 )
+from .instrumentation import request_event
 from .json import (
     AirportListParams,
     FindParams,
@@ -70,19 +81,40 @@ from .json import (
     playback_metadata_dict,
     playback_parse,
 )
-from .proto import SupportsToProto, parse_data
+from .proto import (
+    GrpcError,
+    GrpcFrameDecoder,
+    ProtoParseError,
+    SupportsToProto,
+    parse_data,
+    parse_payload,
+)
 from .proto.v1_pb2 import (
     FlightDetailsResponse,
     FollowFlightResponse,
+    LiveFeedRequest,
     LiveFeedResponse,
     LiveFlightsStatusResponse,
     NearestFlightsResponse,
     PlaybackFlightResponse,
+    PlaybackRequest,
     PlaybackResponse,
     RestrictionVisibility,
     TopFlightsResponse,
 )
-from .types import IntoFlightId, IntoTimestamp
+from .proto.wire import unwrap_length_delimited
+from .static.bbox import LNGS_WORLD_PER_HALF_HR, LNGS_WORLD_STATIC
+from .tiling import (
+    TileNode,
+    half_hour_slot,
+    load_lngs_per_half_hr,
+    load_tile_tree,
+    save_tile_tree,
+    tile_tree_path,
+)
+from .tracing import enabled as tracing_enabled
+from .tracing import span, traced
+from .types import IntFlightId, IntoFlightId, IntoTimestamp
 from .types.cache import TabularFileFmt
 from .types.grpc import LiveFeedField
 from .types.isqx import (
@@ -109,15 +141,16 @@ from .utils import (
     get_current_timestamp,
     parse_server_timestamp,
     static_check_signature,
+    to_flight_id,
     write_table,
 )
 
 if TYPE_CHECKING:
-    import httpx
     import polars as pl
     from typing_extensions import TypeAlias
 
     from . import HTTPClient
+    from .hedging import Hedger
 
 logger = logging.getLogger(__name__)
 
@@ -178,8 +211,40 @@ class SupportsFetch(Protocol[RequestT]):
         ...
 
 
+T = TypeVar("T")
+
+
 @dataclass_frozen
-class APIResult(Generic[RequestT]):
+class ParseCache:
+    """Memoizes the objects parsed from a raw response.
+
+    Accessors such as `to_proto()`, `to_dict()` and `to_polars()` decode the
+    raw bytes on first access only: subsequent calls return the *same* object.
+    Avoid mutating returned protobuf messages or dictionaries in place.
+    """
+
+    _cache: dict[str, Any] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    def _memoize(self, key: str, build: Callable[[], T]) -> T:
+        try:
+            return self._cache[key]  # type: ignore[no-any-return]
+        except KeyError:
+            value = self._cache[key] = build()
+            return value
+
+    def clear_cache(self) -> None:
+        """Frees all memoized objects, keeping only the raw response.
+
+        Useful in memory-sensitive loops that hold on to many results: the
+        next accessor call will parse the raw bytes again.
+        """
+        self._cache.clear()
+
+
+@dataclass_frozen
+class APIResult(ParseCache, Generic[RequestT]):
     """Wraps the raw `Response` with request context.
 
     Note that at this stage, the response holds the *raw* bytes, possibly
@@ -190,8 +255,27 @@ class APIResult(Generic[RequestT]):
     request: RequestT
     response: httpx.Response
 
+    def _memoize(self, key: str, build: Callable[[], T]) -> T:
+        event = request_event(self.response)
+        if key in self._cache or (event is None and not tracing_enabled()):
+            return ParseCache._memoize(self, key, build)
+        start = time.perf_counter()
+        with span(f"to_{key}", result=type(self).__name__):
+            value = self._cache[key] = build()
+        if event is not None:
+            event._on_parse(key, time.perf_counter() - start, value)
+        return value
+
 
 WriteLocation: TypeAlias = Union[FileLike, FR24Cache]
+IntoWorldLngs: TypeAlias = Union[
+    Literal["static", "half_hourly"],
+    Sequence[float],
+    Mapping[int, Sequence[float]],
+    Path,
+]
+"""Longitude knots delimiting vertical slices of the world, see
+[fr24.service.world_lngs][]."""
 
 
 @runtime_checkable
@@ -219,6 +303,7 @@ class FlightListService(SupportsFetch[FlightListParams]):
 
     @static_check_signature(FlightListParams)
     @deprecated(JSON_API_DEPRECATION_NOTICE)
+    @traced()
     async def fetch(
         self,
         reg: str | None = None,
@@ -286,7 +371,9 @@ class FlightListService(SupportsFetch[FlightListParams]):
         :param limit: Number of results per page - use `100` if authenticated.
         :param timestamp: Show flights with ATD before this Unix timestamp
         :param filter_by: If `historic`, do not return scheduled or live flights
-        :param delay: Delay between requests in seconds.
+        :param delay: Delay between requests in seconds. Can be set to `0` if
+            the client has a [fr24.ratelimit.RateController][] attached,
+            which paces the requests and backs off when throttled.
         :param max_pages: Maximum number of pages to fetch.
         """
         # TODO: something nasty with async generators is happening here
@@ -343,10 +430,12 @@ class FlightListResult(
     """A single result from the flight list API."""
 
     def to_dict(self) -> FlightList:
-        return flight_list_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: flight_list_parse(self.response).unwrap()
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return flight_list_df(self.to_dict())
+        return self._memoize("polars", lambda: flight_list_df(self.to_dict()))
 
     def write_table(
         self,
@@ -384,7 +473,6 @@ class FlightListResultCollection(
             return FLIGHT_LIST_EMPTY
 
         ident_hashes: set[int] = set()
-        data = self[0].to_dict()
         flights_all = []
         for result in self:
             if (
@@ -412,8 +500,17 @@ class FlightListResultCollection(
                 ident_hashes.add(ident_hash)
                 flights_all.append(flight)
 
-        data["result"]["response"]["data"] = flights_all
-        return data
+        # NOTE: the first dict is memoized by its result, copy the path we
+        # modify instead of mutating it in place
+        data = self[0].to_dict()
+        response = data["result"]["response"]
+        return {
+            **data,
+            "result": {
+                **data["result"],
+                "response": {**response, "data": flights_all},
+            },
+        }
 
     def to_polars(self) -> pl.DataFrame:
         return flight_list_df(self.to_dict())
@@ -447,6 +544,7 @@ class PlaybackService(SupportsFetch[PlaybackParams]):
 
     @static_check_signature(PlaybackParams)
     @deprecated(JSON_API_DEPRECATION_NOTICE)
+    @traced()
     async def fetch(
         self, flight_id: IntoFlightId, timestamp: IntoTimestamp | None = None
     ) -> PlaybackResult:
@@ -478,10 +576,12 @@ class PlaybackResult(
     SupportsWriteTable,
 ):
     def to_dict(self) -> Playback:
-        return playback_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: playback_parse(self.response).unwrap()
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return playback_df(self.to_dict())
+        return self._memoize("polars", lambda: playback_df(self.to_dict()))
 
     def metadata(self) -> dict[str, Any]:
         """Extracts flight metadata from the response."""
@@ -508,6 +608,12 @@ class LiveFeedService(SupportsFetch[LiveFeedParams]):
     """Live feed service."""
 
     _factory: ServiceFactory
+    _prepared: PreparedCallCache[LiveFeedRequest] = field(
+        default_factory=lambda: PreparedCallCache("LiveFeed"),
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     @static_check_signature(LiveFeedParams)
     async def fetch(
@@ -538,11 +644,19 @@ class LiveFeedService(SupportsFetch[LiveFeedParams]):
             maxage=maxage,
             fields=fields,
         )
-        response = await live_feed(
-            self._factory.http.client,
-            params.to_proto(),
-            self._factory.http.grpc_headers,
-        )
+        return await self._fetch(params)
+
+    # traced here rather than on `fetch`, so that each tile of a sweep gets
+    # its own span
+    @traced("LiveFeedService.fetch")
+    async def _fetch(
+        self, params: LiveFeedParams, hedge: Hedger | None = None
+    ) -> LiveFeedResult:
+        # the encoded request is reused as long as the parameters of this
+        # bounding box do not change
+        response = await self._prepared.get(
+            params.bounding_box, self._factory.http.grpc_headers
+        ).send(self._factory.http.client, params, hedge=hedge)
         # NOTE: serverTimeMs in the protobuf response would be more accurate
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return LiveFeedResult(
@@ -551,6 +665,288 @@ class LiveFeedService(SupportsFetch[LiveFeedParams]):
             timestamp=timestamp,
         )
 
+    async def fetch_many(
+        self,
+        bounding_boxes: Iterable[BoundingBox],
+        *,
+        max_concurrency: int = 8,
+        hedge: Hedger | None = None,
+        stats: bool = False,
+        limit: int = 1500,
+        maxage: DurationS[int] = 14400,
+        fields: set[LiveFeedField] = (
+            lambda: {"flight", "reg", "route", "type"}
+        )(),  # type: ignore
+    ) -> AsyncIterator[LiveFeedResult]:
+        """Fetch the live feed of many bounding boxes concurrently, yielding
+        each result *as soon as it completes* (not in the input order).
+
+        :param bounding_boxes: Bounding boxes to fetch.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param hedge: Duplicate slow requests to cut tail latency, see
+            [fr24.hedging.Hedger][]. A hedge does not count towards
+            `max_concurrency`.
+        See [fr24.service.LiveFeedService.fetch][] for other parameters.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(bounding_box: BoundingBox) -> LiveFeedResult:
+            async with semaphore:
+                return await self._fetch(
+                    LiveFeedParams(
+                        bounding_box=bounding_box,
+                        stats=stats,
+                        limit=limit,
+                        maxage=maxage,
+                        fields=fields,
+                    ),
+                    hedge,
+                )
+
+        tasks = [
+            asyncio.ensure_future(fetch_one(bounding_box))
+            for bounding_box in bounding_boxes
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def fetch_world(
+        self,
+        lngs: IntoWorldLngs = "static",
+        *,
+        max_concurrency: int = 8,
+        hedge: Hedger | None = None,
+        stats: bool = False,
+        limit: int = 1500,
+        maxage: DurationS[int] = 14400,
+        fields: set[LiveFeedField] = (
+            lambda: {"flight", "reg", "route", "type"}
+        )(),  # type: ignore
+    ) -> LiveFeedWorldResult:
+        """Fetch a snapshot of the entire world, by sweeping vertical slices.
+
+        Each slice is converted to a dataframe and merged as soon as it
+        completes (in batches, so that merging stays linear), releasing its
+        raw response. Flights on slice boundaries are deduplicated, see
+        [fr24.grpc.live_feed_merge_df][].
+
+        The sweep is all or nothing: if any slice fails, the remaining
+        requests are cancelled and the exception is propagated.
+
+        :param lngs: Longitude knots delimiting the slices, see
+            [fr24.service.world_lngs][].
+        :param max_concurrency: Maximum number of requests in flight.
+        :param hedge: See [fr24.service.LiveFeedService.fetch_many][].
+        See [fr24.service.LiveFeedService.fetch][] for other parameters.
+        """
+        bounding_boxes = world_bounding_boxes(
+            lngs, timestamp=get_current_timestamp()
+        )
+        tiles: list[LiveFeedTile] = []
+        merger = _LiveFeedMerger()
+        async for result in self.fetch_many(
+            bounding_boxes,
+            max_concurrency=max_concurrency,
+            hedge=hedge,
+            stats=stats,
+            limit=limit,
+            maxage=maxage,
+            fields=fields,
+        ):
+            df = result.to_polars()
+            tiles.append(
+                LiveFeedTile(
+                    bounding_box=result.request.bounding_box,
+                    num_flights=df.height,
+                    timestamp=result.timestamp,
+                    saturated=df.height >= limit,
+                )
+            )
+            merger.add(df)
+        return LiveFeedWorldResult(
+            timestamp=min(
+                (tile.timestamp for tile in tiles),
+                default=get_current_timestamp(),
+            ),
+            limit=limit,
+            tiles=tiles,
+            data=merger.flush(),
+        )
+
+    async def fetch_world_adaptive(
+        self,
+        cache: FR24Cache | None = None,
+        lngs: IntoWorldLngs = "half_hourly",
+        *,
+        max_concurrency: int = 8,
+        min_span: float = 0.5,
+        hedge: Hedger | None = None,
+        stats: bool = False,
+        limit: int = 1500,
+        maxage: DurationS[int] = 14400,
+        fields: set[LiveFeedField] = (
+            lambda: {"flight", "reg", "route", "type"}
+        )(),  # type: ignore
+    ) -> LiveFeedWorldResult:
+        """Fetch a snapshot of the entire world, recursively splitting
+        saturated tiles into quadrants until every tile is below the limit.
+
+        The learned split tree is stored per UTC half hour in the cache
+        directory (see [fr24.tiling][]), so that subsequent sweeps with the
+        same `lngs` and `limit` start from it, requesting the densest tiles
+        first. Quadrants which together returned less than half the limit are
+        merged back afterwards.
+
+        Note that a saturated tile is still merged into the result, its
+        flights being deduplicated against those of its quadrants.
+
+        :param cache: Cache to load and store the split tree in. If `None`,
+            the sweep starts from `lngs` and nothing is stored.
+        :param lngs: Initial slices if no valid split tree is stored, see
+            [fr24.service.LiveFeedService.fetch_world][].
+        :param min_span: Tiles spanning less than this many degrees of
+            latitude are not split any further.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param hedge: See [fr24.service.LiveFeedService.fetch_many][].
+        See [fr24.service.LiveFeedService.fetch][] for other parameters.
+        """
+        timestamp = get_current_timestamp()
+        fp = (
+            tile_tree_path(cache.path, half_hour_slot(timestamp))
+            if cache is not None
+            else None
+        )
+        knots = world_lngs(lngs, timestamp=timestamp)
+        tree = None
+        if fp is not None:
+            try:
+                tree = load_tile_tree(fp, limit=limit, lngs=knots)
+            except ValueError as e:
+                # a stale cache is never fatal, it is overwritten below
+                logger.warning(f"{e}, starting from the initial slices")
+        if tree is None:
+            tree = TileNode.from_lngs(knots)
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(
+            node: TileNode,
+        ) -> tuple[TileNode, LiveFeedResult]:
+            async with semaphore:
+                result = await self._fetch(
+                    LiveFeedParams(
+                        bounding_box=node.bounding_box,
+                        stats=stats,
+                        limit=limit,
+                        maxage=maxage,
+                        fields=fields,
+                    ),
+                    hedge,
+                )
+            return node, result
+
+        # tasks acquire the semaphore in creation order: densest first
+        leaves = sorted(
+            tree.leaves(),
+            key=lambda node: (
+                -1 if node.num_flights is None else node.num_flights
+            ),
+            reverse=True,
+        )
+        pending = {asyncio.ensure_future(fetch_one(node)) for node in leaves}
+        tiles: list[LiveFeedTile] = []
+        merger = _LiveFeedMerger()
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    node, result = task.result()
+                    df = result.to_polars()
+                    saturated = df.height >= limit
+                    node.num_flights = df.height
+                    tiles.append(
+                        LiveFeedTile(
+                            bounding_box=node.bounding_box,
+                            num_flights=df.height,
+                            timestamp=result.timestamp,
+                            saturated=saturated,
+                        )
+                    )
+                    merger.add(df)
+                    if not saturated:
+                        continue
+                    south, north, _, _ = node.bounding_box
+                    if (north - south) / 2 < min_span:
+                        logger.warning(
+                            f"not splitting saturated {node.bounding_box}"
+                        )
+                        continue
+                    pending.update(
+                        asyncio.ensure_future(fetch_one(child))
+                        for child in node.split()
+                    )
+        finally:
+            for task in pending:
+                task.cancel()
+        tree.prune(limit // 2)
+        if fp is not None:
+            save_tile_tree(fp, tree, limit=limit, lngs=knots)
+        return LiveFeedWorldResult(
+            timestamp=min(
+                (tile.timestamp for tile in tiles),
+                default=get_current_timestamp(),
+            ),
+            limit=limit,
+            tiles=tiles,
+            data=merger.flush(),
+        )
+
+
+def world_lngs(
+    lngs: IntoWorldLngs,
+    *,
+    timestamp: TimestampS[int],
+) -> Sequence[float]:
+    """Resolve the longitude knots delimiting vertical slices of the world.
+
+    :param lngs: Either:
+
+        - `static`: [fr24.static.bbox.LNGS_WORLD_STATIC][]
+        - `half_hourly`: [fr24.static.bbox.LNGS_WORLD_PER_HALF_HR][]
+        - a sequence of ascending knots, from -180 to 180
+        - a mapping from the UTC half hour of the day (0 = 00:00UTC) to knots
+        - a path to a knots file, see [fr24.tiling.save_lngs_per_half_hr][]
+    :param timestamp: Used to select the knots of the current half hour.
+    """
+    if lngs == "static":
+        return LNGS_WORLD_STATIC
+    if lngs == "half_hourly":
+        lngs = LNGS_WORLD_PER_HALF_HR
+    elif isinstance(lngs, Path):
+        lngs = load_lngs_per_half_hr(lngs)
+    if isinstance(lngs, Mapping):
+        return lngs[half_hour_slot(timestamp)]
+    return lngs
+
+
+def world_bounding_boxes(
+    lngs: IntoWorldLngs,
+    *,
+    timestamp: TimestampS[int],
+) -> list[BoundingBox]:
+    """Vertical slices covering the entire world, see
+    [fr24.service.world_lngs][].
+    """
+    knots = world_lngs(lngs, timestamp=timestamp)
+    return [
+        BoundingBox(-90, 90, west, east) for west, east in zip(knots, knots[1:])
+    ]
+
 
 @dataclass_frozen
 class LiveFeedResult(
@@ -563,13 +959,122 @@ class LiveFeedResult(
     timestamp: TimestampS[int]
 
     def to_proto(self) -> LiveFeedResponse:
-        return parse_data(self.response.content, LiveFeedResponse).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                LiveFeedResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
+
+    def to_polars(
+        self, *, decoder: Literal["proto", "wire"] = "proto"
+    ) -> pl.DataFrame:
+        """
+        :param decoder: If `wire`, scans the raw bytes straight into columns
+            without building protobuf messages, see
+            [fr24.grpc.live_feed_wire_df][]. The output is identical.
+            Ignored if the dataframe or protobuf message is already memoized,
+            so call this before `write_table` to use the wire decoder there.
+        """
+        if decoder == "wire" and "proto" not in self._cache:
+            return self._memoize(
+                "polars",
+                lambda: live_feed_wire_df(
+                    parse_payload(
+                        self.response.content,
+                        encoding=self.response.headers.get("grpc-encoding"),
+                    ).unwrap(),
+                    self.request.fields,
+                ),
+            )
+        return self._memoize("polars", lambda: live_feed_df(self.to_proto()))
+
+    def write_table(
+        self,
+        file: WriteLocation,
+        *,
+        format: TabularFileFmt = "parquet",
+        when_file_exists: FileExistsBehaviour = "backup",
+    ) -> None:
+        if isinstance(file, FR24Cache):
+            file = file.live_feed.get_path(self.timestamp)
+        write_table(
+            self, file, format=format, when_file_exists=when_file_exists
+        )
+
+
+class LiveFeedTile(NamedTuple):
+    """Summary of a single bounding box in a world sweep."""
+
+    bounding_box: BoundingBox
+    num_flights: int
+    """Number of flights returned, before deduplication."""
+    timestamp: TimestampS[int]
+    """Server timestamp of the response."""
+    saturated: bool
+    """Whether the number of flights reached the `limit`, in which case some
+    flights in this bounding box were likely dropped."""
+
+
+class _LiveFeedMerger:
+    """Merges the tiles of a world sweep as they complete.
+
+    Tiles are buffered until they hold as many rows as the merged table,
+    then merged into it: peak memory stays within about twice the result,
+    and as the table roughly doubles on each merge, the total cost of the
+    merges is linear in the number of rows.
+    """
+
+    def __init__(self) -> None:
+        self.data = live_feed_merge_df([])
+        self._pending: list[pl.DataFrame] = []
+        self._pending_rows = 0
+
+    def add(self, df: pl.DataFrame) -> None:
+        self._pending.append(df)
+        self._pending_rows += df.height
+        if self._pending_rows >= self.data.height:
+            self.flush()
+
+    def flush(self) -> pl.DataFrame:
+        if self._pending:
+            self.data = live_feed_merge_df([self.data, *self._pending])
+            self._pending.clear()
+            self._pending_rows = 0
+        return self.data
+
+
+@dataclass_frozen
+class LiveFeedWorldResult(SupportsToPolars, SupportsWriteTable):
+    """The merged, deduplicated result of a world sweep, see
+    [fr24.service.LiveFeedService.fetch_world][].
+    """
+
+    timestamp: TimestampS[int]
+    """Earliest server timestamp across all tiles."""
+    limit: int
+    """Maximum number of flights requested per tile."""
+    tiles: list[LiveFeedTile]
+    """Tiles in the order they completed."""
+    data: pl.DataFrame
+
+    @property
+    def saturated_tiles(self) -> list[LiveFeedTile]:
+        """Tiles which reached the limit and are likely incomplete."""
+        return [tile for tile in self.tiles if tile.saturated]
 
     def to_polars(self) -> pl.DataFrame:
-        return live_feed_df(self.to_proto())
+        return self.data
 
     def write_table(
         self,
@@ -590,8 +1095,15 @@ class LiveFeedPlaybackService(SupportsFetch[LiveFeedPlaybackParams]):
     """Live feed service."""
 
     _factory: ServiceFactory
+    _prepared: PreparedCallCache[PlaybackRequest] = field(
+        default_factory=lambda: PreparedCallCache("Playback"),
+        init=False,
+        repr=False,
+        compare=False,
+    )
 
     @static_check_signature(LiveFeedPlaybackParams)
+    @traced()
     async def fetch(
         self,
         bounding_box: BoundingBox,
@@ -631,11 +1143,9 @@ class LiveFeedPlaybackService(SupportsFetch[LiveFeedPlaybackParams]):
             duration=duration,
             hfreq=hfreq,
         )
-        response = await live_feed_playback(
-            self._factory.http.client,
-            params.to_proto(),
-            self._factory.http.grpc_headers,
-        )
+        response = await self._prepared.get(
+            bounding_box, self._factory.http.grpc_headers
+        ).send(self._factory.http.client, params)
         return LiveFeedPlaybackResult(
             request=params,
             response=response,
@@ -651,13 +1161,49 @@ class LiveFeedPlaybackResult(
     SupportsWriteTable,
 ):
     def to_proto(self) -> PlaybackResponse:
-        return parse_data(self.response.content, PlaybackResponse).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                PlaybackResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
-    def to_polars(self) -> pl.DataFrame:
-        return live_feed_playback_df(self.to_proto())
+    def to_polars(
+        self, *, decoder: Literal["proto", "wire"] = "proto"
+    ) -> pl.DataFrame:
+        """
+        :param decoder: If `wire`, scans the raw bytes straight into columns
+            without building protobuf messages, see
+            [fr24.grpc.live_feed_wire_df][]. The output is identical.
+            Ignored if the dataframe or protobuf message is already memoized.
+        """
+        if decoder == "wire" and "proto" not in self._cache:
+            return self._memoize(
+                "polars",
+                lambda: live_feed_wire_df(
+                    unwrap_length_delimited(
+                        parse_payload(
+                            self.response.content,
+                            encoding=self.response.headers.get("grpc-encoding"),
+                        ).unwrap(),
+                        PlaybackResponse.LIVE_FEED_RESPONSE_FIELD_NUMBER,
+                    ),
+                    self.request.fields,
+                ),
+            )
+        return self._memoize(
+            "polars", lambda: live_feed_playback_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -681,6 +1227,7 @@ class AirportListService(SupportsFetch[AirportListParams]):
 
     @static_check_signature(AirportListParams)
     @deprecated(JSON_API_DEPRECATION_NOTICE)
+    @traced()
     async def fetch(
         self,
         airport: str,
@@ -723,7 +1270,9 @@ class AirportListResult(
 ):
     def to_dict(self) -> AirportList:
         """Parse the response into a dictionary."""
-        return airport_list_parse(self.response).unwrap()
+        return self._memoize(
+            "dict", lambda: airport_list_parse(self.response).unwrap()
+        )
 
 
 @dataclass_frozen
@@ -734,6 +1283,7 @@ class FindService(SupportsFetch[FindParams]):
 
     @static_check_signature(FindParams)
     @deprecated(JSON_API_DEPRECATION_NOTICE)
+    @traced()
     async def fetch(self, query: str, limit: int = 50) -> FindResult:
         """Fetch the find results.
 
@@ -761,7 +1311,7 @@ class FindResult(
 
     def to_dict(self) -> Find:
         """Parse the response into a dictionary."""
-        return find_parse(self.response).unwrap()
+        return self._memoize("dict", lambda: find_parse(self.response).unwrap())
 
 
 @dataclass_frozen
@@ -771,6 +1321,7 @@ class NearestFlightsService(SupportsFetch[NearestFlightsParams]):
     _factory: ServiceFactory
 
     @static_check_signature(NearestFlightsParams)
+    @traced()
     async def fetch(
         self,
         lat: LatitudeDeg[float],
@@ -815,15 +1366,27 @@ class NearestFlightsResult(
     timestamp: TimestampS[int]
 
     def to_proto(self) -> NearestFlightsResponse:
-        return parse_data(
-            self.response.content, NearestFlightsResponse
-        ).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                NearestFlightsResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return nearest_flights_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: nearest_flights_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -841,6 +1404,11 @@ class NearestFlightsResult(
         )
 
 
+LIVE_FLIGHTS_STATUS_CHUNK_SIZE = 1000
+"""Default number of flight ids per request of
+[fr24.service.LiveFlightsStatusService.fetch_chunked][]."""
+
+
 @dataclass_frozen
 class LiveFlightsStatusService(SupportsFetch[LiveFlightsStatusParams]):
     """Live flights status service."""
@@ -855,19 +1423,114 @@ class LiveFlightsStatusService(SupportsFetch[LiveFlightsStatusParams]):
 
         :param flight_ids: List of flight IDs to get status for
         """
-        request = LiveFlightsStatusParams(flight_ids=flight_ids)
+        return await self._fetch(LiveFlightsStatusParams(flight_ids=flight_ids))
+
+    # traced here, so that each chunk of `fetch_chunked` gets its own span
+    @traced("LiveFlightsStatusService.fetch")
+    async def _fetch(
+        self, params: LiveFlightsStatusParams, hedge: Hedger | None = None
+    ) -> LiveFlightsStatusResult:
         response = await live_flights_status(
             self._factory.http.client,
-            request.to_proto(),
+            params.to_proto(),
             self._factory.http.grpc_headers,
+            hedge=hedge,
         )
         timestamp = parse_server_timestamp(response) or get_current_timestamp()
         return LiveFlightsStatusResult(
-            request=request,
+            request=params,
             response=response,
             timestamp=timestamp,
         )
 
+    async def fetch_chunked(
+        self,
+        flight_ids: Iterable[IntoFlightId],
+        *,
+        chunk_size: int = LIVE_FLIGHTS_STATUS_CHUNK_SIZE,
+        max_concurrency: int = 8,
+        hedge: Hedger | None = None,
+    ) -> LiveFlightsStatusChunkedResult:
+        """Fetch the status of a large watchlist, split into chunks requested
+        concurrently (and within the limits of a
+        [fr24.ratelimit.RateController][], if one is attached).
+
+        Duplicate flight ids are removed. Each chunk is converted to a
+        dataframe as soon as it completes and its raw response is released.
+        Use `scripts/bench_live_flights_status_chunks.py` to measure the
+        throughput of different chunk sizes.
+
+        :param flight_ids: Flight IDs to get status for.
+        :param chunk_size: Maximum number of flight ids per request.
+        :param max_concurrency: Maximum number of requests in flight.
+        :param hedge: See [fr24.service.LiveFeedService.fetch_many][].
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be positive")
+        ids = list(dict.fromkeys(to_flight_id(fid) for fid in flight_ids))
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def fetch_one(
+            chunk: Sequence[IntoFlightId],
+        ) -> LiveFlightsStatusResult:
+            async with semaphore:
+                return await self._fetch(
+                    LiveFlightsStatusParams(flight_ids=chunk), hedge
+                )
+
+        tasks = [
+            asyncio.ensure_future(fetch_one(ids[i : i + chunk_size]))
+            for i in range(0, len(ids), chunk_size)
+        ]
+        frames: list[pl.DataFrame] = []
+        timestamps: list[int] = []
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                result = await next_result
+                frames.append(result.to_polars())
+                timestamps.append(result.timestamp)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return LiveFlightsStatusChunkedResult(
+            timestamp=min(timestamps, default=get_current_timestamp()),
+            num_flight_ids=len(ids),
+            num_chunks=len(tasks),
+            data=live_flights_status_merge_df(frames),
+        )
+
+
+@dataclass_frozen
+class LiveFlightsStatusChunkedResult(SupportsToPolars, SupportsWriteTable):
+    """The merged result of a chunked watchlist, see
+    [fr24.service.LiveFlightsStatusService.fetch_chunked][].
+    """
+
+    timestamp: TimestampS[int]
+    """Earliest server timestamp across all chunks."""
+    num_flight_ids: int
+    """Number of unique flight ids requested."""
+    num_chunks: int
+    data: pl.DataFrame
+    """Flights that are live, with the schema of
+    [fr24.types.cache.LiveFlightStatusRecord][]."""
+
+    def to_polars(self) -> pl.DataFrame:
+        return self.data
+
+    def write_table(
+        self,
+        file: WriteLocation,
+        *,
+        format: TabularFileFmt = "parquet",
+        when_file_exists: FileExistsBehaviour = "backup",
+    ) -> None:
+        if isinstance(file, FR24Cache):
+            file = file.live_flights_status.get_path(self.timestamp)
+        write_table(
+            self, file, format=format, when_file_exists=when_file_exists
+        )
+
 
 @dataclass_frozen
 class LiveFlightsStatusResult(
@@ -880,15 +1543,27 @@ class LiveFlightsStatusResult(
     timestamp: TimestampS[int]
 
     def to_proto(self) -> LiveFlightsStatusResponse:
-        return parse_data(
-            self.response.content, LiveFlightsStatusResponse
-        ).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                LiveFlightsStatusResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return live_flights_status_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: live_flights_status_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -924,34 +1599,177 @@ class FollowFlightService:
         Must be live, or the response will contain an empty `DATA` frame error.
         :param restriction_mode: [FAA LADD](https://www.faa.gov/pilots/ladd)
             visibility mode.
+        :raises GrpcError: If the stream ends with a non-OK status.
         """
         request = FollowFlightParams(
             flight_id=flight_id, restriction_mode=restriction_mode
         )
-        async for response in follow_flight_stream(
+        decoder = GrpcFrameDecoder()
+        results = self._stream(request, decoder)
+        try:
+            async for result in results:
+                yield result
+        finally:
+            await results.aclose()
+        if decoder.status is not None and not decoder.status.ok:
+            raise GrpcError(
+                "gRPC errored",
+                decoder.trailers,
+                status=decoder.status.status,
+                status_message=decoder.status.message,
+                status_details=decoder.status.details,
+            )
+
+    async def _stream(
+        self, params: FollowFlightParams, decoder: GrpcFrameDecoder
+    ) -> AsyncGenerator[FollowFlightResult, None]:
+        # generators are closed explicitly (`contextlib.aclosing` requires
+        # python 3.10), so that the response is closed as soon as the
+        # consumer stops rather than when the generator is collected
+        responses = follow_flight_stream(
             self._factory.http.client,
-            request.to_proto(),
+            params.to_proto(),
             self._factory.http.grpc_headers,
-        ):
-            yield FollowFlightResult(
-                request=request,
-                response=response,
+            decoder=decoder,
+        )
+        try:
+            async for response in responses:
+                yield FollowFlightResult(request=params, response=response)
+        finally:
+            await responses.aclose()
+
+    async def stream_many(
+        self,
+        flight_ids: Iterable[IntoFlightId],
+        *,
+        max_streams: int = 64,
+        max_retries: int = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        buffer: int = 256,
+        restriction_mode: (
+            RestrictionVisibility.ValueType | str | bytes
+        ) = RestrictionVisibility.NOT_VISIBLE,
+    ) -> AsyncGenerator[tuple[IntFlightId, FollowFlightResult], None]:
+        """Follow many flights concurrently over the shared client, yielding
+        the updates of all of them, tagged by flight id, as they arrive.
+
+        A stream that drops (a transport error, a truncated frame, no
+        trailers or a transient status) is reconnected after an
+        exponential backoff with jitter. A flight is no longer followed
+        once its stream ends with any other status (e.g. OK because it
+        landed), or after `max_retries` consecutive failures. Streams which
+        did not get past their initial update count as failures.
+
+        :param flight_ids: Flights to follow.
+        :param max_streams: Maximum number of open streams, the other
+            flights are queued until one ends (or waits to reconnect).
+            Note that a HTTP/2 connection typically allows 100 streams.
+        :param max_retries: Maximum number of consecutive reconnections.
+        :param backoff: Seconds before the first reconnection, doubling
+            with each consecutive failure up to `max_backoff`.
+        :param buffer: Maximum number of updates not yet consumed, after
+            which the streams stop being read.
+        See [fr24.service.FollowFlightService.stream][] for other
+        parameters.
+        """
+        semaphore = asyncio.Semaphore(max_streams)
+        queue: asyncio.Queue[tuple[IntFlightId, FollowFlightResult | None]] = (
+            asyncio.Queue(buffer)
+        )
+
+        async def follow(flight_id: IntFlightId) -> None:
+            params = FollowFlightParams(
+                flight_id=flight_id, restriction_mode=restriction_mode
             )
+            failures = 0
+            while True:
+                decoder = GrpcFrameDecoder()
+                received = 0
+                async with semaphore:
+                    results = self._stream(params, decoder)
+                    try:
+                        async for result in results:
+                            received += 1
+                            await queue.put((flight_id, result))
+                        reason = f"ended with {decoder.status}"
+                    except (httpx.TransportError, ProtoParseError) as e:
+                        reason = f"dropped: {e!r}"
+                    finally:
+                        await results.aclose()
+                status = decoder.status
+                if status is not None and status.status not in _RETRY_STATUS:
+                    if not status.ok:
+                        logger.warning(f"{flight_id}: stream {reason}")
+                    return
+                failures = 0 if received > 1 else failures + 1
+                if failures > max_retries:
+                    logger.warning(
+                        f"{flight_id}: giving up after {max_retries} "
+                        f"retries, stream {reason}"
+                    )
+                    return
+                delay = min(max_backoff, backoff * 2 ** max(failures - 1, 0))
+                logger.info(f"{flight_id}: stream {reason}, retry in {delay}s")
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+
+        async def run(flight_id: IntFlightId) -> None:
+            try:
+                await follow(flight_id)
+            except Exception as e:
+                logger.error(f"{flight_id}: failed to follow: {e!r}")
+            await queue.put((flight_id, None))
+
+        # deduplicated once normalised, e.g. `1` and `"1"` are one flight
+        ids = dict.fromkeys(to_flight_id(fid) for fid in flight_ids)
+        tasks = [asyncio.ensure_future(run(flight_id)) for flight_id in ids]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                flight_id, result = await queue.get()
+                if result is None:
+                    remaining -= 1
+                    continue
+                yield flight_id, result
+        finally:
+            for task in tasks:
+                task.cancel()
+            # wait for the streams to be closed
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_RETRY_STATUS = (
+    None,
+    4,  # DEADLINE_EXCEEDED
+    8,  # RESOURCE_EXHAUSTED
+    14,  # UNAVAILABLE
+)
+"""Final statuses of a followed stream which are worth reconnecting."""
 
 
 @dataclass_frozen
 class FollowFlightResult(
+    ParseCache,
     SupportsToProto[FollowFlightResponse],
     SupportsToDict[dict[str, Any]],
 ):
     request: FollowFlightParams
     response: bytes
+    """A single, complete length-prefixed DATA frame."""
 
     def to_proto(self) -> FollowFlightResponse:
-        return parse_data(self.response, FollowFlightResponse).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(self.response, FollowFlightResponse).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
 
 @dataclass_frozen
@@ -961,6 +1779,7 @@ class TopFlightsService(SupportsFetch[TopFlightsParams]):
     _factory: ServiceFactory
 
     @static_check_signature(TopFlightsParams)
+    @traced()
     async def fetch(self, limit: int = 10) -> TopFlightsResult:
         """Fetch the top flights.
 
@@ -991,13 +1810,25 @@ class TopFlightsResult(
     timestamp: TimestampS[int]
 
     def to_proto(self) -> TopFlightsResponse:
-        return parse_data(self.response.content, TopFlightsResponse).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                TopFlightsResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return top_flights_df(self.to_proto())
+        return self._memoize("polars", lambda: top_flights_df(self.to_proto()))
 
     def write_table(
         self,
@@ -1020,6 +1851,7 @@ class FlightDetailsService(SupportsFetch[FlightDetailsParams]):
     _factory: ServiceFactory
 
     @static_check_signature(FlightDetailsParams)
+    @traced()
     async def fetch(
         self,
         flight_id: IntoFlightId,
@@ -1068,13 +1900,27 @@ class FlightDetailsResult(
     timestamp: TimestampS[int]
 
     def to_proto(self) -> FlightDetailsResponse:
-        return parse_data(self.response.content, FlightDetailsResponse).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                FlightDetailsResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return flight_details_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: flight_details_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -1099,6 +1945,7 @@ class PlaybackFlightService(SupportsFetch[PlaybackFlightParams]):
     _factory: ServiceFactory
 
     @static_check_signature(PlaybackFlightParams)
+    @traced()
     async def fetch(
         self, flight_id: IntoFlightId, timestamp: IntoTimestamp
     ) -> PlaybackFlightResult:
@@ -1132,15 +1979,27 @@ class PlaybackFlightResult(
     SupportsWriteTable,
 ):
     def to_proto(self) -> PlaybackFlightResponse:
-        return parse_data(
-            self.response.content, PlaybackFlightResponse
-        ).unwrap()
+        return self._memoize(
+            "proto",
+            lambda: parse_data(
+                self.response.content,
+                PlaybackFlightResponse,
+                encoding=self.response.headers.get("grpc-encoding"),
+            ).unwrap(),
+        )
 
     def to_dict(self) -> dict[str, Any]:
-        return MessageToDict(self.to_proto(), preserving_proto_field_name=True)
+        return self._memoize(
+            "dict",
+            lambda: MessageToDict(
+                self.to_proto(), preserving_proto_field_name=True
+            ),
+        )
 
     def to_polars(self) -> pl.DataFrame:
-        return playback_flight_df(self.to_proto())
+        return self._memoize(
+            "polars", lambda: playback_flight_df(self.to_proto())
+        )
 
     def write_table(
         self,
@@ -0,0 +1,269 @@
+"""
+Tiling of the world for live feed sweeps.
+
+The live feed returns at most `limit` flights per bounding box: a tile that
+returns exactly `limit` flights is *saturated* and has likely dropped some.
+A [TileNode][fr24.tiling.TileNode] tree starts from vertical slices of the
+world and splits saturated tiles into quadrants. Since traffic follows the
+time of day, the learned tree is stored per half hour slot so that the next
+sweep can start from it.
+
+The longitude knots of the initial vertical slices can also be regenerated
+from cached live feed snapshots, see
+[fr24.tiling.compute_lngs_per_half_hr][].
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Sequence
+
+from .grpc import BoundingBox
+from .static.bbox import LNGS_WORLD_PER_HALF_HR
+from .types.isqx import TimestampS
+from .utils import get_current_timestamp, raise_missing_polars, scan_table
+
+logger = logging.getLogger(__name__)
+
+TILE_TREE_VERSION = 2
+"""Version of the JSON tile tree format."""
+KNOTS_VERSION = 1
+"""Version of the JSON knots format."""
+
+
+def half_hour_slot(timestamp: TimestampS[int]) -> int:
+    """Index of the UTC half hour of the day (0 = 00:00UTC, 47 = 23:30UTC)."""
+    return timestamp % 86400 // 1800
+
+
+@dataclass
+class TileNode:
+    """A tile in the split tree. Leaves are the bounding boxes to request."""
+
+    bounding_box: BoundingBox
+    children: list[TileNode] = field(default_factory=list)
+    num_flights: int | None = None
+    """Number of flights last returned for this leaf, `None` if unknown."""
+
+    @classmethod
+    def from_lngs(cls, lngs: Sequence[float]) -> TileNode:
+        """Create a tree covering the world with vertical slices."""
+        return cls(
+            BoundingBox(-90, 90, lngs[0], lngs[-1]),
+            children=[
+                cls(BoundingBox(-90, 90, west, east))
+                for west, east in zip(lngs, lngs[1:])
+            ],
+        )
+
+    def leaves(self) -> Iterator[TileNode]:
+        if not self.children:
+            yield self
+        for child in self.children:
+            yield from child.leaves()
+
+    def split(self) -> list[TileNode]:
+        """Split this leaf into four quadrants, returning them."""
+        south, north, west, east = self.bounding_box
+        lat = (south + north) / 2
+        lon = (west + east) / 2
+        self.children = [
+            TileNode(BoundingBox(lat, north, west, lon)),
+            TileNode(BoundingBox(lat, north, lon, east)),
+            TileNode(BoundingBox(south, lat, west, lon)),
+            TileNode(BoundingBox(south, lat, lon, east)),
+        ]
+        self.num_flights = None
+        return self.children
+
+    def prune(self, max_flights: int) -> None:
+        """Merge quadrants back into their parent if, together, they returned
+        no more than `max_flights`. The top level slices are never merged."""
+        for child in self.children:
+            child._prune(max_flights)
+
+    def _prune(self, max_flights: int) -> None:
+        for child in self.children:
+            child._prune(max_flights)
+        if not self.children or any(c.children for c in self.children):
+            return
+        counts = [c.num_flights for c in self.children]
+        if any(n is None for n in counts):
+            return
+        total = sum(counts)  # type: ignore[arg-type]
+        if total <= max_flights:
+            self.children = []
+            self.num_flights = total
+
+    def to_dict(self) -> dict[str, Any]:
+        if self.children:
+            return {
+                "bounding_box": list(self.bounding_box),
+                "children": [c.to_dict() for c in self.children],
+            }
+        return {
+            "bounding_box": list(self.bounding_box),
+            "num_flights": self.num_flights,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> TileNode:
+        return cls(
+            BoundingBox(*data["bounding_box"]),
+            children=[cls.from_dict(c) for c in data.get("children", [])],
+            num_flights=data.get("num_flights"),
+        )
+
+
+def tile_tree_path(cache_path: Path, slot: int) -> Path:
+    """Path to the stored tile tree of a half hour slot, in the cache."""
+    return cache_path / "live_feed_tiles" / f"{slot:02d}.json"
+
+
+def load_tile_tree(
+    fp: Path, *, limit: int, lngs: Sequence[float]
+) -> TileNode | None:
+    """Load a stored tile tree.
+
+    :param limit: The `limit` of the requests of the sweep. The splits of a
+        tree only hold for the limit it was built with.
+    :param lngs: Longitude knots of the top level slices of the sweep.
+    :returns: `None` if the tree is missing, was written by an incompatible
+        version or was built with a different `limit` or `lngs`.
+    :raises ValueError: If the file is not a valid tile tree.
+    """
+    if not fp.exists():
+        return None
+    try:
+        data = json.loads(fp.read_text())
+        if data.get("version") != TILE_TREE_VERSION:
+            logger.warning(f"ignoring tile tree {fp} with unknown version")
+            return None
+        if data["limit"] != limit or data["lngs"] != [float(x) for x in lngs]:
+            logger.info(f"ignoring tile tree {fp} built with other settings")
+            return None
+        return TileNode.from_dict(data["tree"])
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        raise ValueError(f"corrupt tile tree {fp}: {e!r}") from e
+
+
+def save_tile_tree(
+    fp: Path, tree: TileNode, *, limit: int, lngs: Sequence[float]
+) -> None:
+    """Store a tile tree, along with the settings it was built with, see
+    [fr24.tiling.load_tile_tree][]."""
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": TILE_TREE_VERSION,
+        "limit": limit,
+        "lngs": [float(x) for x in lngs],
+        "tree": tree.to_dict(),
+    }
+    tmp = fp.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data))
+    tmp.replace(fp)
+
+
+def compute_lngs_per_half_hr(
+    files: Iterable[Path],
+    *,
+    flights_per_tile: int = 1000,
+    precision: int = 1,
+) -> dict[int, list[float]]:
+    """Compute longitude knots for each UTC half hour from live feed snapshots,
+    such that each vertical slice contains about `flights_per_tile` flights.
+
+    Snapshots are grouped by the half hour of their timestamp. For each slot,
+    the number of slices is the mean number of flights per snapshot divided by
+    `flights_per_tile`, and the knots are the equal-count quantiles of the
+    longitudes of all snapshots in that slot.
+
+    :param files: Parquet files of the live feed, named by their timestamp as
+        in [fr24.cache.FR24Cache.live_feed][]. Other files are ignored.
+    :param flights_per_tile: Target number of flights per slice. Should be
+        comfortably below the `limit` of the requests.
+    :param precision: Number of decimal places to round the knots to.
+    :returns: Knots from -180 to 180 for each slot with at least one
+        snapshot.
+    """
+    try:
+        import polars as pl
+    except ImportError as exc:
+        raise_missing_polars(exc)
+
+    files_per_slot: defaultdict[int, list[Path]] = defaultdict(list)
+    for fp in files:
+        if not fp.stem.isdigit():
+            continue
+        files_per_slot[half_hour_slot(int(fp.stem))].append(fp)
+
+    lngs: dict[int, list[float]] = {}
+    for slot, fps in sorted(files_per_slot.items()):
+        longitudes = (
+            pl.concat([scan_table(fp).select("longitude") for fp in fps])
+            .drop_nulls()
+            .collect()
+            .to_series()
+        )
+        num_tiles = max(
+            1, math.ceil(len(longitudes) / len(fps) / flights_per_tile)
+        )
+        knots = [-180.0]
+        for i in range(1, num_tiles):
+            q = longitudes.quantile(i / num_tiles, interpolation="linear")
+            assert q is not None
+            knot = round(float(q), precision)
+            if knots[-1] < knot < 180:
+                knots.append(knot)
+        knots.append(180.0)
+        lngs[slot] = knots
+    return lngs
+
+
+def save_lngs_per_half_hr(
+    fp: Path,
+    lngs: dict[int, list[float]],
+    *,
+    flights_per_tile: int,
+) -> None:
+    """Write knots computed by [fr24.tiling.compute_lngs_per_half_hr][] to a
+    versioned JSON file."""
+    fp.parent.mkdir(parents=True, exist_ok=True)
+    data = {
+        "version": KNOTS_VERSION,
+        "generated_at": get_current_timestamp(),
+        "flights_per_tile": flights_per_tile,
+        "lngs": {str(slot): knots for slot, knots in sorted(lngs.items())},
+    }
+    tmp = fp.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2))
+    tmp.replace(fp)
+
+
+def load_lngs_per_half_hr(fp: Path) -> dict[int, list[float]]:
+    """Load knots written by [fr24.tiling.save_lngs_per_half_hr][].
+
+    Slots missing from the file fall back to
+    [fr24.static.bbox.LNGS_WORLD_PER_HALF_HR][].
+
+    :raises ValueError: If the file was written by an incompatible version.
+    """
+    data = json.loads(fp.read_text())
+    if data.get("version") != KNOTS_VERSION:
+        raise ValueError(
+            f"unsupported knots file version {data.get('version')!r}, "
+            f"expected {KNOTS_VERSION}"
+        )
+    lngs = {slot: list(knots) for slot, knots in LNGS_WORLD_PER_HALF_HR.items()}
+    lngs.update({int(slot): knots for slot, knots in data["lngs"].items()})
+    return lngs
+
+
+def knots_path(cache_path: Path) -> Path:
+    """Default path to the regenerated knots, in the cache."""
+    return cache_path / "live_feed_knots.json"
@@ -0,0 +1,183 @@
+"""
+Nested timing spans through the fetch, parse, convert and write pipeline,
+exported in the Chrome trace event format.
+
+Tracing is disabled by default, in which case each instrumented call only
+checks a module global. To record a trace:
+
+```py
+from fr24.tracing import tracing
+
+with tracing("trace.json"):
+    async with FR24() as fr24:
+        result = await fr24.live_feed.fetch_world()
+        result.write_table(FR24Cache.default())
+```
+
+and open `trace.json` in [Perfetto](https://ui.perfetto.dev) or
+`chrome://tracing`. Spans of each asyncio task are shown on their own track.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, TypeVar, cast
+
+if TYPE_CHECKING:
+    from typing import ContextManager, Iterator
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class Tracer:
+    """Collects spans in memory."""
+
+    def __init__(self) -> None:
+        self.events: list[dict[str, Any]] = []
+        """Complete (`ph: X`) events, in the order they ended."""
+        self._pid = os.getpid()
+        self._tracks: dict[int, int] = {}
+        self._track_names: dict[int, str] = {}
+
+    def _track(self) -> int:
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:  # no running event loop
+            task = None
+        key = threading.get_ident() if task is None else id(task)
+        if (track := self._tracks.get(key)) is None:
+            track = self._tracks[key] = len(self._tracks) + 1
+            self._track_names[track] = (
+                threading.current_thread().name
+                if task is None
+                else task.get_name()
+            )
+        return track
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the body of the `with` block.
+
+        :param args: Shown alongside the span, must be JSON serialisable.
+        """
+        track = self._track()
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": "fr24",
+                    "ph": "X",
+                    "ts": start / 1e3,
+                    "dur": (end - start) / 1e3,
+                    "pid": self._pid,
+                    "tid": track,
+                    "args": args,
+                }
+            )
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        metadata = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self._pid,
+                "tid": track,
+                "args": {"name": name},
+            }
+            for track, name in self._track_names.items()
+        ]
+        return {
+            "traceEvents": metadata + self.events,
+            "displayTimeUnit": "ms",
+        }
+
+    def write(self, path: Path | str) -> None:
+        """Write the spans as a Chrome trace event JSON file."""
+        Path(path).write_text(json.dumps(self.to_chrome_trace()))
+
+
+_tracer: Tracer | None = None
+_DISABLED = nullcontext()
+
+
+def enable(tracer: Tracer | None = None) -> Tracer:
+    """Start recording spans, into a new tracer unless one is given."""
+    global _tracer
+    _tracer = Tracer() if tracer is None else tracer
+    return _tracer
+
+
+def disable() -> Tracer | None:
+    """Stop recording spans, returning the tracer that recorded them."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+@contextmanager
+def tracing(path: Path | str | None = None) -> Iterator[Tracer]:
+    """Record spans within the `with` block, writing them to `path` (if
+    given) on exit."""
+    previous = _tracer
+    tracer = enable()
+    try:
+        yield tracer
+    finally:
+        if previous is None:
+            disable()
+        else:
+            enable(previous)
+        if path is not None:
+            tracer.write(path)
+
+
+def enabled() -> bool:
+    return _tracer is not None
+
+
+def span(name: str, **args: Any) -> ContextManager[None]:
+    """A span of the active tracer, or a no-op if tracing is disabled."""
+    if _tracer is None:
+        return _DISABLED
+    return _tracer.span(name, **args)
+
+
+def traced(name: str | None = None) -> Callable[[F], F]:
+    """Decorate a function or coroutine function to record a span for each
+    call, named after its qualified name by default."""
+
+    def decorator(fn: F) -> F:
+        label = fn.__qualname__ if name is None else name
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if _tracer is None:
+                    return await fn(*args, **kwargs)
+                with _tracer.span(label):
+                    return await fn(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _tracer is None:
+                return fn(*args, **kwargs)
+            with _tracer.span(label):
+                return fn(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
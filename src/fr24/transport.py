@@ -0,0 +1,296 @@
+"""
+Connection pooling for the default HTTP client.
+
+With HTTP/2, `httpx` multiplexes all concurrent requests to a host onto a
+single connection. Under heavy concurrency (e.g. a world sweep) this runs
+into the server's limit of concurrent streams per connection and a slow
+response delays the others on the same connection. A
+[fr24.transport.TransportProfile][] spreads requests over several
+independent HTTP/2 connections instead:
+
+```py
+from fr24 import FR24
+from fr24.transport import TransportProfile
+
+async with FR24(profile=TransportProfile(connections=4)) as fr24:
+    await fr24.live_feed.fetch_world(max_concurrency=32)
+    for stats in fr24.http.connection_stats():
+        print(stats.utilisation)
+```
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import httpx
+
+from .utils import dataclass_frozen
+
+if TYPE_CHECKING:
+    from typing import AsyncIterator, Callable
+
+    from .ratelimit import Outcome, RateController
+
+
+@dataclass_frozen
+class TransportProfile:
+    """Connection settings of the client created by [fr24.FR24][]."""
+
+    connections: int = 1
+    """Number of independent connection pools to spread requests over. With
+    HTTP/2, each pool holds one connection per host."""
+    http2: bool = True
+    max_connections: int | None = 100
+    """Maximum number of connections per pool."""
+    max_keepalive_connections: int | None = 20
+    """Maximum number of idle connections kept alive per pool."""
+    keepalive_expiry: float | None = 5.0
+    """Seconds an idle connection is kept alive."""
+    max_concurrent_streams: int = 100
+    """Concurrent streams allowed per connection by the server, only used to
+    compute [fr24.transport.ShardStats.utilisation][]. The HTTP/2 flow
+    control windows are managed by `httpcore`, which already raises the
+    connection window to 16 MiB."""
+    timeout: float | None = 5.0
+    """Default timeout of all requests, seconds."""
+    grpc_compression: bool = False
+    """Advertise every [supported][fr24.proto.supported_encodings] message
+    compression to the gRPC server, which may then compress its responses:
+    less bandwidth for some CPU time to decompress them."""
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def build_transport(self) -> ShardedTransport:
+        if self.connections < 1:
+            raise ValueError("connections must be at least 1")
+        return ShardedTransport(
+            [
+                httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits())
+                for _ in range(self.connections)
+            ],
+            max_concurrent_streams=self.max_concurrent_streams,
+        )
+
+
+@dataclass
+class ShardStats:
+    """Usage of one connection pool of a [fr24.transport.ShardedTransport][]."""
+
+    max_concurrent_streams: int
+    requests: int = 0
+    """Total number of requests sent."""
+    in_flight: int = 0
+    """Number of responses currently open."""
+    peak_in_flight: int = 0
+    _stream_seconds: float = 0.0
+    _last_change: float = field(default_factory=time.monotonic)
+    _created: float = field(default_factory=time.monotonic)
+
+    def _update(self, delta: int) -> None:
+        now = time.monotonic()
+        self._stream_seconds += self.in_flight * (now - self._last_change)
+        self._last_change = now
+        self.in_flight += delta
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    @property
+    def mean_in_flight(self) -> float:
+        """Time-weighted mean number of open streams since creation."""
+        now = time.monotonic()
+        elapsed = now - self._created
+        if elapsed <= 0:
+            return 0.0
+        pending = self.in_flight * (now - self._last_change)
+        return (self._stream_seconds + pending) / elapsed
+
+    @property
+    def utilisation(self) -> float:
+        """Mean fraction of the concurrent stream limit in use."""
+        return self.mean_in_flight / self.max_concurrent_streams
+
+    @property
+    def peak_utilisation(self) -> float:
+        return self.peak_in_flight / self.max_concurrent_streams
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    def __init__(
+        self,
+        stream: httpx.AsyncByteStream,
+        on_close: Callable[[], None],
+        on_chunk: Callable[[bytes], None] | None = None,
+    ) -> None:
+        self._stream = stream
+        self._on_close: Callable[[], None] | None = on_close
+        self._on_chunk = on_chunk
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            if self._on_chunk is not None:
+                self._on_chunk(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close is not None:
+                self._on_close()
+                self._on_close = None
+
+
+class ShardedTransport(httpx.AsyncBaseTransport):
+    """Sends each request through the least loaded of several transports.
+
+    A request counts towards the load of its transport until its response is
+    closed, so long-lived streams (e.g. follow flight) are accounted for.
+    Ties are broken round-robin.
+    """
+
+    def __init__(
+        self,
+        transports: list[httpx.AsyncBaseTransport],
+        *,
+        max_concurrent_streams: int = 100,
+    ) -> None:
+        if not transports:
+            raise ValueError("at least one transport is required")
+        self.transports = transports
+        self.stats = [ShardStats(max_concurrent_streams) for _ in transports]
+        self._next = 0
+
+    def _pick(self) -> int:
+        n = len(self.transports)
+        order = [(self._next + i) % n for i in range(n)]
+        index = min(order, key=lambda i: self.stats[i].in_flight)
+        self._next = (index + 1) % n
+        return index
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        index = self._pick()
+        stats = self.stats[index]
+        stats.requests += 1
+        stats._update(+1)
+        try:
+            response = await self.transports[index].handle_async_request(
+                request
+            )
+        except BaseException:
+            stats._update(-1)
+            raise
+        if response.is_closed:  # body already read, e.g. by a mock
+            stats._update(-1)
+            return response
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _TrackedStream(
+            response.stream, lambda: stats._update(-1)
+        )
+        return response
+
+    async def aclose(self) -> None:
+        for transport in self.transports:
+            await transport.aclose()
+
+
+THROTTLE_STATUS_CODES = frozenset({402, 429})
+"""HTTP status codes treated as throttling."""
+THROTTLE_GRPC_STATUSES = frozenset({8, 14})
+"""`RESOURCE_EXHAUSTED` and `UNAVAILABLE` gRPC statuses."""
+
+
+def _grpc_status(data: bytes) -> int | None:
+    start = data.rfind(b"grpc-status:")
+    if start == -1:
+        return None
+    digits = data[start + 12 :].split(b"\r\n", 1)[0].strip()
+    return int(digits) if digits.isdigit() else None
+
+
+def _outcome(status_code: int, grpc_status: int | None) -> Outcome:
+    if status_code in THROTTLE_STATUS_CODES:
+        return "throttled"
+    if grpc_status in THROTTLE_GRPC_STATUSES:
+        return "throttled"
+    if status_code >= 400 or grpc_status not in (None, 0):
+        return "error"
+    return "ok"
+
+
+def _retry_after(headers: httpx.Headers) -> float | None:
+    try:
+        return float(headers["retry-after"])
+    except (KeyError, ValueError):
+        return None
+
+
+class RateControlTransport(httpx.AsyncBaseTransport):
+    """Applies the per-endpoint rate and concurrency limits of a
+    [fr24.ratelimit.RateController][] to every request.
+
+    A response is *throttled* if its HTTP status is 402 or 429, or if its
+    gRPC status (in the headers, or in the trailers at the end of a gRPC-web
+    body) is `RESOURCE_EXHAUSTED` or `UNAVAILABLE`. Throttled responses halve
+    the concurrency limit of the endpoint and pause its token bucket for
+    `Retry-After` seconds (1s by default). Healthy responses slowly raise
+    the concurrency limit again.
+    """
+
+    def __init__(
+        self, transport: httpx.AsyncBaseTransport, controller: RateController
+    ) -> None:
+        self.transport = transport
+        self.controller = controller
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        control = self.controller.endpoint(request.url.path.rsplit("/", 1)[-1])
+        await control.acquire()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException:
+            control.release("error", None)
+            raise
+        header_status = response.headers.get("grpc-status")
+        grpc_status = (
+            int(header_status)
+            if header_status is not None and header_status.isdigit()
+            else None
+        )
+        retry_after = _retry_after(response.headers)
+        if response.is_closed:  # body already read, e.g. by a mock
+            if grpc_status is None:
+                grpc_status = _grpc_status(response.content[-256:])
+            control.release(
+                _outcome(response.status_code, grpc_status), retry_after
+            )
+            return response
+
+        tail = bytearray()
+
+        def on_chunk(chunk: bytes) -> None:
+            tail.extend(chunk)
+            del tail[:-256]
+
+        def on_close() -> None:
+            status = grpc_status
+            if status is None:
+                status = _grpc_status(bytes(tail))
+            control.release(_outcome(response.status_code, status), retry_after)
+
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        response.stream = _TrackedStream(response.stream, on_close, on_chunk)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import asyncio
 import json
 from datetime import datetime, timezone
 from pathlib import Path
@@ -13,7 +12,7 @@ from textual.binding import Binding
 from textual.containers import ScrollableContainer
 from textual.widgets import DataTable, Footer, Header, Input, Label, Static
 
-from fr24 import FR24
+from fr24 import FR24, RateController
 from fr24.tui.formatters import Time, fmt_aircraft, fmt_airport, fmt_status
 from fr24.tui.widgets import AircraftWidget, AirportWidget, FlightWidget
 from fr24.types import IntoTimestamp
@@ -23,6 +22,13 @@ from fr24.utils import UnwrapError, get_current_timestamp, to_unix_timestamp
 
 T = TypeVar("T")
 
+FLIGHT_LIST_RATE = 0.5
+"""Flight list requests per second: the endpoint answers bursts with 402."""
+FLIGHT_LIST_RETRIES = 3
+FLIGHT_LIST_BACKOFF = 10.0
+"""Seconds the flight list endpoint is backed off after the first 402,
+doubled after each subsequent one."""
+
 
 def flatten(*args: list[T]) -> Iterator[T]:
     for elt in args:
@@ -55,7 +61,10 @@ class FR24Tui(App[None]):
     line_info: dict[str, str] = {}  # noqa: RUF012
 
     def compose(self) -> ComposeResult:
-        self.fr24 = FR24()
+        self.rate_control = RateController(
+            rates={"list.json": FLIGHT_LIST_RATE}
+        )
+        self.fr24 = FR24(rate_control=self.rate_control)
         self.search_visible = True
         yield Header()
         yield Footer()
@@ -233,25 +242,8 @@ class FR24Tui(App[None]):
             )
             flight_lists: list[FlightList] = []
             for value in flight_numbers:
-                try:
-                    res_obj = await self.fr24.flight_list.fetch(
-                        flight=value, limit=10, timestamp=ts
-                    )
-                    res = res_obj.to_dict()
-                except UnwrapError as exc:
-                    err = exc.err
-                    if (
-                        isinstance(err, httpx.HTTPStatusError)
-                        and err.response.status_code == 402
-                    ):
-                        await asyncio.sleep(10)
-                        res_obj = await self.fr24.flight_list.fetch(
-                            flight=value, limit=10, timestamp=ts
-                        )
-                        res = res_obj.to_dict()
-                    else:
-                        raise exc
-
+                # lookups are paced by the rate controller
+                res = await self.fetch_flight_list(value, ts)
                 flight_lists.append(res)
 
                 compacted_view = list(
@@ -282,13 +274,38 @@ class FR24Tui(App[None]):
                     key=by_departure_time,
                 )
                 self.update_table(compacted_view)
-
-                await asyncio.sleep(2)
         except UnwrapError as e:
             self.notify(f"Error: {e}", severity="error", title="API Error")
         finally:
             self.set_loading(False)
 
+    async def fetch_flight_list(
+        self, value: str, ts: TimestampS[int]
+    ) -> FlightList:
+        backoff = FLIGHT_LIST_BACKOFF
+        retries = FLIGHT_LIST_RETRIES
+        while True:
+            try:
+                result = await self.fr24.flight_list.fetch(
+                    flight=value, limit=10, timestamp=ts
+                )
+                return result.to_dict()
+            except UnwrapError as exc:
+                err = exc.err.err()  # the `Err` result holds the exception
+                if (
+                    retries == 0
+                    or not isinstance(err, httpx.HTTPStatusError)
+                    or err.response.status_code != 402
+                ):
+                    raise
+                # the controller's own penalty is too short for a 402: drain
+                # the bucket further, the retry waits for it in `acquire`
+                bucket = self.rate_control.endpoint("list.json").bucket
+                assert bucket is not None
+                bucket.penalise(backoff)
+                backoff *= 2
+                retries -= 1
+
     async def lookup_arrival(
         self, value: str, ts: IntoTimestamp | Literal["now"]
     ) -> None:
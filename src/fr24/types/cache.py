@@ -212,6 +212,16 @@ class FlightRecord(TypedDict):
 
 live_feed_schema = to_schema(FlightRecord)
 
+DeltaOp = Literal["added", "removed", "changed"]
+
+
+class FlightDeltaRecord(FlightRecord):
+    op: Annotated[DeltaOp, DType(pl.Enum(["added", "removed", "changed"]))]
+    """Rows with `removed` only have `flightid` set."""
+
+
+live_feed_delta_schema = to_schema(FlightDeltaRecord)
+
 
 class NearbyFlightRecord(FlightRecord):
     distance: Annotated[DistanceM[int], DType(pl.UInt32())]
@@ -367,4 +377,16 @@ class PlaybackFlightRecord(
 
 
 playback_flight_schema = to_schema(PlaybackFlightRecord)
+
+
+class FollowFlightRecord(_FlightInfoRecord):
+    """The position of a followed flight in an update, see
+    [fr24.follow.FollowFlightWriter][]."""
+
+    server_time_ms: Annotated[
+        TimestampMs[int], DType(pl.Datetime("ms", time_zone="UTC"))
+    ]
+
+
+follow_flight_schema = to_schema(FollowFlightRecord)
 TabularFileFmt = Literal["parquet", "csv"]  # TODO: support ndjson
@@ -30,6 +30,8 @@ from typing_extensions import (
     runtime_checkable,
 )
 
+from .tracing import span
+
 dataclass_opts: dict[str, bool] = {}
 if sys.version_info >= (3, 10):
     dataclass_opts["slots"] = True
@@ -52,7 +54,7 @@ if TYPE_CHECKING:
 
     _D = TypeVar("_D")
 
-    @dataclass_transform(frozen_default=True)
+    @dataclass_transform(frozen_default=True, field_specifiers=(field,))
     def dataclass_frozen(cls: type[_D]) -> type[_D]: ...
 else:
     dataclass_frozen = dataclass(**dataclass_opts)
@@ -244,25 +246,28 @@ def write_table(
         an appropriate suffix if it is a [BarePath][fr24.utils.BarePath].
     """
 
-    if isinstance(file, BarePath):
-        file = format_bare_path(file, format)
-    if isinstance(file, str):
-        file = Path(file)
-    if isinstance(file, Path):
-        _handle_existing_file(file, when_file_exists)
-        file.parent.mkdir(parents=True, exist_ok=True)
-
-    data = result.to_polars()
-    if format == "parquet":
-        # NOTE: saving metadata with polars is not yet implemented
-        # this means that useful unstructured metadata (e.g. flight details)
-        # cannot be saved without extra pyarrow dependency
-        # https://github.com/pola-rs/polars/issues/5117
-        data.write_parquet(file, **kwargs)
-    elif format == "csv":
-        data.write_csv(file, **kwargs)
-    else:
-        raise ValueError(f"unsupported format: `{format}`")
+    with span("write_table", format=format):
+        if isinstance(file, BarePath):
+            file = format_bare_path(file, format)
+        if isinstance(file, str):
+            file = Path(file)
+        if isinstance(file, Path):
+            with span("_handle_existing_file"):
+                _handle_existing_file(file, when_file_exists)
+            file.parent.mkdir(parents=True, exist_ok=True)
+
+        data = result.to_polars()
+        with span(f"write_{format}", rows=data.height):
+            if format == "parquet":
+                # NOTE: saving metadata with polars is not yet implemented
+                # this means that useful unstructured metadata (e.g. flight
+                # details) cannot be saved without extra pyarrow dependency
+                # https://github.com/pola-rs/polars/issues/5117
+                data.write_parquet(file, **kwargs)
+            elif format == "csv":
+                data.write_csv(file, **kwargs)
+            else:
+                raise ValueError(f"unsupported format: `{format}`")
     logger.info(f"wrote {data.height} rows to `{file}`")
 
 
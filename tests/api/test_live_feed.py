@@ -5,7 +5,13 @@ import httpx
 import pytest
 from google.protobuf.json_format import MessageToDict
 
-from fr24 import BBOX_FRANCE_UIR, BBOXES_WORLD_STATIC, FR24, FR24Cache
+from fr24 import (
+    BBOX_FRANCE_UIR,
+    BBOXES_WORLD_STATIC,
+    FR24,
+    FR24Cache,
+    TransportProfile,
+)
 from fr24.grpc import (
     BoundingBox,
     LiveFeedParams,
@@ -13,7 +19,7 @@ from fr24.grpc import (
     live_feed,
     live_feed_playback,
 )
-from fr24.proto import parse_data
+from fr24.proto import parse_data, supported_encodings
 from fr24.proto.headers import get_grpc_headers
 from fr24.proto.v1_pb2 import Flight, LiveFeedResponse, PlaybackResponse
 
@@ -75,6 +81,25 @@ async def test_live_feed_live_france(fr24: FR24) -> None:
     assert df.height == len_proto
 
 
+@pytest.mark.anyio
+async def test_live_feed_live_france_compressed() -> None:
+    profile = TransportProfile(grpc_compression=True)
+    async with FR24(profile=profile) as fr24:
+        result = await fr24.live_feed.fetch(BBOX_FRANCE_UIR)
+    encoding = result.response.headers.get("grpc-encoding", "identity")
+    assert encoding in (*supported_encodings(), "identity")
+    assert len(result.to_proto().flights_list) > 10
+
+
+@pytest.mark.anyio
+async def test_live_feed_world(fr24: FR24) -> None:
+    result = await fr24.live_feed.fetch_world("half_hourly", max_concurrency=4)
+    assert all(tile.num_flights > 0 for tile in result.tiles)
+    df = result.to_polars()
+    assert df.height > 100
+    assert df["flightid"].is_unique().all()
+
+
 @pytest.mark.anyio
 async def test_live_feed_playback_france(fr24: FR24) -> None:
     yesterday = int(time.time() - 86400)
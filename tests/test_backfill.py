@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import httpx
+import polars as pl
+import pytest
+
+from fr24 import FR24, FR24Cache
+from fr24.backfill import backfill_live_feed
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import (
+    Flight,
+    LiveFeedResponse,
+    PlaybackRequest,
+    PlaybackResponse,
+)
+from fr24.utils import format_bare_path
+
+
+@pytest.mark.anyio
+async def test_backfill_live_feed_resume(tmp_path: Path) -> None:
+    requests: list[tuple[int, float]] = []
+    fail = {(1800, 0.0)}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = PlaybackRequest.FromString(request.content[5:])
+        west = message.live_feed_request.bounds.west
+        requests.append((message.timestamp, west))
+        if (message.timestamp, west) in fail:
+            return httpx.Response(500)
+        flightid = message.timestamp * 10 + int(west >= 0)
+        flight = Flight(flightid=flightid, lat=0, lon=west + 1)
+        response = PlaybackResponse(
+            live_feed_response=LiveFeedResponse(
+                flights_list=[flight], server_time_ms=1
+            )
+        )
+        return httpx.Response(200, content=encode_message(response))
+
+    cache = FR24Cache(tmp_path)
+    lngs = [-180.0, 0.0, 180.0]
+    transport = httpx.MockTransport(handler)
+    async with FR24(httpx.AsyncClient(transport=transport)) as fr24:
+        summary = await backfill_live_feed(
+            fr24, cache, 1740, 1860, step=60, area=lngs, rate=1000
+        )
+        assert summary == (1, 0, 1)
+        assert len(requests) == 4
+
+        fail.clear()
+        requests.clear()
+        summary = await backfill_live_feed(
+            fr24, cache, 1740, 1860, step=60, area=lngs, rate=1000
+        )
+        assert summary == (1, 1, 0)
+        # only the failed tile is refetched
+        assert requests == [(1800, 0.0)]
+
+    for ts in (1740, 1800):
+        df = pl.read_parquet(
+            format_bare_path(cache.live_feed.get_path(ts), "parquet")
+        )
+        assert df.height == 2
+    assert not (tmp_path / "live_feed_backfill" / "1800").exists()
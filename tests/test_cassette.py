@@ -0,0 +1,76 @@
+import asyncio
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24, BoundingBox
+from fr24.cassette import (
+    Cassette,
+    CassetteMissError,
+    RecordingTransport,
+    ReplayTransport,
+)
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+
+
+class SlowStream(httpx.AsyncByteStream):
+    async def __aiter__(self):  # type: ignore[no-untyped-def]
+        yield b"\x00\x00\x00\x00\x00"
+        await asyncio.sleep(0.1)
+        yield b"\x80\x00\x00\x00\x0egrpc-status:0\r\n"
+
+
+@pytest.mark.anyio
+async def test_record_replay(tmp_path: Path) -> None:
+    polls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal polls
+        if request.url.path.endswith("FollowFlight"):
+            return httpx.Response(200, stream=SlowStream())
+        polls += 1
+        message = LiveFeedResponse(
+            flights_list=[Flight(flightid=polls)], server_time_ms=1000
+        )
+        return httpx.Response(200, content=encode_message(message))
+
+    bbox = BoundingBox(-90, 90, -180, 180)
+    recorder = RecordingTransport(
+        httpx.MockTransport(handler), Cassette(tmp_path)
+    )
+    async with FR24(httpx.AsyncClient(transport=recorder)) as fr24:
+        recorded = [await fr24.live_feed.fetch(bbox) for _ in range(2)]
+        async with fr24.http.client.stream(
+            "POST", "https://example.com/FollowFlight", content=b"x"
+        ) as response:
+            stream = b"".join([c async for c in response.aiter_raw()])
+
+    cassette = Cassette(tmp_path)  # reloaded from disk
+    assert len(cassette) == 3
+    replay = ReplayTransport(cassette, speed=1.0)
+    async with FR24(httpx.AsyncClient(transport=replay)) as fr24:
+        replayed = [await fr24.live_feed.fetch(bbox) for _ in range(2)]
+        start = time.perf_counter()
+        async with fr24.http.client.stream(
+            "POST", "https://example.com/FollowFlight", content=b"x"
+        ) as response:
+            assert b"".join([c async for c in response.aiter_raw()]) == stream
+        assert time.perf_counter() - start >= 0.08  # chunk timing kept
+
+        with pytest.raises(CassetteMissError):
+            await fr24.live_feed.fetch(bbox)  # only two were recorded
+        with pytest.raises(CassetteMissError):
+            await fr24.live_feed.fetch(BoundingBox(0, 1, 0, 1))
+
+    for a, b in zip(recorded, replayed):
+        assert a.response.content == b.response.content
+    assert replayed[1].to_polars()["flightid"].to_list() == [2]
+
+    replay = ReplayTransport(cassette, repeat=True)
+    async with FR24(httpx.AsyncClient(transport=replay)) as fr24:
+        for _ in range(3):
+            result = await fr24.live_feed.fetch(bbox)
+    assert result.to_polars()["flightid"].to_list() == [2]
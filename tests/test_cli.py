@@ -0,0 +1,15 @@
+from typer.testing import CliRunner
+
+from fr24.cli import app
+
+
+def test_cli_help() -> None:
+    # the commands are built from the service signatures on import
+    runner = CliRunner()
+    result = runner.invoke(app, ["--help"])
+    assert result.exit_code == 0, result.output
+    for command in app.registered_commands:
+        assert command.callback is not None
+        name = command.name or command.callback.__name__.replace("_", "-")
+        result = runner.invoke(app, [name, "--help"])
+        assert result.exit_code == 0, (name, result.output)
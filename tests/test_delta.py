@@ -0,0 +1,70 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from fr24 import FR24Cache
+from fr24.delta import DeltaEncoder, apply_delta, diff_snapshots, state_at
+from fr24.types.cache import live_feed_schema
+
+
+def snapshot(rows: dict[int, tuple[float, int]]) -> pl.DataFrame:
+    data = pl.DataFrame(
+        {
+            "flightid": list(rows),
+            "latitude": [lat for lat, _ in rows.values()],
+            "altitude": [alt for _, alt in rows.values()],
+        }
+    )
+    return pl.concat(
+        [pl.DataFrame(schema=live_feed_schema), data], how="diagonal_relaxed"
+    ).cast(live_feed_schema)  # type: ignore[arg-type]
+
+
+def test_diff_snapshots_thresholds() -> None:
+    prev = snapshot({1: (10.0, 1000), 2: (20.0, 2000), 3: (30.0, 3000)})
+    curr = snapshot({1: (10.00001, 1000), 2: (20.0, 2100), 4: (40.0, 4000)})
+
+    delta = diff_snapshots(prev, curr)
+    assert delta["flightid"].to_list() == [1, 2, 3, 4]
+    assert delta["op"].to_list() == ["changed", "changed", "removed", "added"]
+    assert apply_delta(prev, delta).equals(curr)
+
+    delta = diff_snapshots(prev, curr, thresholds={"latitude": 1e-3})
+    assert delta["flightid"].to_list() == [2, 3, 4]
+    delta = diff_snapshots(
+        prev, curr, thresholds={"latitude": 1e-3, "altitude": 100}
+    )
+    assert delta["flightid"].to_list() == [3, 4]
+
+
+def test_delta_encoder_no_drift() -> None:
+    encoder = DeltaEncoder(keyframe_interval=100, thresholds={"altitude": 100})
+    encoder.encode(snapshot({1: (0.0, 0)}), 0)
+    # 50ft per step: each below the threshold, but not cumulatively
+    for i in range(1, 5):
+        encoder.encode(snapshot({1: (0.0, 50 * i)}), i)
+        assert encoder.state is not None
+        assert abs(encoder.state["altitude"][0] - 50 * i) <= 100
+
+
+def test_state_at_roundtrip(tmp_path: Path) -> None:
+    cache = FR24Cache(tmp_path)
+    snapshots = [
+        snapshot({1: (10.0, 1000), 2: (20.0, 2000)}),
+        snapshot({1: (10.5, 1000), 2: (20.0, 2000)}),
+        snapshot({2: (20.0, 2500)}),
+        snapshot({2: (20.0, 2500), 3: (30.0, 3000)}),
+        snapshot({1: (11.0, 1200), 3: (30.0, 3000)}),
+    ]
+    encoder = DeltaEncoder(keyframe_interval=3)
+    written = [encoder.encode(df, 100 + i) for i, df in enumerate(snapshots)]
+    assert [d.keyframe for d in written] == [True, False, False, True, False]
+    for d in written:
+        d.write_table(cache)
+
+    for i, df in enumerate(snapshots):
+        assert state_at(cache, 100 + i).equals(df)
+    assert state_at(cache, 1000).equals(snapshots[-1])
+    with pytest.raises(FileNotFoundError):
+        state_at(cache, 99)
@@ -0,0 +1,218 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24
+from fr24.follow import (
+    FollowFlightHub,
+    FollowFlightSession,
+    FollowFlightWriter,
+    scan_follow_flight,
+)
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import (
+    DataSource,
+    EMSInfo,
+    ExtendedFlightInfo,
+    FollowFlightResponse,
+    TrailPoint,
+)
+
+
+def make_update(trail: range, live: int = 0) -> FollowFlightResponse:
+    return FollowFlightResponse(
+        flight_info=ExtendedFlightInfo(
+            flightid=1,
+            lat=1.0,
+            timestamp_ms=live * 1000 + 500 if live else 0,
+        ),
+        flight_trail_list=[
+            TrailPoint(snapshot_id=t, lat=t / 10, source=DataSource.MLAT)
+            for t in trail
+        ],
+    )
+
+
+def test_follow_flight_session() -> None:
+    session = FollowFlightSession()
+    first = session.update(make_update(range(100, 110), live=112))
+    assert [p["timestamp"] for p in first] == [*range(100, 110), 112]
+    assert first[-1]["source"] is None
+
+    # repeated trail: only the new points are materialised
+    second = session.update(make_update(range(100, 112)))
+    assert [(p["timestamp"], p["source"]) for p in second] == [
+        (110, 1),
+        (111, 1),
+    ]
+    df = session.to_polars()
+    assert df["timestamp"].to_list() == list(range(100, 113))  # sorted
+    assert df["source"].null_count() == 1
+
+    assert session.update(make_update(range(0), live=112)) == []  # same
+    assert session.update(make_update(range(0), live=113)) != []
+    assert session.to_polars()["timestamp"].to_list() == list(range(100, 114))
+    assert df.height == 13  # earlier frames are not modified
+    assert len(session) == 14
+
+
+def test_follow_flight_session_live_only() -> None:
+    session = FollowFlightSession(include_live=False)
+    assert session.update(make_update(range(0), live=5)) == []
+    assert session.to_polars().is_empty()
+
+
+class FollowStream(httpx.AsyncByteStream):
+    closed = 0
+
+    def __init__(self, updates: int) -> None:
+        self.updates = updates
+
+    async def __aiter__(self):  # type: ignore[no-untyped-def]
+        try:
+            for i in range(self.updates):
+                yield encode_message(make_update(range(i + 1)))
+                await asyncio.sleep(0.01)
+            yield b"\x80\x00\x00\x00\x0fgrpc-status:0\r\n"
+        finally:
+            FollowStream.closed += 1
+
+
+@pytest.mark.anyio
+async def test_follow_flight_hub() -> None:
+    connections = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal connections
+        connections += 1
+        return httpx.Response(200, stream=FollowStream(5))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        hub = FollowFlightHub(fr24.follow_flight)
+        a = hub.subscribe(1, policy="block")
+        b = hub.subscribe("1", maxsize=1)  # same flight, never consumed
+        received = [len(r.to_proto().flight_trail_list) async for r in a]
+        assert received == [1, 2, 3, 4, 5]
+        assert connections == 1 and hub.flight_ids == []
+        assert b.dropped == 5  # only the end of the stream is kept
+        assert [r async for r in b] == []
+
+        # the upstream closes when the last subscriber leaves
+        closed = FollowStream.closed
+        async with hub.subscribe(2) as c:
+            first = await c.__anext__()
+            async with hub.subscribe(2) as d:
+                late = await d.__anext__()
+                assert late is first  # replayed to late subscribers
+            assert hub.flight_ids == [2]
+        assert hub.flight_ids == []
+        await asyncio.sleep(0)
+        assert FollowStream.closed == closed + 1
+        assert connections == 2
+
+
+class SlowCloseStream(FollowStream):
+    async def aclose(self) -> None:
+        await asyncio.sleep(0.05)
+
+
+@pytest.mark.anyio
+async def test_follow_flight_hub_errors() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("unreachable", request=request)
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        hub = FollowFlightHub(fr24.follow_flight)
+        a, b = hub.subscribe(1), hub.subscribe(1)
+        errors = []
+        for subscription in (a, b):
+            with pytest.raises(RuntimeError) as exc_info:
+                await subscription.__anext__()
+            assert isinstance(exc_info.value.__cause__, httpx.ConnectError)
+            errors.append(exc_info.value)
+        assert errors[0] is not errors[1]
+
+
+@pytest.mark.anyio
+async def test_follow_flight_hub_cancelled_unsubscribe() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=SlowCloseStream(100))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        hub = FollowFlightHub(fr24.follow_flight)
+        subscription = hub.subscribe(1)
+        await subscription.__anext__()
+        # cancelling the caller while the upstream closes is not swallowed
+        task = asyncio.ensure_future(subscription.aclose())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_follow_flight_writer(tmp_path: Path) -> None:
+    def update(flight_id: int, t: int) -> FollowFlightResponse:
+        return FollowFlightResponse(
+            flight_info=ExtendedFlightInfo(
+                flightid=flight_id,
+                timestamp_ms=t * 1000,
+                ems_info=EMSInfo(ias=t),
+            )
+        )
+
+    with FollowFlightWriter(tmp_path, max_rows=3) as writer:
+        for t in range(5):
+            writer.append(update(0xA, t))
+            writer.append(update(0xB, t))
+        # the first three updates of each flight are already on disk
+        assert len(list(writer.flight_path(0xA).glob("*.parquet"))) == 1
+        assert scan_follow_flight(tmp_path, "a").collect().height == 3
+    df = scan_follow_flight(tmp_path, 0xA).collect()
+    assert df["ems"].struct.field("ias").to_list() == [0, 1, 2, 3, 4]
+    assert df["flightid"].unique().to_list() == [0xA]
+
+    # parts continue after a restart, stray temporary files are ignored
+    (writer.flight_path(0xA) / "000009.tmp").write_bytes(b"torn")
+    with FollowFlightWriter(tmp_path, max_interval=0) as writer:
+        writer.append(update(0xA, 5))
+    assert sorted(p.name for p in writer.flight_path(0xA).iterdir()) == [
+        "000000.parquet",
+        "000001.parquet",
+        "000002.parquet",
+        "000009.tmp",
+    ]
+    assert scan_follow_flight(tmp_path, 0xA).collect().height == 6
+    assert scan_follow_flight(tmp_path, 0xC).collect().is_empty()
+
+
+def test_follow_flight_writer_flush_stale(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    now = 0.0
+    monkeypatch.setattr("fr24.follow.time.monotonic", lambda: now)
+
+    def update(flight_id: int) -> FollowFlightResponse:
+        return FollowFlightResponse(
+            flight_info=ExtendedFlightInfo(flightid=flight_id)
+        )
+
+    with FollowFlightWriter(tmp_path, max_interval=10) as writer:
+        writer.append(update(0xA))
+        now = 5.0
+        writer.append(update(0xB))
+        # a flight that stopped updating is flushed on another's append
+        now = 12.0
+        writer.append(update(0xB))
+        assert scan_follow_flight(tmp_path, 0xA).collect().height == 1
+        assert scan_follow_flight(tmp_path, 0xB).collect().is_empty()
+        now = 20.0
+        writer.flush_stale()
+        assert scan_follow_flight(tmp_path, 0xB).collect().height == 2
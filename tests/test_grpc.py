@@ -0,0 +1,402 @@
+import asyncio
+
+import httpx
+import polars as pl
+import pytest
+
+from fr24 import FR24, TransportProfile
+from fr24.grpc import (
+    BoundingBox,
+    LiveFeedPlaybackParams,
+    PreparedCall,
+    construct_request,
+    live_feed_df,
+    live_feed_flightdata_dict,
+    live_feed_wire_df,
+    nearest_flights_df,
+    nearest_flights_nearbyflight_dict,
+)
+from fr24.proto import (
+    GrpcError,
+    GrpcFrameDecoder,
+    GrpcStatus,
+    ProtoParseError,
+    encode_message,
+    iter_frames,
+    parse_data,
+    parse_messages,
+    supported_encodings,
+)
+from fr24.proto.headers import get_grpc_headers
+from fr24.proto.v1_pb2 import (
+    DataSource,
+    ExtendedFlightInfo,
+    ExtraFlightInfo,
+    Flight,
+    FollowFlightRequest,
+    FollowFlightResponse,
+    LiveFeedResponse,
+    LiveFlightsStatusRequest,
+    LiveFlightsStatusResponse,
+    LiveFlightStatus,
+    LiveFlightStatusData,
+    NearbyFlight,
+    NearestFlightsResponse,
+    PlaybackRequest,
+    PositionBuffer,
+    RecentPosition,
+    Route,
+    Schedule,
+)
+from fr24.types.cache import live_feed_schema, nearest_flights_schema
+from fr24.types.grpc import LiveFeedField
+
+
+def make_flights(n: int) -> list[Flight]:
+    return [
+        Flight(
+            flightid=i,
+            lat=22.3 + i,
+            lon=113.9 - i,
+            track=i % 360,
+            alt=1000 * i,
+            speed=450,
+            callsign=f"CPA{i}",
+            source=DataSource.MLAT,
+            timestamp_ms=1_700_000_000_000 + i,
+            extra_info=ExtraFlightInfo(
+                reg="B-HUJ",
+                route=Route(**{"from": "HKG", "to": "CDG"}),
+                type="B744",
+                schedule=Schedule(eta=1_700_003_000),
+                squawk=1234,
+                vspeed=-64,
+            ),
+            position_buffer=PositionBuffer(
+                recent_positions_list=[
+                    RecentPosition(delta_lat=-j, delta_lon=j, delta_ms=j * 500)
+                    for j in range(i % 4)
+                ]
+            ),
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("n", [0, 1, 10])
+def test_live_feed_df_columnar(n: int) -> None:
+    data = LiveFeedResponse(flights_list=make_flights(n))
+    expected = pl.DataFrame(
+        [live_feed_flightdata_dict(lfr) for lfr in data.flights_list],
+        schema=live_feed_schema,
+    )
+    assert live_feed_df(data).equals(expected)
+
+
+@pytest.mark.parametrize("n", [0, 10])
+def test_nearest_flights_df_columnar(n: int) -> None:
+    data = NearestFlightsResponse(
+        flights_list=[
+            NearbyFlight(flight=flight, distance=i)
+            for i, flight in enumerate(make_flights(n))
+        ]
+    )
+    expected = pl.DataFrame(
+        [nearest_flights_nearbyflight_dict(nf) for nf in data.flights_list],
+        schema=nearest_flights_schema,
+    )
+    df = nearest_flights_df(data)
+    assert df.schema == expected.schema
+    assert df.equals(expected)
+
+
+@pytest.mark.parametrize("n", [0, 1, 10])
+def test_live_feed_wire_df(n: int) -> None:
+    data = LiveFeedResponse(flights_list=make_flights(n))
+    df = live_feed_wire_df(data.SerializeToString())
+    assert df.equals(live_feed_df(data))
+
+
+def test_live_feed_wire_df_field_mask() -> None:
+    message = LiveFeedResponse(flights_list=make_flights(3))
+    df = live_feed_wire_df(message.SerializeToString(), ["flight", "route"])
+    assert df["origin"].to_list() == ["HKG"] * 3
+    assert df["registration"].to_list() == [""] * 3
+    assert df["squawk"].to_list() == [0] * 3
+
+
+def test_live_feed_wire_df_fallback() -> None:
+    data = LiveFeedResponse(flights_list=make_flights(2))
+    # an empty group (deprecated wire types 3 and 4) in field 7
+    message = data.SerializeToString() + bytes([(7 << 3) | 3, (7 << 3) | 4])
+    assert live_feed_wire_df(message).equals(live_feed_df(data))
+
+
+def test_prepared_call_reuses_body() -> None:
+    headers = httpx.Headers({"content-type": "application/grpc-web+proto"})
+    call: PreparedCall[PlaybackRequest] = PreparedCall("Playback", headers)
+    fields: set[LiveFeedField] = {"flight"}
+    params = LiveFeedPlaybackParams(
+        BoundingBox(-90, 90, -180, 180), fields=fields, timestamp=1800
+    )
+    request = call.build_request(params)
+    expected = construct_request("Playback", params.to_proto(), headers)
+    assert request.url == expected.url
+    assert request.content == expected.content
+    call.build_request(params)
+    assert call.encodes == 1
+
+    params.timestamp = 1860
+    assert call.build_request(params).content != expected.content
+    fields.add("reg")  # mutated in place
+    call.build_request(params)
+    assert call.encodes == 3
+
+    params.timestamp = "now"
+    call.build_request(params)
+    call.build_request(params)
+    assert call.encodes == 5
+
+
+@pytest.mark.parametrize("encoding", ["gzip", "deflate", "zstd"])
+def test_grpc_compression(encoding: str) -> None:
+    message = LiveFeedResponse(flights_list=make_flights(50))
+    frame = encode_message(message, encoding)  # type: ignore[arg-type]
+    assert frame[0] == 1
+    assert len(frame) < len(encode_message(message))
+    for declared in (encoding, None):  # from the header, or guessed
+        parsed = parse_data(frame, LiveFeedResponse, encoding=declared)
+        assert parsed.unwrap() == message
+
+    corrupt = frame[:5] + b"garbage"
+    assert isinstance(parse_data(corrupt, LiveFeedResponse).err(), GrpcError)
+
+
+def test_grpc_compression_headers() -> None:
+    # compression is opt-in
+    assert "grpc-accept-encoding" not in get_grpc_headers(auth=None)
+    assert "grpc-accept-encoding" not in FR24().http.grpc_headers
+    headers = get_grpc_headers(auth=None, accept_encoding=supported_encodings())
+    assert headers["grpc-accept-encoding"] == ",".join(
+        [*supported_encodings(), "identity"]
+    )
+    fr24 = FR24(profile=TransportProfile(grpc_compression=True))
+    assert (
+        fr24.http.grpc_headers["grpc-accept-encoding"]
+        == headers["grpc-accept-encoding"]
+    )
+
+    message = LiveFeedResponse(flights_list=make_flights(2))
+    request = construct_request(
+        "LiveFeed", message, httpx.Headers(headers), compression="gzip"
+    )
+    assert request.headers["grpc-encoding"] == "gzip"
+    assert parse_data(request.content, LiveFeedResponse).unwrap() == message
+
+
+def test_parse_messages() -> None:
+    first = LiveFeedResponse(flights_list=make_flights(2))
+    second = LiveFeedResponse(flights_list=make_flights(3))
+    trailers = b"grpc-status:0\r\ngrpc-message:\r\n"
+    body = (
+        encode_message(first)
+        + encode_message(second, "gzip")
+        + b"\x80"
+        + len(trailers).to_bytes(4, "big")
+        + trailers
+    )
+    frames = list(iter_frames(body))
+    assert [f.flags for f in frames] == [0, 1, 0x80]
+    assert all(f.data.obj is body for f in frames)  # views, not copies
+
+    result = parse_messages(body, LiveFeedResponse).unwrap()
+    assert result.messages == [first, second]
+    assert result.status == GrpcStatus(0, b"", None) and result.status.ok
+    assert parse_data(body, LiveFeedResponse).unwrap() == first
+
+    no_trailers = parse_messages(
+        body[: len(encode_message(first))], LiveFeedResponse
+    )
+    assert no_trailers.unwrap().status is None
+    truncated = parse_messages(body[:-3], LiveFeedResponse)
+    assert isinstance(truncated.err(), ProtoParseError)
+
+
+def test_frame_decoder() -> None:
+    updates = [
+        FollowFlightResponse(flight_info=ExtendedFlightInfo(flightid=1, lat=i))
+        for i in range(3)
+    ]
+    trailers = b"grpc-status:5\r\ngrpc-message:not found\r\n"
+    body = (
+        b"".join(encode_message(u) for u in updates)
+        + b"\x80"
+        + len(trailers).to_bytes(4, "big")
+        + trailers
+    )
+    for size in (1, 3, 7, len(body)):  # frames split and coalesced
+        decoder = GrpcFrameDecoder()
+        frames = [
+            frame
+            for i in range(0, len(body), size)
+            for frame in decoder.feed(body[i : i + size])
+        ]
+        decoder.close()
+        assert [
+            parse_data(f, FollowFlightResponse).unwrap() for f in frames
+        ] == updates
+        assert decoder.trailers == trailers
+        assert decoder.status == GrpcStatus(5, b"not found", None)
+
+    decoder = GrpcFrameDecoder()
+    assert decoder.feed(body[:12]) == [encode_message(updates[0])]
+    assert decoder.pending == 12 - len(encode_message(updates[0]))
+    with pytest.raises(ProtoParseError):
+        decoder.close()
+
+    decoder = GrpcFrameDecoder()
+    decoder.close(httpx.Headers({"grpc-status": "7"}))  # trailers-only
+    assert decoder.status == GrpcStatus(7, None, None)
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, body: bytes, size: int) -> None:
+        self.body = body
+        self.size = size
+
+    async def __aiter__(self):  # type: ignore[no-untyped-def]
+        for i in range(0, len(self.body), self.size):
+            yield self.body[i : i + self.size]
+
+
+@pytest.mark.anyio
+async def test_follow_flight_stream_chunked() -> None:
+    updates = [
+        FollowFlightResponse(flight_info=ExtendedFlightInfo(flightid=1, lat=i))
+        for i in range(3)
+    ]
+    trailers = b"grpc-status:14\r\n"
+    body = (
+        b"".join(encode_message(u) for u in updates)
+        + b"\x80"
+        + len(trailers).to_bytes(4, "big")
+        + trailers
+    )
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=ChunkedStream(body, 4))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        results = []
+        with pytest.raises(GrpcError) as e:
+            async for result in fr24.follow_flight.stream(flight_id=1):
+                results.append(result.to_proto())
+    assert results == updates
+    assert e.value.status == 14
+
+
+@pytest.mark.anyio
+async def test_follow_flight_stream_many() -> None:
+    connections: dict[int, int] = {}
+    active = peak = 0
+
+    class FollowStream(httpx.AsyncByteStream):
+        def __init__(self, flight_id: int, attempt: int) -> None:
+            self.flight_id = flight_id
+            self.attempt = attempt
+
+        async def __aiter__(self):  # type: ignore[no-untyped-def]
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                for i in range(3):
+                    await asyncio.sleep(0.01)
+                    update = FollowFlightResponse(
+                        flight_info=ExtendedFlightInfo(
+                            flightid=self.flight_id, lat=i
+                        )
+                    )
+                    frame = encode_message(update)
+                    if self.flight_id == 2 and self.attempt == 1:
+                        yield frame[:-1]  # dropped within the first frame
+                        return
+                    yield frame
+                yield b"\x80\x00\x00\x00\x0fgrpc-status:0\r\n"
+            finally:
+                active -= 1
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = parse_data(request.content, FollowFlightRequest)
+        flight_id = message.unwrap().flight_id
+        connections[flight_id] = connections.get(flight_id, 0) + 1
+        return httpx.Response(
+            200, stream=FollowStream(flight_id, connections[flight_id])
+        )
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        updates: dict[int, list[float]] = {}
+        async for flight_id, result in fr24.follow_flight.stream_many(
+            [1, 2, "3", 1, "1"], max_streams=2, backoff=0.01
+        ):
+            assert result.to_proto().flight_info.flightid == flight_id
+            updates.setdefault(flight_id, []).append(
+                result.to_proto().flight_info.lat
+            )
+        assert updates == {i: [0, 1, 2] for i in (1, 2, 3)}
+        assert connections == {1: 1, 2: 2, 3: 1}
+        assert peak == 2
+
+        # closing the iterator early closes all open streams
+        stream = fr24.follow_flight.stream_many([4, 5])
+        await stream.__anext__()
+        assert active == 2
+        await stream.aclose()
+        assert active == 0
+
+
+@pytest.mark.anyio
+async def test_live_flights_status_chunked() -> None:
+    requests: list[list[int]] = []
+    active = peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        ids = parse_data(request.content, LiveFlightsStatusRequest).unwrap()
+        requests.append(list(ids.flight_ids_list))
+        second = len(requests)
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        message = LiveFlightsStatusResponse(
+            flights_map=[
+                LiveFlightStatus(
+                    flight_id=fid, data=LiveFlightStatusData(squawk=fid)
+                )
+                for fid in ids.flight_ids_list
+                if fid % 2 == 0  # others are not live
+            ]
+        )
+        headers = {"date": f"Thu, 01 Jan 1970 00:00:{second:02d} GMT"}
+        return httpx.Response(
+            200, content=encode_message(message), headers=headers
+        )
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        result = await fr24.live_flights_status.fetch_chunked(
+            [*range(1, 101), *range(1, 11)], chunk_size=30, max_concurrency=2
+        )
+    assert sorted(len(r) for r in requests) == [10, 30, 30, 30]
+    assert peak == 2
+    assert result.num_flight_ids == 100 and result.num_chunks == 4
+    assert result.timestamp == 1
+    df = result.to_polars()
+    assert df["flight_id"].to_list() == list(range(2, 101, 2))
+    assert df["squawk"].to_list() == list(range(2, 101, 2))
@@ -0,0 +1,66 @@
+import asyncio
+
+import httpx
+import pytest
+
+from fr24 import FR24
+from fr24.hedging import Hedger
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import LiveFeedResponse
+
+
+@pytest.mark.anyio
+async def test_hedger() -> None:
+    calls = 0
+    cancelled = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls, cancelled
+        calls += 1
+        try:
+            # every fifth request stalls, its hedge does not
+            await asyncio.sleep(1.0 if calls % 5 == 0 else 0.01)
+        except asyncio.CancelledError:
+            cancelled += 1
+            raise
+        message = LiveFeedResponse(server_time_ms=calls)
+        return httpx.Response(200, content=encode_message(message))
+
+    hedge = Hedger(0.5, budget=0.25, min_samples=3)
+    lngs = [-180, -90, 0, 90, 180]
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        for _ in range(3):
+            await fr24.live_feed.fetch_world(
+                lngs, max_concurrency=1, hedge=hedge
+            )
+
+    assert hedge.requests == 12
+    assert 1 <= hedge.hedges <= 0.25 * hedge.requests
+    assert hedge.hedge_wins == hedge.hedges == cancelled
+    assert calls == hedge.requests + hedge.hedges
+    assert max(hedge.latencies) < 0.5
+
+
+@pytest.mark.anyio
+async def test_hedger_falls_back_on_error() -> None:
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 2:  # the hedge fails, the original eventually succeeds
+            raise httpx.ConnectError("refused")
+        await asyncio.sleep(0.05 if calls == 1 else 0.0)
+        return httpx.Response(200, content=b"ok")
+
+    hedge = Hedger(0.5, budget=1.0, min_samples=1)
+    hedge.latencies.append(0.01)
+    async with httpx.AsyncClient(
+        transport=httpx.MockTransport(handler)
+    ) as client:
+        request = client.build_request("POST", "https://example.com/LiveFeed")
+        response = await hedge.send(client, request)
+    assert response.content == b"ok"
+    assert hedge.hedges == 1 and hedge.hedge_wins == 0
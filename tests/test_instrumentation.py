@@ -0,0 +1,124 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24, BoundingBox
+from fr24.instrumentation import (
+    Histogram,
+    PrometheusFileSink,
+    RequestEvent,
+    RequestHook,
+    request_event,
+)
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+
+
+class Collect(RequestHook):
+    def __init__(self) -> None:
+        self.responses: list[RequestEvent] = []
+        self.parses: list[tuple[str, float]] = []
+
+    def on_response(self, event: RequestEvent) -> None:
+        self.responses.append(event)
+
+    def on_parse(
+        self, event: RequestEvent, accessor: str, seconds: float
+    ) -> None:
+        self.parses.append((accessor, seconds))
+
+
+@pytest.mark.anyio
+async def test_instrumentation(tmp_path: Path) -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        # emulate the events emitted by httpcore
+        if (trace := request.extensions.get("trace")) is not None:
+            await trace("connection.connect_tcp.started", {})
+            await asyncio.sleep(0.02)
+            await trace("connection.connect_tcp.complete", {})
+            await trace("http2.send_request_headers.started", {})
+            await asyncio.sleep(0.02)
+            await trace("http2.receive_response_headers.complete", {})
+        message = LiveFeedResponse(
+            flights_list=[Flight(flightid=1), Flight(flightid=2)],
+            server_time_ms=1000,
+        )
+        return httpx.Response(200, content=encode_message(message))
+
+    collect = Collect()
+    sink = PrometheusFileSink(tmp_path / "fr24.prom", interval=3600)
+    bbox = BoundingBox(-90, 90, -180, 180)
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        result = await fr24.live_feed.fetch(bbox)
+        assert request_event(result.response) is None  # not installed yet
+
+        fr24.http.add_hook(collect)
+        fr24.http.add_hook(sink)
+        result = await fr24.live_feed.fetch(bbox)
+        assert result.to_polars().height == 2
+        result.to_polars()  # memoized: not reported again
+
+    (event,) = collect.responses
+    assert request_event(result.response) is event
+    assert event.endpoint == "LiveFeed"
+    assert event.status_code == 200 and event.grpc_status is None
+    assert event.connect is not None and event.connect >= 0.015
+    assert event.ttfb is not None and event.ttfb >= 0.015
+    assert event.total is not None and event.total >= 0.03
+    assert event.response_bytes == len(result.response.content)
+    assert event.rows == 2
+    assert [accessor for accessor, _ in collect.parses] == ["proto", "polars"]
+    assert event.parse["polars"] >= event.parse["proto"]
+
+    assert sink.histograms["LiveFeed", "ttfb"].count == 1
+    sink.flush()
+    text = (tmp_path / "fr24.prom").read_text()
+    assert (
+        'fr24_request_duration_seconds_count{endpoint="LiveFeed",'
+        'phase="parse_polars"} 1'
+    ) in text
+    assert 'fr24_rows_total{endpoint="LiveFeed"} 2' in text
+
+
+@pytest.mark.anyio
+async def test_instrumentation_stream_trailers() -> None:
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):  # type: ignore[no-untyped-def]
+            yield b"\x00\x00\x00\x00\x00"
+            yield b"\x80\x00\x00\x00\x10grpc-status:8\r\n"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, stream=Body())
+
+    collect = Collect()
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        fr24.http.add_hook(collect)
+        request = fr24.http.client.build_request(
+            "POST", "https://example.com/FollowFlight"
+        )
+        response = await fr24.http.client.send(request, stream=True)
+        assert not collect.responses
+        async for _ in response.aiter_raw():
+            pass
+        await response.aclose()
+
+    (event,) = collect.responses
+    assert event.endpoint == "FollowFlight"
+    assert event.grpc_status == 8
+    assert event.response_bytes == 5 + 5 + 15
+
+
+def test_histogram() -> None:
+    h = Histogram([1.0, 2.0, 4.0])
+    for value in (0.5, 1.5, 1.5, 3.0, 10.0):
+        h.observe(value)
+    assert h.counts == [1, 2, 1, 1]
+    assert h.count == 5 and h.mean == pytest.approx(3.3)
+    assert h.quantile(0.5) == pytest.approx(1.75)
+    assert h.quantile(0.99) == 4.0
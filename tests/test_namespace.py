@@ -0,0 +1,68 @@
+import polars as pl
+
+from fr24.namespace import ns
+from fr24.types.cache import live_feed_schema
+
+
+def test_squawk() -> None:
+    df = pl.DataFrame({"squawk": [3041, 0, 0o7700, 0o7777 + 1]})
+    assert df.select(ns(pl.col("squawk")).squawk())["squawk"].to_list() == [
+        "5741",
+        "0000",
+        "7700",
+        None,  # not a valid code
+    ]
+    # wider integers out of the range of the internal UInt16
+    df = pl.DataFrame(
+        {"squawk": [-1, 70000, 3041]}, schema={"squawk": pl.Int64}
+    )
+    assert df.select(ns(pl.col("squawk")).squawk())["squawk"].to_list() == [
+        None,
+        None,
+        "5741",
+    ]
+
+
+def test_expand_position_buffer() -> None:
+    columns = ("timestamp", "flightid", "latitude", "longitude")
+    df = pl.DataFrame(
+        {
+            "timestamp": [1753072999000, 1753072999000],
+            "flightid": [1, 2],
+            "latitude": [42.0, 1.0],
+            "longitude": [-3.0, 1.0],
+            "position_buffer": [
+                [
+                    {"delta_lat": 201, "delta_lon": 162, "delta_ms": 1030},
+                    {"delta_lat": 418, "delta_lon": -340, "delta_ms": 2060},
+                ],
+                [],
+            ],
+        },
+        schema={
+            k: live_feed_schema[k]  # type: ignore[index]
+            for k in (*columns, "position_buffer")
+        },
+    )
+    points = ns(df).expand_position_buffer()
+    assert points.equals(df.fr24.expand_position_buffer())  # type: ignore[attr-defined]
+    assert points.columns == [*columns, "buffered"]
+    assert points["flightid"].to_list() == [1, 1, 1, 2]
+    assert points["buffered"].to_list() == [False, True, True, False]
+    assert points["latitude"].to_list()[:3] == [
+        pl.Series([v], dtype=pl.Float32).item()
+        for v in (42, 42.00201, 42.00418)
+    ]
+    assert points["timestamp"].dt.epoch("ms").to_list()[:3] == [
+        1753072999000,
+        1753073000030,
+        1753073001060,
+    ]
+    assert ns(df).expand_position_buffer(include_current=False).height == 2
+
+    lists = df.select(
+        ns(pl.col("position_buffer")).buffer_longitude().alias("lon"),
+        ns(pl.col("position_buffer")).buffer_timestamp().alias("ts"),
+    )
+    assert lists["lon"].to_list()[0] == [-3.0 + 0.00162, -3.0 - 0.0034]
+    assert lists["ts"].list.len().to_list() == [2, 0]
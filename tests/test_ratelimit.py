@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from fr24 import FR24, RateController
+from fr24.ratelimit import AIMDLimiter, TokenBucket
+from fr24.transport import RateControlTransport
+
+
+@pytest.mark.anyio
+async def test_token_bucket() -> None:
+    bucket = TokenBucket(rate=1000, capacity=1)
+    for _ in range(5):
+        await bucket.acquire()
+    assert bucket._tokens < 1
+
+
+@pytest.mark.anyio
+async def test_aimd_limiter() -> None:
+    limiter = AIMDLimiter(2, maximum=4, cooldown=60)
+    await limiter.acquire()
+    await limiter.acquire()
+    waiter = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    limiter.release("ok")
+    await asyncio.wait_for(waiter, 1)
+    assert limiter.limit == pytest.approx(2.5)
+
+    limiter.release("throttled")
+    limiter.release("throttled")  # within the cooldown
+    assert limiter.limit == pytest.approx(1.25)
+    assert limiter.throttled == 1
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_aimd_limiter_cancelled_waiter() -> None:
+    limiter = AIMDLimiter(1, maximum=1)
+    await limiter.acquire()
+    cancelled = asyncio.ensure_future(limiter.acquire())
+    woken = asyncio.ensure_future(limiter.acquire())
+    skipped = asyncio.ensure_future(limiter.acquire())
+    await asyncio.sleep(0)
+    skipped.cancel()  # cancelled before being woken
+    await asyncio.sleep(0)
+
+    limiter.release("ok")  # wakes `cancelled`...
+    cancelled.cancel()  # ...which is cancelled before it resumes
+    await asyncio.wait_for(woken, 1)  # so the slot is handed on
+    assert cancelled.cancelled() and skipped.cancelled()
+    assert limiter.in_flight == 1
+    assert not limiter._waiters
+
+
+@pytest.mark.anyio
+async def test_rate_control_transport() -> None:
+    statuses = iter([200, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        if status == 429:
+            return httpx.Response(429, headers={"retry-after": "0.2"})
+        # trailers-in-body: grpc-web frame with the trailer flag set
+        trailer = b"grpc-status:14\r\n" if request.url.path == "/Slow" else b""
+        return httpx.Response(200, content=b"\x80\x00\x00\x00\x10" + trailer)
+
+    control = RateController(rate=100, concurrency=4)
+    assert FR24(rate_control=control).http.rate_control is control
+    transport = RateControlTransport(httpx.MockTransport(handler), control)
+    async with httpx.AsyncClient(transport=transport) as client:
+        await client.get("https://example.com/LiveFeed")
+        limiter = control.endpoints["LiveFeed"].limiter
+        assert limiter is not None and limiter.limit > 4
+
+        await client.get("https://example.com/LiveFeed")
+        assert limiter.limit < 4
+        start = time.monotonic()
+        await client.get("https://example.com/LiveFeed")
+        assert time.monotonic() - start >= 0.15  # retry-after honoured
+
+        statuses = iter([200])
+        await client.get("https://example.com/Slow")
+        slow = control.endpoints["Slow"].limiter
+        assert slow is not None and slow.throttled == 1
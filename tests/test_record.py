@@ -0,0 +1,73 @@
+import asyncio
+import email.utils
+import time
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24, BoundingBox, FR24Cache
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedResponse
+from fr24.record import record_live_feed, ticks
+
+
+@pytest.mark.anyio
+async def test_ticks_skip_overruns() -> None:
+    interval = 0.05
+    start = time.monotonic()
+    seen = []
+    async for n in ticks(interval):
+        seen.append((n, time.monotonic() - start))
+        if n == 0:
+            await asyncio.sleep(interval * 2.5)  # overrun ticks 1 and 2
+        if len(seen) == 3:
+            break
+    assert [n for n, _ in seen] == [0, 3, 4]
+    # scheduled on the original grid, not relative to the overrun
+    assert seen[2][1] == pytest.approx(4 * interval, abs=0.02)
+
+
+@pytest.mark.anyio
+async def test_ticks_stop() -> None:
+    stop = asyncio.Event()
+    seen = []
+    async for n in ticks(60, stop):
+        seen.append(n)
+        stop.set()
+    assert seen == [0]
+
+
+@pytest.mark.anyio
+async def test_record_live_feed(tmp_path: Path) -> None:
+    snapshots = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal snapshots
+        snapshots += 1
+        message = LiveFeedResponse(
+            flights_list=[Flight(flightid=1, lat=22.3, lon=113.9)],
+            server_time_ms=1700000000000 + snapshots * 1000,
+        )
+        # snapshots are named by the server date, make them distinct
+        date = email.utils.formatdate(1700000000 + snapshots, usegmt=True)
+        return httpx.Response(
+            200, content=encode_message(message), headers={"date": date}
+        )
+
+    cache = FR24Cache(tmp_path)
+    transport = httpx.MockTransport(handler)
+    async with FR24(httpx.AsyncClient(transport=transport)) as fr24:
+        written = await record_live_feed(
+            fr24,
+            cache,
+            BoundingBox(-90, 90, -180, 180),
+            interval=0.01,
+            count=2,
+        )
+    assert written == 2
+    files = sorted(cache.live_feed.collection.path.glob("*.parquet"))
+    assert [fp.name for fp in files] == [
+        "1700000001.parquet",
+        "1700000002.parquet",
+    ]
@@ -0,0 +1,176 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24, FR24Cache
+from fr24.grpc import BoundingBox, LiveFeedParams
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import Flight, LiveFeedRequest, LiveFeedResponse
+from fr24.service import LiveFeedResult, world_bounding_boxes
+
+
+def make_live_feed_result(*flights: Flight) -> LiveFeedResult:
+    message = LiveFeedResponse(flights_list=flights)
+    return LiveFeedResult(
+        request=LiveFeedParams(bounding_box=BoundingBox(-90, 90, -180, 180)),
+        response=httpx.Response(200, content=encode_message(message)),
+        timestamp=1700000000,
+    )
+
+
+def test_result_accessors_are_memoized() -> None:
+    result = make_live_feed_result(
+        Flight(flightid=1, lat=22.3, lon=113.9, callsign="CPA8747"),
+        Flight(flightid=2, lat=51.5, lon=-0.1, callsign="BAW1"),
+    )
+    proto = result.to_proto()
+    assert result.to_proto() is proto
+    assert result.to_dict() is result.to_dict()
+    df = result.to_polars()
+    assert result.to_polars() is df
+    assert df.height == 2
+
+
+def test_result_clear_cache() -> None:
+    result = make_live_feed_result(Flight(flightid=1))
+    proto = result.to_proto()
+    result.clear_cache()
+    reparsed = result.to_proto()
+    assert reparsed is not proto
+    assert reparsed == proto
+
+
+def test_live_feed_result_wire_decoder() -> None:
+    flights = [
+        Flight(flightid=1, lat=22.3, lon=113.9, callsign="CPA8747"),
+        Flight(flightid=2, lat=51.5, lon=-0.1, callsign="BAW1"),
+    ]
+    wire = make_live_feed_result(*flights).to_polars(decoder="wire")
+    assert wire.equals(make_live_feed_result(*flights).to_polars())
+
+
+@pytest.mark.anyio
+async def test_live_feed_fetch_world() -> None:
+    flights = [
+        Flight(flightid=1, lat=22.3, lon=113.9, timestamp_ms=1000),
+        Flight(flightid=2, lat=51.5, lon=-0.1, timestamp_ms=1000),
+    ]
+    # the same flight on a tile boundary, seen by both tiles
+    boundary = [
+        Flight(flightid=3, lat=0.0, lon=0.0, timestamp_ms=1000),
+        Flight(flightid=3, lat=0.0, lon=0.0, timestamp_ms=2000),
+    ]
+    in_flight = max_in_flight = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        bounds = LiveFeedRequest.FromString(request.content[5:]).bounds
+        tile = [f for f in flights if bounds.west <= f.lon < bounds.east]
+        if bounds.east == 0:
+            tile.append(boundary[0])
+        elif bounds.west == 0:
+            tile.append(boundary[1])
+        message = LiveFeedResponse(flights_list=tile, server_time_ms=2000)
+        return httpx.Response(200, content=encode_message(message))
+
+    lngs = [-180, -90, 0, 90, 180]
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        result = await fr24.live_feed.fetch_world(lngs, max_concurrency=2)
+
+    assert max_in_flight == 2
+    assert len(result.tiles) == 4
+    assert sum(tile.num_flights for tile in result.tiles) == 4
+    df = result.to_polars()
+    assert df["flightid"].to_list() == [1, 2, 3]
+    assert df.filter(flightid=3)["timestamp"].dt.epoch("ms").item() == 2000
+
+
+@pytest.mark.anyio
+async def test_live_feed_fetch_world_empty_and_failing() -> None:
+    requested = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requested
+        requested += 1
+        bounds = LiveFeedRequest.FromString(request.content[5:]).bounds
+        if bounds.west == 0:
+            raise httpx.ConnectError("unreachable", request=request)
+        await asyncio.sleep(0.01)
+        message = LiveFeedResponse(server_time_ms=2000)
+        return httpx.Response(200, content=encode_message(message))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        result = await fr24.live_feed.fetch_world([0])
+        assert requested == 0
+        assert result.tiles == []
+        assert result.to_polars().is_empty()
+
+        # any failing slice aborts the sweep
+        with pytest.raises(httpx.ConnectError):
+            await fr24.live_feed.fetch_world([-180, -90, 0, 90, 180])
+
+
+def test_world_bounding_boxes_half_hourly() -> None:
+    lngs = {0: [-180, 0, 180], 1: [-180, -90, 0, 90, 180]}
+    assert len(world_bounding_boxes(lngs, timestamp=1800 * 49)) == 4
+    assert len(world_bounding_boxes("static", timestamp=0)) == 26
+
+
+@pytest.mark.anyio
+async def test_live_feed_fetch_world_adaptive(tmp_path: Path) -> None:
+    # five flights in the eastern hemisphere, saturating its slice
+    flights = [
+        Flight(flightid=i + 1, lat=lat, lon=lon, timestamp_ms=1000)
+        for i, (lat, lon) in enumerate(
+            [(10, 10), (20, 20), (30, 30), (-10, 100), (-20, 120)]
+        )
+    ]
+    requests: list[LiveFeedRequest] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        req = LiveFeedRequest.FromString(request.content[5:])
+        requests.append(req)
+        b = req.bounds
+        tile = [
+            f
+            for f in flights
+            if b.south <= f.lat < b.north and b.west <= f.lon < b.east
+        ][: req.limit]
+        message = LiveFeedResponse(flights_list=tile, server_time_ms=2000)
+        return httpx.Response(200, content=encode_message(message))
+
+    cache = FR24Cache(tmp_path)
+    lngs = [-180, 0, 180]
+    transport = httpx.MockTransport(handler)
+    async with FR24(httpx.AsyncClient(transport=transport)) as fr24:
+        result = await fr24.live_feed.fetch_world_adaptive(cache, lngs, limit=4)
+        assert result.to_polars()["flightid"].to_list() == [1, 2, 3, 4, 5]
+        assert len(result.saturated_tiles) == 1
+        assert len(requests) == 2 + 4
+        assert list((tmp_path / "live_feed_tiles").glob("*.json"))
+
+        # starts from the learned tree: the slice is not requested again
+        requests.clear()
+        result = await fr24.live_feed.fetch_world_adaptive(cache, lngs, limit=4)
+        assert result.to_polars().height == 5
+        assert not result.saturated_tiles
+        assert requests[0].bounds.west == 0
+        assert len(requests) == 1 + 4
+
+        # a corrupt tree is ignored and rebuilt
+        for fp in (tmp_path / "live_feed_tiles").glob("*.json"):
+            fp.write_text('{"version": 2, "limit"')
+        requests.clear()
+        result = await fr24.live_feed.fetch_world_adaptive(cache, lngs, limit=4)
+        assert result.to_polars().height == 5
+        assert len(requests) == 2 + 4
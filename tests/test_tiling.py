@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from fr24.grpc import BoundingBox
+from fr24.service import world_lngs
+from fr24.static.bbox import LNGS_WORLD_PER_HALF_HR
+from fr24.tiling import (
+    TileNode,
+    compute_lngs_per_half_hr,
+    load_tile_tree,
+    save_lngs_per_half_hr,
+    save_tile_tree,
+)
+
+
+def test_tile_node_split_prune_roundtrip() -> None:
+    tree = TileNode.from_lngs([-180, 0, 180])
+    east = tree.children[1]
+    quadrants = east.split()
+    assert quadrants[0].bounding_box == BoundingBox(0, 90, 0, 90)
+    for node, n in zip(quadrants, [300, 0, 0, 200]):
+        node.num_flights = n
+    assert TileNode.from_dict(tree.to_dict()) == tree
+
+    tree.prune(1000)
+    assert east.children == [] and east.num_flights == 500
+    # the top level slices are never merged
+    tree.children[0].num_flights = 0
+    tree.prune(1000)
+    assert len(tree.children) == 2
+
+
+def test_tile_tree_store(tmp_path: Path) -> None:
+    fp = tmp_path / "00.json"
+    lngs = [-180, 0, 180]
+    assert load_tile_tree(fp, limit=1500, lngs=lngs) is None
+
+    tree = TileNode.from_lngs(lngs)
+    tree.children[0].split()
+    save_tile_tree(fp, tree, limit=1500, lngs=lngs)
+    assert load_tile_tree(fp, limit=1500, lngs=lngs) == tree
+    # trees built with other settings are rejected
+    assert load_tile_tree(fp, limit=1000, lngs=lngs) is None
+    assert load_tile_tree(fp, limit=1500, lngs=[-180, 90, 180]) is None
+
+    for corrupt in ['{"version": 2, "limit"', '{"version": 2}', "[]"]:
+        fp.write_text(corrupt)
+        with pytest.raises(ValueError, match="corrupt tile tree"):
+            load_tile_tree(fp, limit=1500, lngs=lngs)
+
+
+def test_compute_lngs_per_half_hr(tmp_path: Path) -> None:
+    # 1800 = 00:30UTC, slot 1
+    for i, ts in enumerate([1800, 1860]):
+        pl.DataFrame(
+            {"longitude": [float(lon + i) for lon in range(-150, 150, 10)]}
+        ).write_parquet(tmp_path / f"{ts}.parquet")
+    (tmp_path / "notes.parquet").touch()
+
+    lngs = compute_lngs_per_half_hr(
+        tmp_path.glob("*.parquet"), flights_per_tile=10
+    )
+    assert list(lngs) == [1]
+    knots = lngs[1]
+    assert len(knots) == 4
+    assert knots[0] == -180 and knots[-1] == 180
+    assert knots == sorted(knots)
+
+    fp = tmp_path / "knots.json"
+    save_lngs_per_half_hr(fp, lngs, flights_per_tile=10)
+    assert world_lngs(fp, timestamp=1800) == knots
+    assert world_lngs(fp, timestamp=0) == LNGS_WORLD_PER_HALF_HR[0]
@@ -0,0 +1,111 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from fr24 import FR24, BoundingBox
+from fr24.proto import encode_message
+from fr24.proto.v1_pb2 import (
+    Flight,
+    LiveFeedResponse,
+    LiveFlightsStatusResponse,
+    LiveFlightStatus,
+)
+from fr24.tracing import enabled, span, traced, tracing
+
+
+@pytest.mark.anyio
+async def test_tracing(tmp_path: Path) -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = LiveFeedResponse(
+            flights_list=[Flight(flightid=1)], server_time_ms=1000
+        )
+        return httpx.Response(200, content=encode_message(message))
+
+    fp = tmp_path / "trace.json"
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        with tracing(fp) as tracer:
+            result = await fr24.live_feed.fetch(BoundingBox(-90, 90, -180, 180))
+            result.write_table(tmp_path / "feed.parquet")
+        assert not enabled()
+        await fr24.live_feed.fetch(BoundingBox(-90, 90, -180, 180))
+
+    spans = {e["name"]: e for e in tracer.events}
+    assert set(spans) == {
+        "LiveFeedService.fetch",
+        "write_table",
+        "_handle_existing_file",
+        "to_polars",
+        "to_proto",
+        "parse_data",
+        "write_parquet",
+    }
+
+    def within(inner: str, outer: str) -> bool:
+        i, o = spans[inner], spans[outer]
+        start, end = i["ts"], i["ts"] + i["dur"]
+        return bool(o["ts"] <= start and end <= o["ts"] + o["dur"])
+
+    assert within("parse_data", "to_proto")
+    assert within("to_proto", "to_polars")
+    assert within("to_polars", "write_table")
+    assert within("write_parquet", "write_table")
+    assert spans["write_parquet"]["args"] == {"rows": 1}
+
+    trace = json.loads(fp.read_text())
+    assert trace["traceEvents"][0]["ph"] == "M"
+    assert len(trace["traceEvents"]) == len(tracer.events) + 1
+
+
+@pytest.mark.anyio
+async def test_tracing_world_sweep() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = LiveFeedResponse(
+            flights_list=[Flight(flightid=1)], server_time_ms=1000
+        )
+        return httpx.Response(200, content=encode_message(message))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        with tracing() as tracer:
+            result = await fr24.live_feed.fetch_world()
+    names = [e["name"] for e in tracer.events]
+    assert names.count("LiveFeedService.fetch") == len(result.tiles) > 1
+
+
+@pytest.mark.anyio
+async def test_tracing_chunked() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        message = LiveFlightsStatusResponse(
+            flights_map=[LiveFlightStatus(flight_id=1)]
+        )
+        return httpx.Response(200, content=encode_message(message))
+
+    async with FR24(
+        httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    ) as fr24:
+        with tracing() as tracer:
+            await fr24.live_flights_status.fetch_chunked(
+                range(10), chunk_size=3
+            )
+    names = [e["name"] for e in tracer.events]
+    assert names.count("LiveFlightsStatusService.fetch") == 4
+
+
+def test_tracing_disabled() -> None:
+    @traced()
+    def f() -> int:
+        with span("inner"):
+            return 1
+
+    assert f() == 1
+    with tracing() as tracer:
+        assert f() == 1
+    assert [e["name"] for e in tracer.events] == [
+        "inner",
+        "test_tracing_disabled.<locals>.f",
+    ]
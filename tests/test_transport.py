@@ -0,0 +1,59 @@
+import asyncio
+from typing import AsyncIterator
+
+import httpx
+import pytest
+
+from fr24 import FR24, TransportProfile
+from fr24.transport import ShardedTransport
+
+
+@pytest.mark.anyio
+async def test_sharded_transport_least_loaded() -> None:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, content=b"ok")
+
+    transport = ShardedTransport(
+        [httpx.MockTransport(handler) for _ in range(3)],
+        max_concurrent_streams=4,
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        responses = await asyncio.gather(
+            *(client.get("https://example.com") for _ in range(12))
+        )
+    assert all(r.content == b"ok" for r in responses)
+    assert [s.requests for s in transport.stats] == [4, 4, 4]
+    assert [s.peak_in_flight for s in transport.stats] == [4, 4, 4]
+    assert all(s.in_flight == 0 for s in transport.stats)
+    assert all(0 < s.utilisation <= 1 for s in transport.stats)
+
+
+class Body(httpx.AsyncByteStream):
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        yield b"ok"
+
+
+@pytest.mark.anyio
+async def test_sharded_transport_counts_open_streams() -> None:
+    transport = ShardedTransport(
+        [
+            httpx.MockTransport(lambda _: httpx.Response(200, stream=Body()))
+            for _ in range(2)
+        ]
+    )
+    async with httpx.AsyncClient(transport=transport) as client:
+        async with client.stream("GET", "https://example.com"):
+            assert [s.in_flight for s in transport.stats] == [1, 0]
+            await client.get("https://example.com")
+            # the open stream keeps the first shard busy
+            assert [s.requests for s in transport.stats] == [1, 1]
+        assert [s.in_flight for s in transport.stats] == [0, 0]
+
+
+def test_fr24_profile() -> None:
+    fr24 = FR24(profile=TransportProfile(connections=2))
+    assert len(fr24.http.connection_stats()) == 2
+    assert FR24().http.connection_stats() == []
+    with pytest.raises(ValueError):
+        FR24(httpx.AsyncClient(), profile=TransportProfile())